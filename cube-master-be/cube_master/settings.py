@@ -119,6 +119,35 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+# In-process cache of solutions, in front of both solving engines
+SOLVER_CACHE = {
+    "MAX_SIZE": 1024,
+    "TTL": 3600,  # seconds
+}
+
+# Worker processes of the solve pool; None starts one per CPU
+SOLVER_POOL_SIZE = None
+
+# Worker processes running Kociemba's solver, and how long a request waits
+# for one to answer before it fails and the worker is replaced
+SOLVER_KOCIEMBA = {
+    "WORKERS": 2,
+    "TIMEOUT": 10,  # seconds
+}
+
+# Warm the solving engines up when the app loads in a server process
+# (management commands other than runserver skip it); readiness is reported
+# once this is done
+SOLVER_WARMUP = True
+
+# Asynchronous solve jobs: threads handing jobs to the pool, how long
+# finished jobs are kept, and how many jobs may be queued or running
+SOLVER_JOBS = {
+    "WORKERS": 2,
+    "RETENTION": 3600,  # seconds
+    "MAX_PENDING": 100,
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
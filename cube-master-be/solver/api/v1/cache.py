@@ -0,0 +1,178 @@
+"""
+In-process cache of solutions, in front of both solving engines.
+
+Solutions are keyed by the engine, the options that change the solution
+and the normalized cube state, in which every facelet is written as the face
+whose center shows its color. The same scramble therefore hits the cache
+whatever color labels the client used. Entries holding a plain move sequence
+can instead be keyed by the canonical state under the 48 cube symmetries, so
+that rotated and mirrored copies of a scramble share one entry too.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from solver.api.v1.cube_solver.facelets import FACELETS, FACES
+from solver.api.v1.cube_solver.state import BaseCubeState
+from solver.api.v1.cube_solver.symmetry import (
+    INVERSE_SYMMETRIES,
+    canonicalize,
+    transform,
+    translate_sequence,
+)
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = 3600  # seconds
+
+_FACE_LETTERS = bytes.maketrans(bytes(range(len(FACES))), FACES.encode())
+
+
+def state_key(rubiks_cube):
+    """
+    Normalize a cube to a 54-character string relative to its centers.
+
+    Args:
+        rubiks_cube (dict or CubeState): Mapping of facelets 'U1'...'B9' to color labels.
+
+    Returns:
+        str: The facelets in URFDLB order, each written as the face whose
+        center has its color, e.g. "UUUUUUUUURRRRRRRRR..." when solved.
+    """
+    if isinstance(rubiks_cube, BaseCubeState):
+        # Symmetry 0 is the identity; transform renumbers the colors by the
+        # centers.
+        return transform(rubiks_cube, 0).translate(_FACE_LETTERS).decode()
+    centers = {rubiks_cube[f"{face}5"]: face for face in FACES}
+    return "".join(centers[rubiks_cube[name]] for name in FACELETS)
+
+
+class SolveCache:
+    """
+    Bounded LRU cache with a time to live, counting hits and misses.
+
+    Entries older than the TTL are dropped when read, and the least recently
+    used entry is dropped when the cache is full. Safe to share between
+    request threads.
+    """
+
+    def __init__(
+        self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL, clock=time.monotonic
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Look up a cached solution.
+
+        Args:
+            key (tuple): The cache key, see get_or_solve.
+
+        Returns:
+            The cached value, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """
+        Store a solution, evicting the least recently used ones if full.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_solve(
+        self, engine, rubiks_cube, options, solve, symmetric=False, cacheable=None
+    ):
+        """
+        Return the cached solution of a cube, solving and caching it on a miss.
+
+        Args:
+            engine (str): Name of the solving engine, e.g. "layer" or "kociemba".
+            rubiks_cube (dict or CubeState): Mapping of facelets 'U1'...'B9' to color labels.
+            options (tuple): The options that change the solution.
+            solve (callable): Solves the cube on a miss. It returns the value
+                to cache, or None for results that must not be cached.
+            symmetric (bool): Key the entry by the canonical state under the
+                48 cube symmetries (see cube_solver.symmetry). The value must
+                then be a move sequence; it is stored for the canonical state
+                and translated back to the cube on a hit.
+            cacheable (callable): Called with a new value, which is only
+                cached if it returns True, e.g. for results that depend on
+                the time a search had.
+
+        Returns:
+            The cached or new value.
+        """
+        if symmetric:
+            state, symmetry = canonicalize(rubiks_cube)
+        else:
+            state = state_key(rubiks_cube)
+        key = (engine, options, state)
+
+        value = self.get(key)
+        if value is None:
+            value = solve()
+            if value is not None and (cacheable is None or cacheable(value)):
+                self.set(
+                    key,
+                    tuple(translate_sequence(value, symmetry)) if symmetric else value,
+                )
+        elif symmetric:
+            value = tuple(translate_sequence(value, INVERSE_SYMMETRIES[symmetry]))
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Counters for monitoring.
+
+        Returns:
+            dict: Size, limits, hits, misses, evictions and the hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_config = getattr(settings, "SOLVER_CACHE", {})
+
+SOLVE_CACHE = SolveCache(
+    max_size=_config.get("MAX_SIZE", DEFAULT_MAX_SIZE),
+    ttl=_config.get("TTL", DEFAULT_TTL),
+)
@@ -0,0 +1,241 @@
+"""
+Vectorized engine for many cube states at once.
+
+A batch holds its cubes as rows of one NumPy array in the CubeState
+encoding, so a move or a layer check is a single array operation over all
+cubes. The predicates match the layer validators, without a Python loop
+per cube; the benchmark_batch command compares the moves with the
+dictionary moves.
+"""
+
+import numpy as np
+
+from solver.api.v1.cube_solver.facelets import (
+    CENTER_INDICES,
+    CORNER_FACELETS,
+    EDGE_FACELETS,
+    FACELET_INDEX,
+    FACES,
+    MOVE_PERMUTATIONS,
+)
+from solver.api.v1.cube_solver.sequence import compile_sequence
+from solver.api.v1.cube_solver.state import CubeState
+
+MOVE_INDICES = {
+    move: np.array(permutation, dtype=np.intp)
+    for move, permutation in MOVE_PERMUTATIONS.items()
+}
+
+# The U-layer corners in the order the top corners validator visits them
+# while turning the cube with "rl": UFL, URF, UBR, ULB.
+TOP_CORNER_FACELETS = [
+    ["F1", "U7", "L3"],
+    ["R1", "U9", "F3"],
+    ["B1", "U3", "R3"],
+    ["L1", "U1", "B3"],
+]
+
+
+def _indices(facelets):
+    return np.array([FACELET_INDEX[name] for name in facelets], dtype=np.intp)
+
+
+def _piece_codes(colors):
+    # Order-independent code for the colors of each piece: sort them and
+    # read them as a base-6 number.
+    colors = np.sort(colors, axis=-1).astype(np.int16)
+    code = np.zeros(colors.shape[:-1], dtype=np.int16)
+    for position in range(colors.shape[-1]):
+        code = code * 6 + colors[..., position]
+    return code
+
+
+def _expected_codes(pieces):
+    centers = [[FACES.index(name[0]) for name in piece] for piece in pieces]
+    return np.sort(_piece_codes(np.array(centers)))
+
+
+_EDGE_INDICES = np.array([_indices(piece) for piece in EDGE_FACELETS])
+_CORNER_INDICES = np.array([_indices(piece) for piece in CORNER_FACELETS])
+_TOP_CORNER_INDICES = np.array([_indices(piece) for piece in TOP_CORNER_FACELETS])
+_EXPECTED_EDGE_CODES = _expected_codes(EDGE_FACELETS)
+_EXPECTED_CORNER_CODES = _expected_codes(CORNER_FACELETS)
+_EXPECTED_TOP_CORNER_CODES = _piece_codes(
+    np.array(
+        [[FACES.index(name[0]) for name in piece] for piece in TOP_CORNER_FACELETS]
+    )
+)
+
+_SIDE_FACES = ["F", "L", "R", "B"]
+
+
+def _face_facelets(faces, numbers):
+    return [f"{face}{number}" for face in faces for number in numbers]
+
+
+class CubeBatch:
+    """
+    Many cube states stored as an (N, 54) uint8 array for vectorized work.
+
+    Rows use the CubeState encoding: facelets in U, R, F, D, L, B order and
+    colors numbered by the face whose center shows them. Every move is one
+    fancy-indexing gather over the whole batch.
+    """
+
+    def __init__(self, states):
+        states = np.ascontiguousarray(states, dtype=np.uint8)
+        if states.ndim != 2 or states.shape[1] != 54:
+            raise ValueError("Cube batches must have the shape (N, 54).")
+        self.states = states
+
+    @classmethod
+    def solved(cls, count):
+        """
+        Create a batch of `count` solved cubes.
+        """
+        return cls(np.repeat(np.arange(6, dtype=np.uint8), 9)[None, :].repeat(count, 0))
+
+    @classmethod
+    def from_states(cls, states):
+        """
+        Create a batch from a list of CubeState objects.
+        """
+        buffer = b"".join(state.facelets for state in states)
+        return cls(np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 54))
+
+    @classmethod
+    def from_dicts(cls, cubes):
+        """
+        Create a batch from facelet dictionaries such as the API receives.
+        """
+        return cls.from_states([CubeState.from_dict(cube) for cube in cubes])
+
+    def to_states(self, palette=tuple(FACES)):
+        """
+        Convert the batch back to CubeState objects using a single palette.
+        """
+        return [CubeState(row.tobytes(), palette) for row in self.states]
+
+    def __len__(self):
+        return len(self.states)
+
+    def apply(self, move):
+        """
+        Apply one move to every cube in the batch.
+        """
+        permutation = MOVE_INDICES.get(move)
+        if permutation is None:
+            raise ValueError(f"Invalid move: {move}")
+        self.states = self.states[:, permutation]
+        return self
+
+    def apply_sequence(self, moves):
+        """
+        Apply a whole move sequence to every cube with a single gather.
+        """
+        permutation = np.array(compile_sequence(moves), dtype=np.intp)
+        self.states = self.states[:, permutation]
+        return self
+
+    # Below are the vectorized predicates. Each returns a boolean array with
+    # one entry per cube and matches the corresponding layer validator.
+    # Stickers are compared with the actual centers rather than with fixed
+    # color numbers, so the predicates also hold after whole-cube rotations.
+    def _centers(self):
+        return self.states[:, list(CENTER_INDICES)]
+
+    def _relabeled(self):
+        # Renumber the colors of every row so that the center of face k
+        # shows color k again.
+        lookup = np.zeros((len(self.states), 6), dtype=np.uint8)
+        np.put_along_axis(
+            lookup, self._centers(), np.arange(6, dtype=np.uint8)[None, :], axis=1
+        )
+        return np.take_along_axis(lookup, self.states, axis=1)
+
+    def _match_centers(self, facelets):
+        indices = _indices(facelets)
+        centers = _indices([f"{name[0]}5" for name in facelets])
+        return (self.states[:, indices] == self.states[:, centers]).all(axis=1)
+
+    def is_solved(self):
+        """
+        Every face shows the color of its center.
+        """
+        faces = self.states.reshape(-1, 6, 9)
+        return (faces == self._centers()[:, :, None]).all(axis=(1, 2))
+
+    def bottom_cross_solved(self):
+        """
+        Equivalent to BottomLayerSolver.bottom_cross_validator.
+        """
+        return self._match_centers(
+            _face_facelets(_SIDE_FACES, "8") + _face_facelets("D", "2468")
+        )
+
+    def bottom_corners_solved(self):
+        """
+        Equivalent to BottomLayerSolver.bottom_corners_validator.
+        """
+        return self._match_centers(
+            _face_facelets(_SIDE_FACES, "789") + _face_facelets("D", "1234689")
+        )
+
+    def second_layer_solved(self):
+        """
+        Equivalent to SecondLayerSolver.second_layer_validator.
+        """
+        return self._match_centers(
+            _face_facelets(_SIDE_FACES, "46789") + _face_facelets("D", "1234689")
+        )
+
+    def top_cross_solved(self):
+        """
+        Equivalent to TopLayerSolver.top_cross_validator.
+        """
+        return self.second_layer_solved() & self._match_centers(
+            _face_facelets("U", "2468")
+        )
+
+    def top_cross_oriented(self):
+        """
+        Equivalent to TopLayerSolver.top_cross_orientation_validator.
+        """
+        return self._match_centers(
+            _face_facelets(_SIDE_FACES, "246789")
+            + _face_facelets("D", "1234689")
+            + _face_facelets("U", "2468")
+        )
+
+    def top_corners_placed(self):
+        """
+        Equivalent to TopLayerSolver.top_corners_validator.
+        """
+        codes = _piece_codes(self._relabeled()[:, _TOP_CORNER_INDICES])
+        return self.top_cross_oriented() & (codes == _EXPECTED_TOP_CORNER_CODES).all(
+            axis=1
+        )
+
+    def top_corners_oriented(self):
+        """
+        Equivalent to TopLayerSolver.top_corners_orientation_validator.
+        """
+        return self._match_centers(_face_facelets("FLRBUD", "246789"))
+
+    def is_valid(self):
+        """
+        Six distinct centers, nine stickers of each color and the expected
+        set of edge and corner colors. Unlike CubeStateValidator, the corner
+        twist, edge flip and permutation parity are not checked.
+        """
+        centers = np.sort(self._centers(), axis=1)
+        states = self._relabeled()
+        counts = np.stack([(states == color).sum(axis=1) for color in range(6)], axis=1)
+        edges = np.sort(_piece_codes(states[:, _EDGE_INDICES]), axis=1)
+        corners = np.sort(_piece_codes(states[:, _CORNER_INDICES]), axis=1)
+        return (
+            (np.diff(centers, axis=1) > 0).all(axis=1)
+            & (counts == 9).all(axis=1)
+            & (edges == _EXPECTED_EDGE_CODES).all(axis=1)
+            & (corners == _EXPECTED_CORNER_CODES).all(axis=1)
+        )
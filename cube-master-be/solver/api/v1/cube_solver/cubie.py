@@ -0,0 +1,420 @@
+"""
+Cubie-level cube model: where every corner and edge is and how it is turned.
+
+Corners are numbered URF, UFL, ULB, UBR, DFR, DLF, DBL, DRB and edges UR, UF,
+UL, UB, DR, DF, DL, DB, FR, FL, BL, BR. ``cp[i]``/``ep[i]`` is the piece in
+position ``i``; ``co[i]`` is the number of clockwise twists of that corner
+and ``eo[i]`` is 1 when that edge is flipped.
+"""
+
+from math import comb, factorial
+from operator import itemgetter
+
+import numpy as np
+
+from solver.api.v1.cube_solver.facelets import (
+    CORNER_FACELETS,
+    EDGE_FACELETS,
+    FACELET_INDEX,
+    FACES,
+)
+from solver.api.v1.cube_solver.state import CubeState
+from solver.api.v1.cube_solver.tables import load_table, register_table
+
+CORNERS = ("URF", "UFL", "ULB", "UBR", "DFR", "DLF", "DBL", "DRB")
+EDGES = ("UR", "UF", "UL", "UB", "DR", "DF", "DL", "DB", "FR", "FL", "BL", "BR")
+
+CORNER_INDICES = tuple(
+    tuple(FACELET_INDEX[name] for name in piece) for piece in CORNER_FACELETS
+)
+EDGE_INDICES = tuple(
+    tuple(FACELET_INDEX[name] for name in piece) for piece in EDGE_FACELETS
+)
+
+# Colors are face indices (see CubeState), so a piece's colors are the faces
+# its home position touches.
+CORNER_COLORS = tuple(
+    tuple(FACES.index(name[0]) for name in piece) for piece in CORNER_FACELETS
+)
+EDGE_COLORS = tuple(
+    tuple(FACES.index(name[0]) for name in piece) for piece in EDGE_FACELETS
+)
+
+# The (piece, orientation) showing each possible color tuple. A corner's
+# twist is the position of its U or D colored sticker.
+_CORNER_LOOKUP = {}
+for _corner, _colors in enumerate(CORNER_COLORS):
+    for _twist in range(3):
+        _CORNER_LOOKUP[_colors[3 - _twist :] + _colors[: 3 - _twist]] = (
+            _corner,
+            _twist,
+        )
+_EDGE_LOOKUP = {}
+for _edge, _colors in enumerate(EDGE_COLORS):
+    _EDGE_LOOKUP[_colors] = (_edge, 0)
+    _EDGE_LOOKUP[_colors[::-1]] = (_edge, 1)
+
+# All corner and edge facelets in one gather each.
+_CORNER_GATHER = itemgetter(*(index for indices in CORNER_INDICES for index in indices))
+_EDGE_GATHER = itemgetter(*(index for indices in EDGE_INDICES for index in indices))
+
+_CENTER_COLORS = bytes(range(6))
+
+# The 18 face turns of the coordinate move tables, in table column order.
+MOVES = tuple(f"{face.lower()}{suffix}" for face in FACES for suffix in ("", "2", "'"))
+
+N_TWIST = 3**7
+N_FLIP = 2**11
+N_SLICE = comb(12, 4)
+N_CORNER_PERMUTATION = factorial(8)
+
+
+def rank_permutation(permutation):
+    """
+    Rank a permutation of 0..n-1 in lexicographic order (Lehmer code).
+    """
+    rank = 0
+    remaining = sorted(permutation)
+    for value in permutation:
+        position = remaining.index(value)
+        rank = rank * len(remaining) + position
+        remaining.pop(position)
+    return rank
+
+
+def unrank_permutation(rank, length):
+    """
+    Inverse of rank_permutation for permutations of 0..length-1.
+    """
+    digits = []
+    for base in range(1, length + 1):
+        rank, digit = divmod(rank, base)
+        digits.append(digit)
+    remaining = list(range(length))
+    return [remaining.pop(digit) for digit in reversed(digits)]
+
+
+def permutation_parity(permutation):
+    """
+    Parity of a permutation of 0..n-1: 0 when even, 1 when odd.
+    """
+    # A cycle of length k is k - 1 transpositions.
+    seen = [False] * len(permutation)
+    parity = 0
+    for start in range(len(permutation)):
+        if seen[start]:
+            continue
+        seen[start] = True
+        index = permutation[start]
+        while index != start:
+            seen[index] = True
+            index = permutation[index]
+            parity ^= 1
+    return parity
+
+
+class CubieCube:
+    """
+    Piece-level cube state: corner and edge permutation and orientation.
+    """
+
+    __slots__ = ("cp", "co", "ep", "eo")
+
+    def __init__(self, cp=None, co=None, ep=None, eo=None):
+        self.cp = list(cp) if cp is not None else list(range(8))
+        self.co = list(co) if co is not None else [0] * 8
+        self.ep = list(ep) if ep is not None else list(range(12))
+        self.eo = list(eo) if eo is not None else [0] * 12
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Extract the cubies from a CubeState (or a facelet dictionary).
+
+        Raises:
+            ValueError: If a corner or edge shows a color combination that
+                does not exist on a cube.
+        """
+        if isinstance(state, dict):
+            state = CubeState.from_dict(state)
+        facelets = state.facelets
+        centers = facelets[4::9]
+        if centers != _CENTER_COLORS:
+            # Rotated states keep their stored colors; renumber them so that
+            # the center of face k shows color k.
+            facelets = facelets.translate(bytes.maketrans(centers, _CENTER_COLORS))
+        colors = iter(_CORNER_GATHER(facelets))
+        corners = list(map(_CORNER_LOOKUP.get, zip(colors, colors, colors)))
+        if None in corners:
+            raise ValueError(
+                f"The corner at {CORNERS[corners.index(None)]} has impossible colors."
+            )
+        colors = iter(_EDGE_GATHER(facelets))
+        edges = list(map(_EDGE_LOOKUP.get, zip(colors, colors)))
+        if None in edges:
+            raise ValueError(
+                f"The edge at {EDGES[edges.index(None)]} has impossible colors."
+            )
+        cp, co = zip(*corners)
+        ep, eo = zip(*edges)
+        return cls(cp, co, ep, eo)
+
+    def to_state(self, palette=tuple(FACES)):
+        """
+        Convert the cubies back to a CubeState.
+        """
+        facelets = bytearray(54)
+        for face in range(6):
+            facelets[9 * face + 4] = face
+        for position, indices in enumerate(CORNER_INDICES):
+            colors = CORNER_COLORS[self.cp[position]]
+            twist = self.co[position]
+            for offset, index in enumerate(indices):
+                facelets[index] = colors[(offset - twist) % 3]
+        for position, indices in enumerate(EDGE_INDICES):
+            colors = EDGE_COLORS[self.ep[position]]
+            flip = self.eo[position]
+            for offset, index in enumerate(indices):
+                facelets[index] = colors[(offset + flip) % 2]
+        return CubeState(facelets, palette)
+
+    def copy(self):
+        return CubieCube(self.cp, self.co, self.ep, self.eo)
+
+    def multiply(self, other):
+        """
+        Apply `other` after this cube, in place.
+        """
+        self.cp, self.co = (
+            [self.cp[source] for source in other.cp],
+            [
+                (self.co[source] + twist) % 3
+                for source, twist in zip(other.cp, other.co)
+            ],
+        )
+        self.ep, self.eo = (
+            [self.ep[source] for source in other.ep],
+            [(self.eo[source] + flip) % 2 for source, flip in zip(other.ep, other.eo)],
+        )
+        return self
+
+    def inverse(self):
+        """
+        Return the cube that undoes this one.
+        """
+        inverse = CubieCube()
+        for position, corner in enumerate(self.cp):
+            inverse.cp[corner] = position
+            inverse.co[corner] = (-self.co[position]) % 3
+        for position, edge in enumerate(self.ep):
+            inverse.ep[edge] = position
+            inverse.eo[edge] = self.eo[position]
+        return inverse
+
+    def verify(self):
+        """
+        Check that the cubies form a cube that can be solved.
+
+        Every corner and edge must appear once, the corner twists must add
+        up to a multiple of 3 and the edge flips to a multiple of 2, and the
+        corner and edge permutations must have the same parity. No sequence
+        of turns twists a single corner, flips a single edge or swaps a
+        single pair of pieces.
+
+        Raises:
+            ValueError: Naming the first check that fails.
+        """
+        for kind, names, pieces in (
+            ("corner", CORNERS, self.cp),
+            ("edge", EDGES, self.ep),
+        ):
+            if len(set(pieces)) != len(pieces):
+                duplicate = next(piece for piece in pieces if pieces.count(piece) > 1)
+                missing = [
+                    name for piece, name in enumerate(names) if piece not in pieces
+                ]
+                raise ValueError(
+                    f"The {kind} {names[duplicate]} appears more than once; "
+                    f"missing: {', '.join(missing)}."
+                )
+        twist = sum(self.co) % 3
+        if twist:
+            raise ValueError(
+                f"A corner is twisted: the corner twists add up to {twist} more "
+                "than a multiple of 3."
+            )
+        if sum(self.eo) % 2:
+            raise ValueError(
+                "An edge is flipped: the edge flips add up to an odd number."
+            )
+        if permutation_parity(self.cp) != permutation_parity(self.ep):
+            raise ValueError(
+                "Two pieces are swapped: the corner and edge permutations have "
+                "different parity."
+            )
+
+    def move(self, move):
+        """
+        Apply one of the 18 face turns in MOVES, in place.
+        """
+        return self.multiply(MOVE_CUBES[move])
+
+    def __eq__(self, other):
+        if not isinstance(other, CubieCube):
+            return NotImplemented
+        return (self.cp, self.co, self.ep, self.eo) == (
+            other.cp,
+            other.co,
+            other.ep,
+            other.eo,
+        )
+
+    def __repr__(self):
+        return f"CubieCube(cp={self.cp}, co={self.co}, ep={self.ep}, eo={self.eo})"
+
+    # Below are the integer coordinates. Getters rank the current state,
+    # setters overwrite the affected pieces with the unranked state.
+    @property
+    def twist(self):
+        """
+        Orientation of corners URF..DBL in base 3 (DRB follows), 0..2186.
+        """
+        twist = 0
+        for value in self.co[:7]:
+            twist = twist * 3 + value
+        return twist
+
+    @twist.setter
+    def twist(self, twist):
+        total = 0
+        for position in range(6, -1, -1):
+            twist, self.co[position] = divmod(twist, 3)
+            total += self.co[position]
+        self.co[7] = -total % 3
+
+    @property
+    def flip(self):
+        """
+        Orientation of edges UR..BL in base 2 (BR follows), 0..2047.
+        """
+        flip = 0
+        for value in self.eo[:11]:
+            flip = flip * 2 + value
+        return flip
+
+    @flip.setter
+    def flip(self, flip):
+        total = 0
+        for position in range(10, -1, -1):
+            flip, self.eo[position] = divmod(flip, 2)
+            total += self.eo[position]
+        self.eo[11] = total % 2
+
+    @property
+    def slice_position(self):
+        """
+        Which 4 positions hold the FR, FL, BL and BR edges, 0..494 (0 when solved).
+        """
+        rank, found = 0, 0
+        for position in range(11, -1, -1):
+            if self.ep[position] >= 8:
+                rank += comb(11 - position, found + 1)
+                found += 1
+        return rank
+
+    @slice_position.setter
+    def slice_position(self, rank):
+        slice_edges = iter(range(8, 12))
+        other_edges = iter(range(8))
+        remaining = 4
+        slots = [None] * 12
+        for position in range(12):
+            if remaining and rank >= comb(11 - position, remaining):
+                rank -= comb(11 - position, remaining)
+                slots[position] = next(slice_edges)
+                remaining -= 1
+        self.ep = [edge if edge is not None else next(other_edges) for edge in slots]
+
+    @property
+    def corner_permutation(self):
+        """
+        Rank of the corner permutation, 0..40319.
+        """
+        return rank_permutation(self.cp)
+
+    @corner_permutation.setter
+    def corner_permutation(self, rank):
+        self.cp = unrank_permutation(rank, 8)
+
+    @property
+    def edge_permutation(self):
+        """
+        Rank of the edge permutation, 0..479001599.
+        """
+        return rank_permutation(self.ep)
+
+    @edge_permutation.setter
+    def edge_permutation(self, rank):
+        self.ep = unrank_permutation(rank, 12)
+
+
+MOVE_CUBES = {}
+for _face in FACES:
+    _quarter = CubieCube.from_state(CubieCube().to_state().move(_face.lower()))
+    MOVE_CUBES[_face.lower()] = _quarter
+    MOVE_CUBES[f"{_face.lower()}2"] = _quarter.copy().multiply(_quarter)
+    MOVE_CUBES[f"{_face.lower()}'"] = _quarter.inverse()
+
+
+def _coordinate_move_table(size, coordinate):
+    # Only the six quarter turns are computed cubie by cubie; half and
+    # inverse turns follow by chaining the quarter-turn column.
+    table = np.zeros((size, len(MOVES)), dtype=np.uint16)
+    cube = CubieCube()
+    for face_index, face in enumerate(FACES):
+        quarter = MOVE_CUBES[face.lower()]
+        column = np.zeros(size, dtype=np.uint16)
+        for value in range(size):
+            setattr(cube, coordinate, value)
+            cube.multiply(quarter)
+            column[value] = getattr(cube, coordinate)
+        table[:, 3 * face_index] = column
+        table[:, 3 * face_index + 1] = column[column]
+        table[:, 3 * face_index + 2] = column[column[column]]
+    return table
+
+
+@register_table("twist_move")
+def build_twist_move_table():
+    return _coordinate_move_table(N_TWIST, "twist")
+
+
+@register_table("flip_move")
+def build_flip_move_table():
+    return _coordinate_move_table(N_FLIP, "flip")
+
+
+@register_table("slice_move")
+def build_slice_move_table():
+    return _coordinate_move_table(N_SLICE, "slice_position")
+
+
+@register_table("corner_permutation_move")
+def build_corner_permutation_move_table():
+    return _coordinate_move_table(N_CORNER_PERMUTATION, "corner_permutation")
+
+
+COORDINATE_TABLES = {
+    "twist": "twist_move",
+    "flip": "flip_move",
+    "slice_position": "slice_move",
+    "corner_permutation": "corner_permutation_move",
+}
+
+
+def coordinate_move(coordinate, value, move):
+    """
+    Look up the value of `coordinate` after applying `move`, e.g.
+    ``coordinate_move("twist", cube.twist, "r")``.
+    """
+    return int(load_table(COORDINATE_TABLES[coordinate])[value, MOVES.index(move)])
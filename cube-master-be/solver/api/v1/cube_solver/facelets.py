@@ -0,0 +1,85 @@
+"""
+Facelet indexing and move permutations shared by the cube state engines.
+
+Facelets are numbered in Kociemba order (U, R, F, D, L, B) with nine stickers
+per face, so index ``9 * face + (n - 1)`` holds the sticker named
+``f"{face}{n}"``. A permutation ``perm`` is applied as a gather:
+``new[i] = old[perm[i]]``.
+"""
+
+from solver.api.v1.cube_solver.layers import moves
+
+FACES = "URFDLB"
+
+FACELETS = tuple(f"{face}{n}" for face in FACES for n in range(1, 10))
+
+FACELET_INDEX = {name: index for index, name in enumerate(FACELETS)}
+
+CENTER_INDICES = tuple(9 * face + 4 for face in range(6))
+
+IDENTITY = tuple(range(54))
+
+# The facelets of every corner and edge position (numbered as in
+# cube_solver.cubie), U/D sticker first and
+# the remaining corner stickers in clockwise order.
+CORNER_FACELETS = (
+    ("U9", "R1", "F3"),
+    ("U7", "F1", "L3"),
+    ("U1", "L1", "B3"),
+    ("U3", "B1", "R3"),
+    ("D3", "F9", "R7"),
+    ("D1", "L9", "F7"),
+    ("D7", "B9", "L7"),
+    ("D9", "R9", "B7"),
+)
+EDGE_FACELETS = (
+    ("U6", "R2"),
+    ("U8", "F2"),
+    ("U4", "L2"),
+    ("U2", "B2"),
+    ("D6", "R8"),
+    ("D2", "F8"),
+    ("D4", "L8"),
+    ("D8", "B8"),
+    ("F6", "R4"),
+    ("F4", "L6"),
+    ("B6", "L4"),
+    ("B4", "R6"),
+)
+
+
+def _permutation_from_move(move_function):
+    # Run the dictionary move on a cube whose stickers are their own names;
+    # every facelet then tells us which facelet its color came from.
+    labelled_cube = move_function({name: name for name in FACELETS})
+    return tuple(FACELET_INDEX[labelled_cube[name]] for name in FACELETS)
+
+
+MOVE_PERMUTATIONS = {
+    move: _permutation_from_move(move_function)
+    for move, move_function in moves.MOVE_FUNCTIONS.items()
+}
+
+
+def compose(first, second):
+    """
+    Compose two facelet permutations.
+
+    Args:
+        first (tuple): Permutation applied first.
+        second (tuple): Permutation applied second.
+
+    Returns:
+        tuple: A permutation equivalent to applying `first` and then `second`.
+    """
+    return tuple(first[index] for index in second)
+
+
+def invert(permutation):
+    """
+    Return the inverse of a facelet permutation.
+    """
+    inverse = [0] * len(permutation)
+    for index, source in enumerate(permutation):
+        inverse[source] = index
+    return tuple(inverse)
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from solver.api.v1.cube_solver.state import CubeState
+
 
 class BaseSolverStep:
     """
@@ -8,6 +10,14 @@ class BaseSolverStep:
     """
 
     def __init__(self, cube):
+        """
+        Args:
+            cube (dict or CubeState): The cube. A facelet dictionary is
+                converted to a CubeState, which the steps and their result
+                use from then on.
+        """
+        if isinstance(cube, dict):
+            cube = CubeState.from_dict(cube)
         self.cube = cube
         self.sequence = []
         self.sequence_cube = cube.copy()
@@ -1,111 +1,77 @@
-from solver.api.v1.cube_solver.layers import moves
-
-
-def lefty_algorithm():
-    return ["l'", "u'", "l", "u"]
-
-
-def righty_algorithm():
-    return ["r", "u", "r'", "u'"]
-
-
-def front_top_left(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["F1"] == rubiks_cube["D5"]:
-        sequence = ["f", "u", "f'"]
-    elif rubiks_cube["L3"] == rubiks_cube["D5"]:
-        sequence = ["l'", "u'", "l"]
-    else:
-        for x in range(3):
-            sequence.extend(["l'", "u'", "l", "u"])
-
-    return sequence
-
-
-def front_bottom_left(rubiks_cube):
-    sequence = []
-    rubiks_cube_copy = rubiks_cube.copy()
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["D1"] == rubiks_cube["D5"]:
-        sequence = []
-    else:
-        sequence.extend(["l'", "u'", "l", "u"])
-        for move in sequence:
-            rubiks_cube_copy = moves.execute_move(rubiks_cube_copy, move)
-        sequence.extend(front_top_left(rubiks_cube_copy))
-    return sequence
-
-
-def front_top_right(rubiks_cube):
-    sequence = []
-    rubiks_cube_copy = rubiks_cube.copy()
-
-    # Decide on the sequence of moves based on the condition
-    sequence.append("u")
-    for move in sequence:
-        rubiks_cube_copy = moves.execute_move(rubiks_cube_copy, move)
-    sequence.extend(front_top_left(rubiks_cube_copy))
-    return sequence
-
-
-def front_bottom_right(rubiks_cube):
-    sequence = []
-    rubiks_cube_copy = rubiks_cube.copy()
-
-    # Decide on the sequence of moves based on the condition
-    sequence.extend(["r", "u", "r'"])
-    for move in sequence:
-        rubiks_cube_copy = moves.execute_move(rubiks_cube_copy, move)
-    sequence.extend(front_top_left(rubiks_cube_copy))
-    return sequence
-
-
-def right_right_top(rubiks_cube):
-    sequence = []
-    rubiks_cube_copy = rubiks_cube.copy()
-
-    # Decide on the sequence of moves based on the condition
-    sequence.extend(["u", "u"])
-    for move in sequence:
-        rubiks_cube_copy = moves.execute_move(rubiks_cube_copy, move)
-    sequence.extend(front_top_left(rubiks_cube_copy))
-    return sequence
-
-
-def right_right_bottom(rubiks_cube):
-    sequence = []
-    rubiks_cube_copy = rubiks_cube.copy()
-
-    # Decide on the sequence of moves based on the condition
-    sequence.extend(["b", "u", "u", "b'"])
-    for move in sequence:
-        rubiks_cube_copy = moves.execute_move(rubiks_cube_copy, move)
-    sequence.extend(front_top_left(rubiks_cube_copy))
-    return sequence
-
-
-def left_left_top(rubiks_cube):
-    sequence = []
-    rubiks_cube_copy = rubiks_cube.copy()
-
-    # Decide on the sequence of moves based on the condition
-    sequence.append("u'")
-    for move in sequence:
-        rubiks_cube_copy = moves.execute_move(rubiks_cube_copy, move)
-    sequence.extend(front_top_left(rubiks_cube_copy))
-    return sequence
-
-
-def left_left_bottom(rubiks_cube):
-    sequence = []
-    rubiks_cube_copy = rubiks_cube.copy()
-
-    # Decide on the sequence of moves based on the condition
-    sequence.extend(["b'", "u'", "b"])
-    for move in sequence:
-        rubiks_cube_copy = moves.execute_move(rubiks_cube_copy, move)
-    sequence.extend(front_top_left(rubiks_cube_copy))
-    return sequence
+"""
+Bottom corner cases.
+
+A case is keyed by the corner slot holding the down-front-left corner, as its
+three facelets, and the facelet of that slot showing the down color. Corners
+are first brought to F1/U7/L3 by a setup and then inserted into F7/L9/D1;
+the setup and insertion are joined into one algorithm per case at import.
+"""
+
+from solver.api.v1.cube_solver.layers.case_registry import (
+    compile_cases,
+    lookup_case,
+    sticker_destinations,
+)
+
+INSERTION_SLOT = ("F1", "U7", "L3")
+SOLVED_SLOT = ("F7", "L9", "D1")
+
+# Insertions from F1/U7/L3 into F7/L9/D1, by the facelet showing the down color.
+INSERTION_ALGORITHMS = {
+    "F1": ["f", "u", "f'"],
+    "L3": ["l'", "u'", "l"],
+    "U7": ["l'", "u'", "l", "u"] * 3,
+}
+
+# Setups bringing a corner from every other slot to F1/U7/L3.
+SETUP_ALGORITHMS = {
+    ("F3", "U9", "R1"): ["u"],
+    ("F7", "L9", "D1"): ["l'", "u'", "l", "u"],
+    ("F9", "R7", "D3"): ["r", "u", "r'"],
+    ("U1", "L1", "B3"): ["u'"],
+    ("U3", "R3", "B1"): ["u", "u"],
+    ("L7", "D7", "B9"): ["b'", "u'", "b"],
+    ("R9", "D9", "B7"): ["b", "u", "u", "b'"],
+}
+
+
+def _corner_algorithms():
+    algorithms = {
+        (INSERTION_SLOT, name): moves for name, moves in INSERTION_ALGORITHMS.items()
+    }
+    for slot, setup in SETUP_ALGORITHMS.items():
+        destinations = sticker_destinations(setup)
+        for name in slot:
+            insertion = INSERTION_ALGORITHMS.get(destinations[name])
+            if insertion is None:
+                raise ValueError(f"{setup} does not bring {slot} to {INSERTION_SLOT}.")
+            algorithms[(slot, name)] = setup + insertion
+
+    # A corner already in place needs no moves.
+    algorithms[(SOLVED_SLOT, "D1")] = []
+    return algorithms
+
+
+CORNER_CASES = compile_cases(_corner_algorithms())
+
+
+# The slot, as keyed in CORNER_CASES, of every corner facelet.
+_SLOTS = {name: slot for slot, _ in CORNER_CASES for name in slot}
+
+
+def corner_case(rubiks_cube):
+    """
+    Find the case bringing the down-front-left corner to F7/L9/D1.
+
+    Args:
+        rubiks_cube (CubeState): The cube.
+
+    Returns:
+        tuple: The compiled case (moves, permutation).
+    """
+    down_facelet, _, _ = rubiks_cube.locate(
+        rubiks_cube["D5"], rubiks_cube["F5"], rubiks_cube["L5"]
+    )
+    return lookup_case(
+        CORNER_CASES, (_SLOTS[down_facelet], down_facelet), "bottom corner"
+    )
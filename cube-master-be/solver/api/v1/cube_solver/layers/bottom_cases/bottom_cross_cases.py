@@ -1,131 +1,61 @@
-def piece_on_front_top(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["F2"] == rubiks_cube["F5"]:
-        sequence = ["f", "f"]
-    else:
-        sequence = ["u'", "r'", "f", "r"]
-    return sequence
-
-
-def piece_on_front_right(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["F6"] == rubiks_cube["F5"]:
-        sequence = ["f"]
-    else:
-        sequence = ["r", "u", "r'", "f", "f"]
-    return sequence
-
-
-def piece_on_front_left(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["F4"] == rubiks_cube["F5"]:
-        sequence = ["f'"]
-    else:
-        sequence = ["l'", "u'", "l", "f", "f"]
-    return sequence
-
-
-def piece_on_front_bottom(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["F8"] == rubiks_cube["F5"]:
-        sequence = []
-    else:
-        sequence = ["f", "l'", "u'", "l", "f", "f"]
-    return sequence
-
-
-def piece_on_right_top(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["R2"] == rubiks_cube["F5"]:
-        sequence = ["u", "f", "f"]
-    else:
-        sequence = ["r'", "f", "r"]
-    return sequence
-
-
-def piece_on_right_right(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["R6"] == rubiks_cube["F5"]:
-        sequence = ["r'", "u", "f", "f", "r"]
-    else:
-        sequence = ["r'", "r'", "f", "r", "r"]
-    return sequence
-
-
-def piece_on_right_bottom(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["R8"] == rubiks_cube["F5"]:
-        sequence = ["d'", "f", "d", "f'"]
-    else:
-        sequence = ["r", "f"]
-    return sequence
-
-
-def piece_on_left_top(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["L2"] == rubiks_cube["F5"]:
-        sequence = ["u'", "f", "f"]
-    else:
-        sequence = ["l", "f'", "l'"]
-    return sequence
-
-
-def piece_on_left_left(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["L4"] == rubiks_cube["F5"]:
-        sequence = ["l", "u'", "f", "f", "l'"]
-    else:
-        sequence = ["l", "l", "f'", "l'", "l'"]
-    return sequence
-
-
-def piece_on_left_bottom(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["L8"] == rubiks_cube["F5"]:
-        sequence = ["d", "f", "d'", "f'"]
-    else:
-        sequence = ["l'", "f'"]
-
-    return sequence
-
-
-def piece_on_back_top(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["B2"] == rubiks_cube["F5"]:
-        sequence = ["u", "u", "f", "f"]
-    else:
-        sequence = ["u", "r'", "f", "r"]
-    return sequence
-
-
-def piece_on_back_bottom(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["B8"] == rubiks_cube["F5"]:
-        sequence = ["d'", "d'", "f", "d", "d", "f'"]
-    else:
-        sequence = ["d'", "r", "d", "f"]
-    return sequence
+"""
+Bottom cross cases.
+
+A case is keyed by the edge slot holding the down-front edge, as its two
+facelets, and the facelet of that slot showing the front color. Its
+algorithm brings the edge to F8/D2 with the front color on F8.
+"""
+
+from solver.api.v1.cube_solver.layers.case_registry import (
+    compile_cases,
+    lookup_case,
+)
+
+CROSS_CASES = compile_cases(
+    {
+        (("F2", "U8"), "F2"): ["f", "f"],
+        (("F2", "U8"), "U8"): ["u'", "r'", "f", "r"],
+        (("F4", "L6"), "F4"): ["f'"],
+        (("F4", "L6"), "L6"): ["l'", "u'", "l", "f", "f"],
+        (("F6", "R4"), "F6"): ["f"],
+        (("F6", "R4"), "R4"): ["r", "u", "r'", "f", "f"],
+        (("F8", "D2"), "F8"): [],
+        (("F8", "D2"), "D2"): ["f", "l'", "u'", "l", "f", "f"],
+        (("U2", "B2"), "B2"): ["u", "u", "f", "f"],
+        (("U2", "B2"), "U2"): ["u", "r'", "f", "r"],
+        (("U4", "L2"), "L2"): ["u'", "f", "f"],
+        (("U4", "L2"), "U4"): ["l", "f'", "l'"],
+        (("U6", "R2"), "R2"): ["u", "f", "f"],
+        (("U6", "R2"), "U6"): ["r'", "f", "r"],
+        (("B4", "R6"), "R6"): ["r'", "u", "f", "f", "r"],
+        (("B4", "R6"), "B4"): ["r'", "r'", "f", "r", "r"],
+        (("B6", "L4"), "L4"): ["l", "u'", "f", "f", "l'"],
+        (("B6", "L4"), "B6"): ["l", "l", "f'", "l'", "l'"],
+        (("B8", "D8"), "B8"): ["d'", "d'", "f", "d", "d", "f'"],
+        (("B8", "D8"), "D8"): ["d'", "r", "d", "f"],
+        (("R8", "D6"), "R8"): ["d'", "f", "d", "f'"],
+        (("R8", "D6"), "D6"): ["r", "f"],
+        (("L8", "D4"), "L8"): ["d", "f", "d'", "f'"],
+        (("L8", "D4"), "D4"): ["l'", "f'"],
+    }
+)
+
+
+# The slot, as keyed in CROSS_CASES, of every edge facelet.
+_SLOTS = {name: slot for slot, _ in CROSS_CASES for name in slot}
+
+
+def cross_case(rubiks_cube):
+    """
+    Find the case bringing the down-front edge to F8.
+
+    Args:
+        rubiks_cube (CubeState): The cube.
+
+    Returns:
+        tuple: The compiled case (moves, permutation).
+    """
+    _, front_facelet = rubiks_cube.locate(rubiks_cube["D5"], rubiks_cube["F5"])
+    return lookup_case(
+        CROSS_CASES, (_SLOTS[front_facelet], front_facelet), "bottom cross"
+    )
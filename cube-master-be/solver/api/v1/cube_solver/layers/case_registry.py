@@ -0,0 +1,93 @@
+"""
+Compiled case registries for the layer-by-layer (beginner) solver.
+
+Each case module lists its cases as data, keyed by where the piece to solve
+is and how it is oriented (facelet names such as ("F2", "U8") and "F2"), and
+compiles them once at import. A step then finds its case with one dictionary
+lookup and applies the whole algorithm with a single gather.
+"""
+
+from solver.api.v1.cube_solver.facelets import FACELETS
+from solver.api.v1.cube_solver.sequence import compile_sequence
+from solver.api.v1.cube_solver.state import CubeState
+
+# U-layer alignment: how many U turns bring the sticker on each side
+# facelet of the U layer to F2 (one "u" takes R2 to F2), and how those
+# turns are written.
+FRONT_U_TURNS = {"F2": 0, "R2": 1, "B2": 2, "L2": 3}
+U_TURN_MOVES = ((), ("u",), ("u", "u"), ("u'",))
+
+
+def compile_cases(algorithms):
+    """
+    Compile every case algorithm into one facelet permutation.
+
+    Args:
+        algorithms (dict): Case key -> moves, e.g. {(("F2", "U8"), "F2"): ["f", "f"]}.
+
+    Returns:
+        dict: Case key -> (moves, permutation).
+
+    Raises:
+        ValueError: If an algorithm contains an unknown move.
+    """
+    return {
+        key: (tuple(moves), compile_sequence(moves))
+        for key, moves in algorithms.items()
+    }
+
+
+def lookup_case(cases, key, name):
+    """
+    Look up a compiled case.
+
+    Args:
+        cases (dict): Compiled cases, see compile_cases.
+        key: The case key.
+        name (str): Name of the step, for the error message.
+
+    Returns:
+        tuple: The compiled case (moves, permutation).
+
+    Raises:
+        ValueError: If there is no case for the key.
+    """
+    case = cases.get(key)
+    if case is None:
+        raise ValueError(f"Unknown {name} case: {key}")
+    return case
+
+
+def apply_case(rubiks_cube, case):
+    """
+    Apply a compiled case with a single gather.
+
+    Args:
+        rubiks_cube (dict or CubeState): The cube to turn.
+        case (tuple): The compiled case (moves, permutation).
+
+    Returns:
+        tuple: (list of moves applied, turned cube in the input's representation)
+    """
+    moves, permutation = case
+    if isinstance(rubiks_cube, dict):
+        turned = CubeState.from_dict(rubiks_cube).permute(permutation).to_dict()
+    else:
+        turned = rubiks_cube.permute(permutation)
+    return list(moves), turned
+
+
+def sticker_destinations(moves):
+    """
+    Where the sticker on every facelet ends up after a move sequence.
+
+    Args:
+        moves (list): Moves such as ["u", "r"].
+
+    Returns:
+        dict: Facelet name -> facelet name, e.g. {"F1": "L1", ...} for ["u"].
+    """
+    permutation = compile_sequence(moves)
+    return {
+        FACELETS[source]: FACELETS[index] for index, source in enumerate(permutation)
+    }
@@ -0,0 +1,32 @@
+from solver.api.v1.cube_solver.layers.bottom import BottomLayerSolver
+from solver.api.v1.cube_solver.layers.bottom_cases import cross_table
+from solver.api.v1.cube_solver.sequence import apply_sequence
+
+
+class CrossSolver(BottomLayerSolver):
+    """
+    Table-driven solver for the bottom cross: one lookup of an optimal solution.
+    """
+
+    def solve(self):
+        """
+        Solve the bottom cross of the Rubik's Cube.
+        """
+
+        self.run_step(
+            self.cross_step,
+            self.bottom_cross_validator,
+            "Bottom Cross",
+        )
+        return self.sequence, self.cube
+
+    def cross_step(self):
+        """
+        Step to solve the bottom cross from the optimal cross table.
+        Returns a tuple of (moves, updated_cube).
+        """
+        cross_moves = cross_table.cross_solution(self.cube)
+        self.cube = apply_sequence(self.cube, cross_moves)
+        self.sequence.extend(cross_moves)
+
+        return self.sequence, self.cube
@@ -0,0 +1,67 @@
+from solver.api.v1.cube_solver.layers import moves
+from solver.api.v1.cube_solver.layers.second import SecondLayerSolver
+from solver.api.v1.cube_solver.layers.second_cases import f2l_table
+from solver.api.v1.cube_solver.sequence import apply_sequence, remove_rotations
+
+
+class F2LSolver(SecondLayerSolver):
+    """
+    Table-driven solver for the first two layers, one corner-edge pair at a time.
+    """
+
+    def solve(self):
+        """
+        Solve the first two layers of a cube whose bottom cross is solved.
+        """
+
+        self.run_step(
+            self.f2l_step,
+            self.second_layer_validator,
+            "First Two Layers",
+        )
+
+        return self.sequence, self.cube
+
+    def f2l_step(self):
+        """
+        Step to insert the four corner-edge pairs, shortest insertion first.
+        Returns a tuple of (moves, updated_cube).
+        """
+        for _ in range(4):
+            pair_moves = self._shortest_pair_insertion(self.cube)
+            if pair_moves is None:
+                break
+
+            self.cube = apply_sequence(self.cube, pair_moves)
+            self.sequence.extend(pair_moves)
+
+        return self.sequence, self.cube
+
+    # Below are the helper methods used by the f2l_step method.
+    def _shortest_pair_insertion(self, rubiks_cube):
+        """
+        Find the shortest insertion of any unsolved pair.
+
+        Every slot is looked at as the front-right one by turning the cube
+        with "rl", which for compact states only changes the viewing frame.
+        The table moves are then relabeled back to the cube's own orientation.
+
+        Args:
+            rubiks_cube (CubeState): The cube with the bottom cross solved.
+
+        Returns:
+            list or None: The moves, or None when all four slots are solved.
+        """
+        shortest = None
+        rotations = []
+        for _ in range(4):
+            pair = f2l_table.pair_state(rubiks_cube)
+            if pair != f2l_table.SOLVED_PAIR:
+                pair_moves = remove_rotations(rotations + f2l_table.pair_solution(pair))
+                if shortest is None or len(pair_moves) < len(shortest):
+                    shortest = pair_moves
+
+            rubiks_cube = moves.execute_move(rubiks_cube, "rl")
+            rotations.append("rl")
+
+        return shortest
@@ -0,0 +1,83 @@
+from solver.api.v1.cube_solver.layers.base import BaseSolverStep
+from solver.api.v1.cube_solver.layers.top_cases import last_layer_table
+from solver.api.v1.cube_solver.sequence import apply_sequence
+
+
+class LastLayerSolver(BaseSolverStep):
+    """
+    Table-driven solver for the last layer: one OLL and one PLL lookup.
+    """
+
+    def solve(self):
+        """
+        Solve the last layer of a cube whose first two layers are solved.
+        """
+
+        self.run_step(
+            self.orientation_step,
+            self.orientation_validator,
+            "Last Layer Orientation",
+        )
+
+        self.run_step(
+            self.permutation_step,
+            self.permutation_validator,
+            "Last Layer Permutation",
+        )
+
+        return self.sequence, self.cube
+
+    def orientation_step(self):
+        """
+        Step to orient all U-layer pieces (OLL).
+        Returns a tuple of (moves, updated_cube).
+        """
+        algorithm = last_layer_table.OLL_TABLE.get(last_layer_table.oll_key(self.cube))
+        if algorithm is None:
+            raise ValueError("Unknown last layer orientation case.")
+
+        self._apply(algorithm)
+        return self.sequence, self.cube
+
+    def orientation_validator(self):
+        """
+        Validate that the first two layers are solved and the U face is one color.
+        """
+        if not self._first_two_layers_solved():
+            return False
+        return all(self.cube["U5"] == self.cube[f"U{x}"] for x in "12346789")
+
+    def permutation_step(self):
+        """
+        Step to permute the U-layer pieces, AUF included (PLL).
+        Returns a tuple of (moves, updated_cube).
+        """
+        algorithm = last_layer_table.PLL_TABLE.get(last_layer_table.pll_key(self.cube))
+        if algorithm is None:
+            raise ValueError("Unknown last layer permutation case.")
+
+        self._apply(algorithm)
+        return self.sequence, self.cube
+
+    def permutation_validator(self):
+        """
+        Validate that the cube is solved.
+        """
+        faces = ["F", "L", "R", "B", "U", "D"]
+        for face in faces:
+            if not all(
+                self.cube[f"{face}5"] == self.cube[f"{face}{x}"] for x in "12346789"
+            ):
+                return False
+        return True
+
+    # Below are the helper methods used by the steps.
+    def _apply(self, algorithm):
+        self.cube = apply_sequence(self.cube, algorithm)
+        self.sequence.extend(algorithm)
+
+    def _first_two_layers_solved(self):
+        return all(
+            self.cube[name] == self.cube[f"{name[0]}5"]
+            for name in last_layer_table.FIRST_TWO_LAYERS_FACELETS
+        )
@@ -664,6 +664,9 @@ MOVE_FUNCTIONS = {
 
 
 def execute_move(rubiks_cube, move):
+    # Compact cube states (see cube_solver.state) apply moves themselves.
+    if not isinstance(rubiks_cube, dict):
+        return rubiks_cube.move(move)
     func = MOVE_FUNCTIONS.get(move)
     if not func:
         raise ValueError(f"Invalid move: {move}")
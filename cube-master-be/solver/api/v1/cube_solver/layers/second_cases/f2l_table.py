@@ -0,0 +1,166 @@
+"""
+F2L pair-insertion table.
+
+With the cross solved, a corner-edge pair is solved into the front-right
+slot by one lookup keyed by the pair state: where the DFR corner is and how
+it is twisted, where the FR edge is and how it is flipped (cubie numbering,
+see cube_solver.cubie), 384 states in all.
+
+The table is built at import by a shortest-path search over short triggers
+that each touch only the U layer and one slot. Triggers of the other slots
+are only used to take a piece of the pair out of them, so the cross and any
+solved pair are always kept.
+"""
+
+import heapq
+
+from solver.api.v1.cube_solver.cubie import (
+    CORNER_FACELETS,
+    EDGE_FACELETS,
+    MOVE_CUBES,
+    CubieCube,
+)
+from solver.api.v1.cube_solver.notation import invert_sequence, parse_algorithm
+from solver.api.v1.cube_solver.optimizer import optimize_sequence
+
+SLOT_CORNER = 4  # DFR
+SLOT_EDGE = 8  # FR
+SOLVED_PAIR = (SLOT_CORNER, 0, SLOT_EDGE, 0)
+
+# Triggers that only touch the U layer and the front-right slot.
+INSERTION_TRIGGERS = ("U", "R U R'", "R U2 R'", "F' U F", "F' U2 F")
+
+# The other slots as (corner position, edge position, triggers that only
+# touch the U layer and that slot). They may only be used to take a piece of
+# the pair out, since the slot might hold an already solved pair.
+EXTRACTION_TRIGGERS = (
+    (5, 9, ("L' U L", "L' U2 L", "F U F'", "F U2 F'")),  # FL
+    (6, 10, ("L U L'", "L U2 L'", "B' U B", "B' U2 B")),  # BL
+    (7, 11, ("R' U R", "R' U2 R", "B U B'", "B U2 B'")),  # BR
+)
+
+_CROSS_EDGES = (4, 5, 6, 7)
+
+N_PAIR_CASES = 8 * 3 * 8 * 2
+
+# (position, twist) of a corner whose down sticker is on each facelet, and
+# (position, flip) of an edge whose front sticker is on each facelet.
+_CORNER_POSITIONS = {
+    name: (position, twist)
+    for position, names in enumerate(CORNER_FACELETS)
+    for twist, name in enumerate(names)
+}
+_EDGE_POSITIONS = {
+    name: (position, flip)
+    for position, names in enumerate(EDGE_FACELETS)
+    for flip, name in enumerate(names)
+}
+
+
+def _macro_cube(sequence):
+    cube = CubieCube()
+    for move in sequence:
+        cube.multiply(MOVE_CUBES[move])
+    return cube
+
+
+def _transition(sequence, kept_slots):
+    cube = _macro_cube(sequence)
+    kept_corners = [corner for corner, _, _ in kept_slots]
+    kept_edges = list(_CROSS_EDGES) + [edge for _, edge, _ in kept_slots]
+    if any(cube.cp[i] != i or cube.co[i] for i in kept_corners) or any(
+        cube.ep[i] != i or cube.eo[i] for i in kept_edges
+    ):
+        raise ValueError(f"{sequence} does not keep the cross and the other slots.")
+
+    # A piece at position `source` moves to the position that takes from it.
+    corners = {source: (i, cube.co[i]) for i, source in enumerate(cube.cp)}
+    edges = {source: (i, cube.eo[i]) for i, source in enumerate(cube.ep)}
+
+    def apply(pair):
+        corner, twist, edge, flip = pair
+        corner, corner_twist = corners[corner]
+        edge, edge_flip = edges[edge]
+        return corner, (twist + corner_twist) % 3, edge, flip ^ edge_flip
+
+    return apply
+
+
+def _macros():
+    # Every macro as (moves, inverse transition, slot pieces or None). Each
+    # trigger is used in both directions.
+    macros = []
+    slots = [(None, None, INSERTION_TRIGGERS)] + list(EXTRACTION_TRIGGERS)
+    for corner, edge, triggers in slots:
+        kept_slots = [slot for slot in EXTRACTION_TRIGGERS if slot[0] != corner]
+        for trigger in triggers:
+            sequence = parse_algorithm(trigger)
+            for macro in (sequence, invert_sequence(sequence)):
+                inverse = _transition(invert_sequence(macro), kept_slots)
+                macros.append((macro, inverse, corner, edge))
+    return macros
+
+
+def _build_table():
+    # Dijkstra backwards from the solved pair, weighted by move count: the
+    # state a macro turns into an already solved state is solved by that
+    # macro followed by the stored solution.
+    table = {}
+    counter = 0
+    queue = [(0, counter, SOLVED_PAIR, [])]
+    macros = _macros()
+    while queue:
+        cost, _, pair, solution = heapq.heappop(queue)
+        if pair in table:
+            continue
+        table[pair] = optimize_sequence(solution)
+        for macro, inverse, corner, edge in macros:
+            source = inverse(pair)
+            if source in table:
+                continue
+            if corner is not None and source[0] != corner and source[2] != edge:
+                continue
+            counter += 1
+            heapq.heappush(
+                queue, (cost + len(macro), counter, source, macro + solution)
+            )
+
+    if len(table) != N_PAIR_CASES:
+        raise ValueError(f"Expected {N_PAIR_CASES} pair cases, found {len(table)}.")
+    return table
+
+
+PAIR_TABLE = _build_table()
+
+
+def pair_state(rubiks_cube):
+    """
+    Pair state (corner position, twist, edge position, flip) of the
+    front-right slot's pieces.
+
+    Args:
+        rubiks_cube (CubeState): The cube, viewed from the slot's side.
+
+    Returns:
+        tuple: The pair state, SOLVED_PAIR when the slot is solved.
+
+    Raises:
+        ValueError: If the front-right corner or edge is missing.
+    """
+    down, front, right = rubiks_cube["D5"], rubiks_cube["F5"], rubiks_cube["R5"]
+    down_facelet = rubiks_cube.locate(down, front, right)[0]
+    front_facelet = rubiks_cube.locate(front, right)[0]
+    return _CORNER_POSITIONS[down_facelet] + _EDGE_POSITIONS[front_facelet]
+
+
+def pair_solution(pair):
+    """
+    Look up the moves that solve a pair into the front-right slot.
+
+    Args:
+        pair (tuple): The pair state, see pair_state.
+
+    Returns:
+        list: The moves, taking pieces out of other slots if needed.
+    """
+    return PAIR_TABLE[pair]
@@ -1,87 +1,104 @@
 from solver.api.v1.cube_solver.layers import moves
+from solver.api.v1.cube_solver.layers.case_registry import (
+    FRONT_U_TURNS,
+    U_TURN_MOVES,
+    apply_case,
+    compile_cases,
+    lookup_case,
+)
+
+# Insertions of the edge at F2/U8 into the slot of the side its U8 color
+# belongs to, keyed by that slot.
+INSERTION_CASES = compile_cases(
+    {
+        ("F6", "R4"): ["u", "r", "u", "r'", "u'", "f'", "u'", "f"],
+        ("F4", "L6"): ["u'", "l'", "u'", "l", "u", "f", "u", "f'", "u'"],
+    }
+)
+
+# Extractions of a wrongly placed edge to the U layer, keyed by its slot.
+EXTRACTION_CASES = compile_cases(
+    {
+        ("F4", "L6"): ["l'", "u'", "l", "u", "f", "u", "f'"],
+        ("F6", "R4"): ["r", "u", "r'", "u'", "f'", "u'", "f"],
+        ("B4", "R6"): ["b", "u", "b'", "u'", "r'", "u'", "r"],
+        ("B6", "L4"): ["b'", "u'", "b", "u", "l", "u", "l'"],
+    }
+)
+
+# The slot an edge at F2/U8 goes into, by the side center its U8 color matches.
+_INSERTION_SLOTS = {"R5": ("F6", "R4"), "L5": ("F4", "L6")}
+
+
+def insertion_case(rubiks_cube):
+    """
+    Find the case inserting the edge at F2/U8, aligned with the front center.
+
+    Args:
+        rubiks_cube (dict or CubeState): The cube.
+
+    Returns:
+        tuple: The compiled case (moves, permutation).
+
+    Raises:
+        ValueError: If U8 matches neither the right nor the left center.
+    """
+    side = next(
+        (
+            center
+            for center in _INSERTION_SLOTS
+            if rubiks_cube[center] == rubiks_cube["U8"]
+        ),
+        None,
+    )
+    return lookup_case(INSERTION_CASES, _INSERTION_SLOTS.get(side), "second layer")
+
+
+def extraction_case(unsolved_piece):
+    """
+    Find the case taking the edge out of a second layer slot to the U layer.
+
+    Args:
+        unsolved_piece (list): The two facelets of the slot.
+
+    Returns:
+        tuple: The compiled case (moves, permutation).
+
+    Raises:
+        ValueError: If the facelets are not a second layer slot.
+    """
+    return lookup_case(EXTRACTION_CASES, tuple(unsolved_piece), "second layer")
+
+
+# The second layer edges, by the centers they belong between.
+_MIDDLE_EDGES = (("F5", "R5"), ("R5", "B5"), ("B5", "L5"), ("L5", "F5"))
 
 
-def piece_on_front_top(rubiks_cube):
-    sequence = []
-
-    # Decide on the sequence of moves based on the condition
-    if rubiks_cube["U8"] == rubiks_cube["R5"]:
-        sequence = ["u"]
-        sequence.extend(["r", "u", "r'", "u'"])
-        sequence.extend(["f'", "u'", "f"])
-    else:
-        sequence = ["u'"]
-        sequence.extend(["l'", "u'", "l", "u"])
-        sequence.extend(["f", "u", "f'", "u'"])
-    return sequence
-
-
-def piece_on_frontLeft(rubiks_cube):
-    sequence = []
-    sequence.extend(["l'", "u'", "l", "u"])
-    sequence.extend(["f", "u", "f'"])
-    return sequence
-
-
-def piece_on_frontRight(rubiks_cube):
-    sequence = []
-    sequence.extend(["r", "u", "r'", "u'"])
-    sequence.extend(["f'", "u'", "f"])
-    return sequence
-
-
-def piece_on_rightRight(rubiks_cube):
-    sequence = []
-    sequence.extend(["b", "u", "b'", "u'"])
-    sequence.extend(["r'", "u'", "r"])
-    return sequence
-
-
-def piece_on_leftLeft(rubiks_cube):
-    sequence = []
-    sequence.extend(["b'", "u'", "b", "u"])
-    sequence.extend(["l", "u", "l'"])
-    return sequence
-
-
-def bring_piece_to_top(rubiks_cube, unsolved_piece):
-    # print("brig_piece to top")
-    if unsolved_piece == ["F4", "L6"]:
-        return piece_on_frontLeft(rubiks_cube)
-    elif unsolved_piece == ["F6", "R4"]:
-        return piece_on_frontRight(rubiks_cube)
-    elif unsolved_piece == ["B4", "R6"]:
-        return piece_on_rightRight(rubiks_cube)
-    elif unsolved_piece == ["B6", "L4"]:
-        return piece_on_leftLeft(rubiks_cube)
+def dectect_top_pieces(rubiks_cube):
+    """
+    Find the U-layer edge slots holding a second layer edge.
 
+    Args:
+        rubiks_cube (CubeState): The cube.
 
-def dectect_top_pieces(rubiks_cube):
-    # print("dectect_top_pieces")
+    Returns:
+        list: The slots, as facelet pairs, in the order F2/U8, U4/L2, U6/R2, U2/B2.
+    """
     pieces_on_top = [["F2", "U8"], ["U4", "L2"], ["U6", "R2"], ["U2", "B2"]]
-    unrequired_pieces = []
-    required_top_pieces = []
-    if pieces_on_top:
-        for pair in pieces_on_top:
-            for position in pair:  # Iterate over each position in the current pair
-                if (
-                    rubiks_cube[position] == rubiks_cube["D5"]
-                    or rubiks_cube[position] == rubiks_cube["U5"]
-                ):  # Check if the position has a white piece
-                    unrequired_pieces.append(pair)
-                    break
-
-    required_top_pieces = [
-        item for item in pieces_on_top if item not in unrequired_pieces
-    ]
-    return required_top_pieces
+    # Look the four edges up through the piece-location index instead of
+    # checking the colors of every U-layer slot.
+    occupied = set()
+    for centers in _MIDDLE_EDGES:
+        occupied.update(
+            rubiks_cube.locate(*(rubiks_cube[center] for center in centers))
+        )
+    return [pair for pair in pieces_on_top if pair[0] in occupied]
 
 
 def move_for_required_face(rubiks_cube, top_pieces):
     # print("move_for_required_face")
     sequence = []
     face_move = []
-    top_move = []
     # find the color of a top piece
     for position in top_pieces[0]:  # Iterate over each position in the current pair
         if position in {"F2", "R2", "L2", "B2"}:
@@ -96,22 +113,18 @@ def move_for_required_face(rubiks_cube, top_pieces):
     for move in face_move:
         rubiks_cube = moves.execute_move(rubiks_cube, move)
 
-    # move the top piece until it matches the front
-    attempt = 0
-    while (
-        rubiks_cube["F2"] != rubiks_cube["F5"]
-        or (
-            rubiks_cube["U8"] != rubiks_cube["L5"]
-            and rubiks_cube["U8"] != rubiks_cube["R5"]
-        )
-        and attempt < 4
-    ):
-        attempt += 1
-        rubiks_cube = moves.execute_move(rubiks_cube, "u")
-        top_move.append("u")
-
-    if top_move == ["u", "u", "u"]:
-        top_move = ["u'"]
+    # U turns bringing an edge of the front color to F2, its other color
+    # matching the right or left center; the fewest turns of the two edges.
+    front = rubiks_cube["F5"]
+    turns = []
+    for side in ("R5", "L5"):
+        front_facelet, _ = rubiks_cube.locate(front, rubiks_cube[side])
+        if front_facelet in FRONT_U_TURNS:
+            turns.append(FRONT_U_TURNS[front_facelet])
+    if not turns:
+        raise ValueError("No second layer edge of the front color is on top.")
+    top_move = list(U_TURN_MOVES[min(turns)])
+
     sequence.extend(face_move)
     sequence.extend(top_move)
     return sequence
@@ -152,10 +165,8 @@ def top_to_correct_position(rubiks_cube, top_pieces):
         # moves.print_2d_cube(rubiks_cube)
     sequence.extend(matchingFace_moves)
 
-    correct_position_moves = piece_on_front_top(rubiks_cube)
-    # print(correct_position_moves)
-    for move in correct_position_moves:
-        rubiks_cube = moves.execute_move(rubiks_cube, move)
-        # moves.print_2d_cube(rubiks_cube)
+    correct_position_moves, rubiks_cube = apply_case(
+        rubiks_cube, insertion_case(rubiks_cube)
+    )
     sequence.extend(correct_position_moves)
     return sequence, rubiks_cube
@@ -1,5 +1,6 @@
 from solver.api.v1.cube_solver.layers import moves
 from solver.api.v1.cube_solver.layers.base import BaseSolverStep
+from solver.api.v1.cube_solver.layers.case_registry import apply_case
 from solver.api.v1.cube_solver.layers.top_cases import (
     top_cross_cases,
     top_cross_orientation_cases,
@@ -194,15 +195,10 @@ class TopLayerSolver(BaseSolverStep):
             ):
                 break
 
-            cornerMatchSequence = []
-            # do it until top color matches with the top center
-            # print("matching top corner")
-            attempt = 0
-            while rubiks_cube["U3"] != rubiks_cube["U5"] and attempt < 4:
-                cornerMatchSequence.extend(["r", "d", "r'", "d'"])
-                for x in ["r", "d", "r'", "d'"]:
-                    rubiks_cube = moves.execute_move(rubiks_cube, x)
-                    # moves.print_2d_cube(rubiks_cube)
+            # twist until the top color matches with the top center
+            cornerMatchSequence, rubiks_cube = apply_case(
+                rubiks_cube, top_corners_cases.twist_case(rubiks_cube)
+            )
             sequence.extend(cornerMatchSequence)
 
             # check if top corners are solved
@@ -217,19 +213,8 @@ class TopLayerSolver(BaseSolverStep):
             rubiks_cube = moves.execute_move(rubiks_cube, "u")
             sequence.append("u")
 
-        # then rotate the top do the move again
-        lastOrientation = []
-        # print("lastOrientation")
-        testCube = rubiks_cube
-        attempt = 0
-        while testCube["F2"] != testCube["F5"] and attempt < 4:
-            attempt += 1
-            lastOrientation.append("u")
-            testCube = moves.execute_move(testCube, "u")
-
-        if lastOrientation == ["u", "u", "u"]:
-            lastOrientation = ["u'"]
-        # print(lastOrientation)
+        # then turn the top to align it with the side centers
+        lastOrientation = top_cross_orientation_cases.correct_orientation(rubiks_cube)
         for x in lastOrientation:
             rubiks_cube = moves.execute_move(rubiks_cube, x)
             # moves.print_2d_cube(rubiks_cube)
@@ -257,11 +242,10 @@ class TopLayerSolver(BaseSolverStep):
 
         # if correct corner does not exits then do a sune and go to the corrected corner
         else:
-            # print("making one correct corner")
-            sequence.extend(["r", "u'", "l'", "u", "r'", "u'", "l", "u"])
-            for x in sequence:
-                rubiks_cube = moves.execute_move(rubiks_cube, x)
-                # moves.print_2d_cube(rubiks_cube)
+            cycle_moves, rubiks_cube = apply_case(
+                rubiks_cube, top_corners_cases.NO_CORNER_IN_PLACE_CASE
+            )
+            sequence.extend(cycle_moves)
             requiredCornerExists, cornerToFSequence = (
                 top_corners_cases.findRequiredCorner(rubiks_cube)
             )
@@ -271,44 +255,19 @@ class TopLayerSolver(BaseSolverStep):
             sequence.extend(cornerToFSequence)
 
         # if left side move is to be done or right side move is to be done decide
-        niklas = top_corners_cases.rightOrLeftNiklas(rubiks_cube)
-        for x in niklas:
-            rubiks_cube = moves.execute_move(rubiks_cube, x)
-            # moves.print_2d_cube(rubiks_cube)
+        niklas, rubiks_cube = apply_case(
+            rubiks_cube, top_corners_cases.cycle_case(rubiks_cube)
+        )
         sequence.extend(niklas)
 
         return sequence, rubiks_cube
 
     # Below are the helper methods used by the top_cross_orientation_step method.
     def _top_cross_orientation_sequence(self, rubiks_cube):
-        sequence = []
-        if top_cross_orientation_cases.check_correct(rubiks_cube):
-            sequence.extend(
-                top_cross_orientation_cases.correct_orientation(rubiks_cube)
-            )
-            for x in sequence:
-                rubiks_cube = moves.execute_move(rubiks_cube, x)
-                # moves.print_2d_cube(rubiks_cube)
-            return sequence, rubiks_cube
-
-        opossite, opossite_sequence = top_cross_orientation_cases.opossite_colors(
-            rubiks_cube
+        sequence, rubiks_cube = apply_case(
+            rubiks_cube, top_cross_orientation_cases.orientation_case(rubiks_cube)
         )
 
-        if opossite:
-            sequence.extend(opossite_sequence)
-            for x in opossite_sequence:
-                rubiks_cube = moves.execute_move(rubiks_cube, x)
-                # moves.print_2d_cube(rubiks_cube)
-
-        adjacent, adjacent_sequence = top_cross_orientation_cases.adjacent_colors(
-            rubiks_cube
-        )
-        if adjacent:
-            sequence.extend(adjacent_sequence)
-            for x in adjacent_sequence:
-                rubiks_cube = moves.execute_move(rubiks_cube, x)
-                # moves.print_2d_cube(rubiks_cube)
         orientation_moves = top_cross_orientation_cases.correct_orientation(rubiks_cube)
         sequence.extend(orientation_moves)
         for x in orientation_moves:
@@ -326,37 +285,4 @@ class TopLayerSolver(BaseSolverStep):
         Returns:
             tuple: A tuple containing the sequence of moves and the updated cube state.
         """
-        sequence = []
-
-        # moves.print_2d_cube(rubiks_cube)
-        count = 0
-
-        # Count how many edge pieces on the U face match the U center (U5)
-        for pos in ["U2", "U4", "U6", "U8"]:
-            if rubiks_cube[pos] == rubiks_cube["U5"]:
-                count += 1
-
-        # If already solved
-        if count == 4:
-            return sequence, rubiks_cube
-
-        # If two edges are correct
-        if count == 2:
-            # Check if it's a line case (U2-U8 or U4-U6)
-            if all(
-                rubiks_cube[pos] == rubiks_cube["U5"] for pos in ["U2", "U8"]
-            ) or all(rubiks_cube[pos] == rubiks_cube["U5"] for pos in ["U4", "U6"]):
-                sequence = top_cross_cases.line(rubiks_cube)
-            else:
-                # It's an L-shape (corner) case
-                sequence = top_cross_cases.L(rubiks_cube)
-
-        # If no edges match, it's a dot case
-        if count == 0:
-            sequence = top_cross_cases.dot(rubiks_cube)
-
-        # Apply each move in the sequence
-        for x in sequence:
-            rubiks_cube = moves.execute_move(rubiks_cube, x)
-
-        return sequence, rubiks_cube
+        return apply_case(rubiks_cube, top_cross_cases.top_cross_case(rubiks_cube))
@@ -0,0 +1,159 @@
+"""
+Lookup tables for solving the last layer in two looks (OLL, then PLL).
+
+OLL orients the U-layer pieces and is keyed by which of the 20 U-layer
+stickers show the U color. PLL then permutes them and is keyed by the side
+center each of the 12 side stickers of the U layer matches. Both keys cover
+the U-turn alignment (AUF) too, so every case is a single dictionary lookup.
+
+The tables are built at import by a shortest-path search from the solved
+cube over the algorithms below (and their inverses) plus U turns; the search
+also verifies that every algorithm keeps the first two layers intact.
+"""
+
+import heapq
+
+from solver.api.v1.cube_solver.facelets import FACELETS, FACES
+from solver.api.v1.cube_solver.notation import invert_sequence, parse_algorithm
+from solver.api.v1.cube_solver.optimizer import optimize_sequence
+from solver.api.v1.cube_solver.sequence import compile_sequence
+from solver.api.v1.cube_solver.state import CubeState
+
+# Orientation algorithms, in standard notation.
+OLL_ALGORITHMS = (
+    "R U R' U R U2 R'",
+    "R U2 R' U' R U' R'",
+    "F R U R' U' F'",
+    "F U R U' R' F'",
+    "F R U R' U' R U R' U' F'",
+    "F U R U' R' U R U' R' F'",
+    "R U R' U' R' F R F'",
+    "F R U' R' U' R U R' F'",
+    "R U2 R2 U' R2 U' R2 U2 R",
+    "R U2 R' U' R U R' U' R U' R'",
+    "R2 D R' U2 R D' R' U2 R'",
+    "R' F R B' R' F' R B",
+    "R' U' F' U F R",
+    "R U R' U R U' B U' B' R'",
+    "R' U' R' F R F' U R",
+    "R U R2 U' R' F R U R U' F'",
+    "R' U' F U R U' R' F' R",
+    "R U B' U' R' U R B R'",
+    "R U2 R2 F R F' R U2 R'",
+    "R U R' U R U' R' U' R' F R F'",
+    "B' R' U' R U R' U' R U B",
+    "R' F R U R' U' F' U R",
+    "L F' L' U' L U F U' L'",
+    "R U R' U R U2 R' F R U R' U' F'",
+    "R' U' R U' R' U2 R F R U R' U' F'",
+)
+
+# Permutation algorithms, in standard notation.
+PLL_ALGORITHMS = (
+    "R U R' U' R' F R2 U' R' U' R U R' F'",
+    "R U' R U R U R U' R' U' R2",
+    "R2 U R U R' U' R' U' R' U R'",
+    "R' F R' B2 R F' R' B2 R2",
+    "R2 B2 R F R' B2 R F' R",
+    "R U R' F' R U R' U' R' F R2 U' R'",
+    "R' U L' U2 R U' R' U2 R L U'",
+    "F R U' R' U' R U R' F' R U R' U' R' F R F'",
+    "R2 U2 R U2 R2 U2 R2 U2 R U2 R2",
+    "R' U' F' R U R' U' R' F R2 U' R' U' R U R' U R",
+    "R U' R' U' R U R D R' U' R D' R' U2 R'",
+    "R2 F R U R U' R' F' R U2 R' U2 R",
+    "R U' R U R' D R D' R U' D R2 U R2 D' R2",
+    "R2 U R' U R' U' R U' R2 D U' R' U R D' U",
+    "R' U' R U D' R2 U R' U R U' R U' R2 D",
+    "R2 U' R U' R U R' U R2 D' U R U' R' D U'",
+    "R U R' U' D R2 U' R U' R' U R' U R2 D'",
+    "R U R' U R U R' F' R U R' U' R' F R2 U' R' U2 R U' R'",
+    "R' U R U' R' F' U' F R U R' F R' F' R U' R",
+)
+
+AUF_ALGORITHMS = ("U", "U'")
+
+OLL_FACELETS = (
+    ("U1", "U2", "U3", "U4", "U6", "U7", "U8", "U9")
+    + ("F1", "F2", "F3", "R1", "R2", "R3")
+    + ("B1", "B2", "B3", "L1", "L2", "L3")
+)
+PLL_FACELETS = OLL_FACELETS[8:]
+SIDE_CENTERS = ("F5", "R5", "B5", "L5")
+
+FIRST_TWO_LAYERS_FACELETS = tuple(
+    name
+    for name in FACELETS
+    if name[0] == "D" or (name[0] in "FRBL" and name[1] in "456789")
+)
+
+N_OLL_CASES = 216
+N_PLL_CASES = 288
+
+
+def oll_key(cube):
+    """
+    Key of the orientation case: one bit per U-layer sticker showing the U color.
+    """
+    up = cube["U5"]
+    key = 0
+    for name in OLL_FACELETS:
+        key = key * 2 + (cube[name] == up)
+    return key
+
+
+def pll_key(cube):
+    """
+    Key of the permutation case: the side center matched by each side sticker.
+    """
+    centers = {cube[name]: index for index, name in enumerate(SIDE_CENTERS)}
+    return tuple(centers.get(cube[name]) for name in PLL_FACELETS)
+
+
+def _build_table(algorithms, key, size):
+    solved = CubeState(bytes(index // 9 for index in range(54)), FACES)
+
+    macros = []
+    for algorithm in algorithms + AUF_ALGORITHMS:
+        sequence = parse_algorithm(algorithm)
+        for macro in (sequence, invert_sequence(sequence)):
+            permutation = compile_sequence(macro)
+            turned = solved.permute(permutation)
+            if any(turned[name] != name[0] for name in FIRST_TWO_LAYERS_FACELETS):
+                raise ValueError(f"{algorithm} does not keep the first two layers.")
+            macros.append((len(macro), macro, permutation))
+
+    # Dijkstra over the cases, weighted by move count. A case reached from
+    # the solved cube by macros M1..Mn is solved by their inverses in
+    # reverse order.
+    table = {}
+    counter = 0
+    queue = [(0, counter, key(solved), solved, [])]
+    while queue:
+        cost, _, case, cube, solution = heapq.heappop(queue)
+        if case in table:
+            continue
+        table[case] = optimize_sequence(solution)
+        for length, macro, permutation in macros:
+            turned = cube.permute(permutation)
+            turned_case = key(turned)
+            if turned_case not in table:
+                counter += 1
+                heapq.heappush(
+                    queue,
+                    (
+                        cost + length,
+                        counter,
+                        turned_case,
+                        turned,
+                        invert_sequence(macro) + solution,
+                    ),
+                )
+
+    if len(table) != size:
+        raise ValueError(f"Expected {size} last layer cases, found {len(table)}.")
+    return table
+
+
+OLL_TABLE = _build_table(OLL_ALGORITHMS, oll_key, N_OLL_CASES)
+PLL_TABLE = _build_table(PLL_ALGORITHMS, pll_key, N_PLL_CASES)
@@ -1,56 +1,131 @@
-from solver.api.v1.cube_solver.layers import moves
+from solver.api.v1.cube_solver.layers.case_registry import (
+    compile_cases,
+    lookup_case,
+    sticker_destinations,
+)
+
+# The U-layer corner slots seen at F1/U7/L3 after 0, 1, 2 and 3 "rl"
+# rotations, as (slot, centers of its corner, rotations).
+_TOP_CORNER_SLOTS = (
+    (("F1", "U7", "L3"), ("F5", "U5", "L5"), []),
+    (("F3", "U9", "R1"), ("F5", "U5", "R5"), ["rl"]),
+    (("R3", "U3", "B1"), ("R5", "U5", "B5"), ["rl", "rl"]),
+    (("B3", "U1", "L1"), ("B5", "U5", "L5"), ["rr"]),
+)
+
+
+def _corner_in_place(rubiks_cube, slot, centers):
+    colors = [rubiks_cube[center] for center in centers]
+    return set(rubiks_cube.locate(*colors)) == set(slot)
 
 
 def checkTopCorners(rubiks_cube):
-    checkCorrect = False
-    for x in range(4):
-        # check subset
-        if {rubiks_cube["F5"], rubiks_cube["U5"], rubiks_cube["L5"]} <= {
-            rubiks_cube["F1"],
-            rubiks_cube["U7"],
-            rubiks_cube["L3"],
-        }:
-            rubiks_cube = moves.execute_move(rubiks_cube, "rl")
-            checkCorrect = True
-        else:
-            checkCorrect = False
-            return checkCorrect
-    return checkCorrect
+    """
+    Check whether all four U-layer corners are in their slots, twisted or not.
+
+    Args:
+        rubiks_cube (CubeState): The cube.
+    """
+    return all(
+        _corner_in_place(rubiks_cube, slot, centers)
+        for slot, centers, _ in _TOP_CORNER_SLOTS
+    )
 
 
 def findRequiredCorner(rubiks_cube):
-    sequence = []
-    requiredCornerExists = False
-    # moves.print_2d_cube(rubiks_cube)
-    for x in range(4):
-        if {rubiks_cube["F5"], rubiks_cube["U5"], rubiks_cube["L5"]} <= {
-            rubiks_cube["F1"],
-            rubiks_cube["U7"],
-            rubiks_cube["L3"],
-        }:
-            requiredCornerExists = True
-            if x == 0:
-                sequence = []
-            elif x == 1:
-                sequence = ["rl"]
-            elif x == 2:
-                sequence = ["rl", "rl"]
-            elif x == 3:
-                sequence = ["rr"]
-            break
-        else:
-            rubiks_cube = moves.execute_move(rubiks_cube, "rl")
-    return requiredCornerExists, sequence
-
-
-def rightOrLeftNiklas(rubiks_cube):
-    sequence = []
-    if {rubiks_cube["F5"], rubiks_cube["R5"], rubiks_cube["U5"]} <= {
-        rubiks_cube["U1"],
-        rubiks_cube["B3"],
-        rubiks_cube["L1"],
-    }:
-        sequence = ["r", "u'", "l'", "u", "r'", "u'", "l", "u"]
-    else:
-        sequence = ["rr", "l'", "u", "r", "u'", "l", "u", "r'", "u'"]
-    return sequence
+    """
+    Find a U-layer corner in its slot and the rotations bringing it to F1/U7/L3.
+
+    Args:
+        rubiks_cube (CubeState): The cube.
+
+    Returns:
+        tuple: (whether such a corner exists, list of rotations)
+    """
+    # The piece-location index tells which corners are in place, so no
+    # rotation has to be tried.
+    for slot, centers, rotations in _TOP_CORNER_SLOTS:
+        if _corner_in_place(rubiks_cube, slot, centers):
+            return True, list(rotations)
+    return False, []
+
+
+# Three-cycles of the U-layer corners other than F1/U7/L3, keyed by the slot
+# holding the front-right-up corner.
+CYCLE_CASES = compile_cases(
+    {
+        ("U1", "L1", "B3"): ["r", "u'", "l'", "u", "r'", "u'", "l", "u"],
+        ("U3", "R3", "B1"): ["rr", "l'", "u", "r", "u'", "l", "u", "r'", "u'"],
+    }
+)
+
+# With no corner in place, one cycle puts one there.
+NO_CORNER_IN_PLACE_CASE = CYCLE_CASES[("U1", "L1", "B3")]
+
+
+def cycle_case(rubiks_cube):
+    """
+    Find the case cycling the U-layer corners into place around F1/U7/L3.
+
+    Args:
+        rubiks_cube (dict or CubeState): The cube, F1/U7/L3 in place.
+
+    Returns:
+        tuple: The compiled case (moves, permutation).
+
+    Raises:
+        ValueError: If the front-right-up corner is in neither cycled slot.
+    """
+    colors = {rubiks_cube["F5"], rubiks_cube["R5"], rubiks_cube["U5"]}
+    slot = next(
+        (
+            slot
+            for slot in CYCLE_CASES
+            if colors <= {rubiks_cube[name] for name in slot}
+        ),
+        None,
+    )
+    return lookup_case(CYCLE_CASES, slot, "top corners")
+
+
+TWIST_SLOT = ("U3", "R3", "B1")
+TWIST_ALGORITHM = ["r", "d", "r'", "d'"]
+
+
+def _twist_algorithms():
+    # Repeat the twist until the U-colored sticker of the corner lands on U3;
+    # the twist has order 6, so that takes at most five repetitions.
+    destinations = sticker_destinations(TWIST_ALGORITHM)
+    algorithms = {}
+    for name in TWIST_SLOT:
+        sequence = []
+        position = name
+        while position != "U3":
+            if len(sequence) == 5 * len(TWIST_ALGORITHM):
+                raise ValueError(f"{TWIST_ALGORITHM} does not twist {TWIST_SLOT}.")
+            position = destinations[position]
+            sequence = sequence + TWIST_ALGORITHM
+        algorithms[name] = sequence
+    return algorithms
+
+
+# Twists orienting the corner at U3/R3/B1, keyed by the facelet showing the U color.
+TWIST_CASES = compile_cases(_twist_algorithms())
+
+
+def twist_case(rubiks_cube):
+    """
+    Find the case orienting the corner at U3/R3/B1.
+
+    Args:
+        rubiks_cube (dict or CubeState): The cube.
+
+    Returns:
+        tuple: The compiled case (moves, permutation).
+
+    Raises:
+        ValueError: If the corner has no U-colored sticker.
+    """
+    up = rubiks_cube["U5"]
+    up_facelet = next((name for name in TWIST_SLOT if rubiks_cube[name] == up), None)
+    return lookup_case(TWIST_CASES, up_facelet, "top corners orientation")
@@ -1,66 +1,99 @@
-from solver.api.v1.cube_solver.layers import moves
+"""
+Top cross cases.
 
+A case is keyed by the U-layer edge facelets showing the U color, e.g.
+("U2", "U8") for a line. A dot is turned into an L and an L into a line,
+so each case's algorithm is the chain of those steps, resolved at import by
+following where the U-colored stickers go.
+"""
 
-def line(rubiks_cube):
-    sequence = []
-    # print("line")
-    if (
-        rubiks_cube["U2"] == rubiks_cube["U5"]
-        and rubiks_cube["U8"] == rubiks_cube["U5"]
-    ):
-        sequence = ["r", "b", "u", "b'", "u'", "r'"]
-    if (
-        rubiks_cube["U4"] == rubiks_cube["U5"]
-        and rubiks_cube["U6"] == rubiks_cube["U5"]
-    ):
-        sequence.extend(["f", "r", "u", "r'", "u'", "f'"])
-    # print(sequence)
-    for x in sequence:
-        rubiks_cube = moves.execute_move(rubiks_cube, x)
-        # moves.print_2d_cube(rubiks_cube)
+from itertools import combinations
 
-    return sequence
+from solver.api.v1.cube_solver.layers.case_registry import (
+    compile_cases,
+    lookup_case,
+    sticker_destinations,
+)
 
+EDGE_FACELETS = ("U2", "U4", "U6", "U8")
+SIDE_FACELETS = {"U2": "B2", "U4": "L2", "U6": "R2", "U8": "F2"}
+
+LINE_ALGORITHMS = {
+    ("U2", "U8"): ["r", "b", "u", "b'", "u'", "r'"],
+    ("U4", "U6"): ["f", "r", "u", "r'", "u'", "f'"],
+}
+L_ALGORITHMS = {
+    ("U2", "U4"): ["f", "r", "u", "r'", "u'", "f'"],
+    ("U2", "U6"): ["l", "f", "u", "f'", "u'", "l'"],
+    ("U6", "U8"): ["b", "l", "u", "l'", "u'", "b'"],
+    ("U4", "U8"): ["r", "b", "u", "b'", "u'", "r'"],
+}
+DOT_ALGORITHM = ["b", "l", "u", "l'", "u'", "b'"]
 
-def L(rubiks_cube):
-    sequence = []
-    # print("L")
-    if (
-        rubiks_cube["U2"] == rubiks_cube["U5"]
-        and rubiks_cube["U4"] == rubiks_cube["U5"]
-    ):
-        sequence.extend(["f", "r", "u", "r'", "u'", "f'"])
-    elif (
-        rubiks_cube["U2"] == rubiks_cube["U5"]
-        and rubiks_cube["U6"] == rubiks_cube["U5"]
-    ):
-        sequence.extend(["l", "f", "u", "f'", "u'", "l'"])
-    elif (
-        rubiks_cube["U6"] == rubiks_cube["U5"]
-        and rubiks_cube["U8"] == rubiks_cube["U5"]
-    ):
-        sequence.extend(["b", "l", "u", "l'", "u'", "b'"])
-    elif (
-        rubiks_cube["U4"] == rubiks_cube["U5"]
-        and rubiks_cube["U8"] == rubiks_cube["U5"]
-    ):
-        sequence.extend(["r", "b", "u", "b'", "u'", "r'"])
-    # print(sequence)
-    for x in sequence:
-        rubiks_cube = moves.execute_move(rubiks_cube, x)
-        # moves.print_2d_cube(rubiks_cube)
-
-    sequence.extend(line(rubiks_cube))
-    return sequence
 
+def _oriented_after(oriented, sequence):
+    # Follow the U-colored sticker of every U-layer edge through the moves.
+    destinations = sticker_destinations(sequence)
+    after = set()
+    for name in EDGE_FACELETS:
+        destination = destinations[name if name in oriented else SIDE_FACELETS[name]]
+        if destination in EDGE_FACELETS:
+            after.add(destination)
+        elif destination not in SIDE_FACELETS.values():
+            raise ValueError(f"{sequence} does not keep the U-layer edges.")
+    return after
 
-def dot(rubiks_cube):
-    # print("dot")
+
+def _line(oriented):
     sequence = []
-    sequence.extend(["b", "l", "u", "l'", "u'", "b'"])
-    # print(sequence)
-    for x in sequence:
-        rubiks_cube = moves.execute_move(rubiks_cube, x)
-        # moves.print_2d_cube(rubiks_cube)
-    sequence.extend(L(rubiks_cube))
+    for edges, algorithm in LINE_ALGORITHMS.items():
+        if set(edges) <= oriented:
+            sequence.extend(algorithm)
     return sequence
+
+
+def _l_shape(oriented):
+    sequence = next(
+        (
+            algorithm
+            for edges, algorithm in L_ALGORITHMS.items()
+            if set(edges) <= oriented
+        ),
+        [],
+    )
+    return sequence + _line(_oriented_after(oriented, sequence))
+
+
+def _dot():
+    return DOT_ALGORITHM + _l_shape(_oriented_after(set(), DOT_ALGORITHM))
+
+
+def _top_cross_algorithms():
+    algorithms = {(): _dot(), EDGE_FACELETS: []}
+    for edges in combinations(EDGE_FACELETS, 2):
+        if edges in LINE_ALGORITHMS:
+            algorithms[edges] = _line(set(edges))
+        else:
+            algorithms[edges] = _l_shape(set(edges))
+    return algorithms
+
+
+TOP_CROSS_CASES = compile_cases(_top_cross_algorithms())
+
+
+def top_cross_case(rubiks_cube):
+    """
+    Find the case solving the top cross.
+
+    Args:
+        rubiks_cube (dict or CubeState): The cube, first two layers solved.
+
+    Returns:
+        tuple: The compiled case (moves, permutation).
+
+    Raises:
+        ValueError: If an odd number of U-layer edges is oriented.
+    """
+    up = rubiks_cube["U5"]
+    key = tuple(name for name in EDGE_FACELETS if rubiks_cube[name] == up)
+    return lookup_case(TOP_CROSS_CASES, key, "top cross")
@@ -1,102 +1,110 @@
-from solver.api.v1.cube_solver.layers import moves
-
-
-def check_correct(rubiks_cube):
-    correct = False
-    adjacent_colors = {}
-    adjacent_colors[rubiks_cube["F5"]] = rubiks_cube["R5"]
-    adjacent_colors[rubiks_cube["R5"]] = rubiks_cube["B5"]
-    adjacent_colors[rubiks_cube["B5"]] = rubiks_cube["L5"]
-    adjacent_colors[rubiks_cube["L5"]] = rubiks_cube["F5"]
-    front_color = rubiks_cube["F2"]
-    back_color = rubiks_cube["B2"]
-    left_color = rubiks_cube["L2"]
-    right_color = rubiks_cube["R2"]
-    if (
-        adjacent_colors[front_color] == right_color
-        and adjacent_colors[right_color] == back_color
-        and adjacent_colors[back_color] == left_color
-        and adjacent_colors[left_color] == front_color
-    ):
-        correct = True
-    return correct
+"""
+Top cross orientation cases.
 
+A case is keyed by the side center each of F2, R2, B2 and L2 matches,
+counted clockwise from the one F2 matches, so (0, 1, 2, 3) is a cross whose
+edges are in order and only need a U turn. Two edges opposite each other are
+swapped first, then two adjacent ones; the swaps are resolved at import by
+following where the side stickers go.
+"""
+
+from itertools import permutations
+
+from solver.api.v1.cube_solver.layers.case_registry import (
+    FRONT_U_TURNS,
+    U_TURN_MOVES,
+    compile_cases,
+    lookup_case,
+    sticker_destinations,
+)
+
+SIDE_FACELETS = ("F2", "R2", "B2", "L2")
+SIDE_CENTERS = ("F5", "R5", "B5", "L5")
+
+# Swaps of two U-layer edges, by the side facelet the algorithm is built on.
+SWAP_ALGORITHMS = {
+    "F2": ["f", "u", "f'", "u", "f", "u'", "u'", "f'"],
+    "R2": ["r", "u", "r'", "u", "r", "u'", "u'", "r'"],
+    "B2": ["b", "u", "b'", "u", "b", "u'", "u'", "b'"],
+    "L2": ["l", "u", "l'", "u", "l", "u'", "u'", "l'"],
+}
+
+
+def _order_after(order, sequence):
+    destinations = sticker_destinations(sequence)
+    after = [None] * 4
+    for side, name in enumerate(SIDE_FACELETS):
+        destination = destinations[name]
+        if destination not in SIDE_FACELETS:
+            raise ValueError(f"{sequence} does not keep the top cross.")
+        after[SIDE_FACELETS.index(destination)] = order[side]
+    return after
+
+
+def _is_adjacent(order, side):
+    return order[(side + 1) % 4] == (order[side] + 1) % 4
+
+
+def _swaps(order):
+    if all(_is_adjacent(order, side) for side in range(4)):
+        return []
 
-def correct_orientation(rubiks_cube):
     sequence = []
-    for x in range(4):
-        if (
-            rubiks_cube["F2"] == rubiks_cube["F5"]
-            and rubiks_cube["F2"] == rubiks_cube["F5"]
-            and rubiks_cube["F2"] == rubiks_cube["F5"]
-            and rubiks_cube["F2"] == rubiks_cube["F5"]
-        ):
-            if sequence == ["u", "u", "u"]:
-                sequence = ["u'"]
-            return sequence
-        rubiks_cube = moves.execute_move(rubiks_cube, "u")
-        sequence.append("u")
+    if order[2] == (order[0] + 2) % 4:
+        sequence = SWAP_ALGORITHMS["B2"]
+    elif order[3] == (order[1] + 2) % 4:
+        sequence = SWAP_ALGORITHMS["R2"]
+
+    order = _order_after(order, sequence)
+    for side, name in enumerate(SIDE_FACELETS):
+        if _is_adjacent(order, side):
+            return sequence + SWAP_ALGORITHMS[name]
     return sequence
 
 
-def opossite_colors(rubiks_cube):
-    sequence = []
-    opposite_colors = {}
-    opposite_colors[rubiks_cube["F5"]] = rubiks_cube["B5"]
-    opposite_colors[rubiks_cube["B5"]] = rubiks_cube["F5"]
-    opposite_colors[rubiks_cube["U5"]] = rubiks_cube["D5"]
-    opposite_colors[rubiks_cube["D5"]] = rubiks_cube["U5"]
-    opposite_colors[rubiks_cube["R5"]] = rubiks_cube["L5"]
-    opposite_colors[rubiks_cube["L5"]] = rubiks_cube["R5"]
-    front_color = rubiks_cube["F2"]
-    back_color = rubiks_cube["B2"]
-    left_color = rubiks_cube["L2"]
-    right_color = rubiks_cube["R2"]
-    # print(opposite_colors)
-    # moves.print_2d_cube(rubiks_cube)
-    opposite = False
-    if (
-        opposite_colors[front_color] == back_color
-        or opposite_colors[right_color] == left_color
-    ):
-        opposite = True
-    if opposite:
-        if opposite_colors[front_color] == back_color:
-            sequence.extend(["b", "u", "b'", "u", "b", "u'", "u'", "b'"])
-        elif opposite_colors[right_color] == left_color:
-            sequence.extend(["r", "u", "r'", "u", "r", "u'", "u'", "r'"])
-
-    return opposite, sequence
-
-
-def adjacent_colors(rubiks_cube):
-    sequence = []
-    adjacent_colors = {}
-    adjacent_colors[rubiks_cube["F5"]] = rubiks_cube["R5"]
-    adjacent_colors[rubiks_cube["R5"]] = rubiks_cube["B5"]
-    adjacent_colors[rubiks_cube["B5"]] = rubiks_cube["L5"]
-    adjacent_colors[rubiks_cube["L5"]] = rubiks_cube["F5"]
-    front_color = rubiks_cube["F2"]
-    back_color = rubiks_cube["B2"]
-    left_color = rubiks_cube["L2"]
-    right_color = rubiks_cube["R2"]
-    # print(adjacent_colors)
-    # moves.print_2d_cube(rubiks_cube)
-    adjacent = False
-    if (
-        adjacent_colors[front_color] == right_color
-        or adjacent_colors[right_color] == back_color
-        or adjacent_colors[back_color] == left_color
-        or adjacent_colors[left_color] == front_color
-    ):
-        adjacent = True
-    if adjacent:
-        if adjacent_colors[front_color] == right_color:
-            sequence.extend(["f", "u", "f'", "u", "f", "u'", "u'", "f'"])
-        elif adjacent_colors[right_color] == back_color:
-            sequence.extend(["r", "u", "r'", "u", "r", "u'", "u'", "r'"])
-        elif adjacent_colors[back_color] == left_color:
-            sequence.extend(["b", "u", "b'", "u", "b", "u'", "u'", "b'"])
-        elif adjacent_colors[left_color] == front_color:
-            sequence.extend(["l", "u", "l'", "u", "l", "u'", "u'", "l'"])
-    return adjacent, sequence
+ORIENTATION_CASES = compile_cases(
+    {(0,) + rest: _swaps((0,) + rest) for rest in permutations((1, 2, 3))}
+)
+
+
+def orientation_case(rubiks_cube):
+    """
+    Find the case putting the top cross edges in order.
+
+    Args:
+        rubiks_cube (dict or CubeState): The cube, top cross solved.
+
+    Returns:
+        tuple: The compiled case (moves, permutation).
+
+    Raises:
+        ValueError: If a side sticker matches no side center.
+    """
+    centers = {rubiks_cube[name]: index for index, name in enumerate(SIDE_CENTERS)}
+    order = [centers.get(rubiks_cube[name]) for name in SIDE_FACELETS]
+    if None in order:
+        raise ValueError("Unknown top cross orientation case.")
+    key = tuple((center - order[0]) % 4 for center in order)
+    return lookup_case(ORIENTATION_CASES, key, "top cross orientation")
+
+
+def correct_orientation(rubiks_cube):
+    """
+    U turns aligning the solved top cross with the side centers.
+
+    Args:
+        rubiks_cube (CubeState): The cube, top cross edges in order.
+
+    Returns:
+        list: The turns, e.g. ["u'"].
+
+    Raises:
+        ValueError: If the up-front edge is not in the U layer.
+    """
+    # Where the front-colored sticker of the up-front edge is tells the
+    # turns directly, without trying them one by one.
+    front_facelet, _ = rubiks_cube.locate(rubiks_cube["F5"], rubiks_cube["U5"])
+    turns = FRONT_U_TURNS.get(front_facelet)
+    if turns is None:
+        raise ValueError("The up-front edge is not in the U layer.")
+    return list(U_TURN_MOVES[turns])
@@ -0,0 +1,85 @@
+"""
+Output notation of solution sequences.
+
+Solvers work in quarter turns ("u", "u'") with whole-cube rotations written
+"rl", "rr", "ru" and "rd". Responses can instead use half turns ("u2") and a
+compact string such as "R U R' U2" in place of a JSON array, where the
+rotations are written in standard notation: "rl" as "y", "rr" as "y'", "ru" as
+"x" and "rd" as "x'".
+"""
+
+QUARTER_TURN_METRIC = "qtm"
+HALF_TURN_METRIC = "htm"
+METRICS = (QUARTER_TURN_METRIC, HALF_TURN_METRIC)
+
+LIST_FORMAT = "list"
+STRING_FORMAT = "string"
+SEQUENCE_FORMATS = (LIST_FORMAT, STRING_FORMAT)
+
+_FACE_MOVES = {f"{face}{suffix}": face for face in "urfdlb" for suffix in ("", "'")}
+_ROTATION_NOTATION = {"rl": "y", "rr": "y'", "ru": "x", "rd": "x'"}
+
+
+def to_half_turns(moves):
+    """
+    Merge every two identical consecutive face turns into one half turn.
+
+    Args:
+        moves (list): Quarter-turn moves such as ["r", "u", "u", "r'"].
+
+    Returns:
+        list: The same sequence with half turns, e.g. ["r", "u2", "r'"].
+    """
+    result = []
+    previous = None
+    for move in moves:
+        if move == previous and move in _FACE_MOVES:
+            result[-1] = f"{_FACE_MOVES[move]}2"
+            previous = None
+        else:
+            result.append(move)
+            previous = move
+    return result
+
+
+def format_sequence(moves, metric=QUARTER_TURN_METRIC, sequence_format=LIST_FORMAT):
+    """
+    Write a solution in the notation requested by the client.
+
+    Args:
+        moves (list): Quarter-turn moves as returned by the solvers.
+        metric (str): "qtm" to keep quarter turns or "htm" for half turns.
+        sequence_format (str): "list" for a list of moves or "string" for
+            one space-separated string in standard notation.
+
+    Returns:
+        list or str: The formatted sequence.
+    """
+    if metric == HALF_TURN_METRIC:
+        moves = to_half_turns(moves)
+    if sequence_format == STRING_FORMAT:
+        return " ".join(_ROTATION_NOTATION.get(move, move.upper()) for move in moves)
+    return list(moves)
+
+
+def parse_algorithm(algorithm):
+    """
+    Convert standard notation ("R U2 R'") to solver moves (["r", "u", "u", "r'"]).
+    """
+    sequence = []
+    for token in algorithm.split():
+        move = token[0].lower()
+        if token.endswith("2"):
+            sequence.extend((move, move))
+        elif token.endswith("'"):
+            sequence.append(f"{move}'")
+        else:
+            sequence.append(move)
+    return sequence
+
+
+def invert_sequence(moves):
+    """
+    Return the quarter-turn face moves that undo `moves`.
+    """
+    return [move[:-1] if move.endswith("'") else f"{move}'" for move in reversed(moves)]
@@ -0,0 +1,73 @@
+"""
+Single-pass peephole optimizer for move sequences.
+
+Moves are pushed onto a stack as (face, quarter turns) entries. Turns of the
+same face merge modulo 4 and disappear when they add up to nothing. Moves
+about the same axis commute (U/D and the "rl"/"rr" rotations, R/L and
+"ru"/"rd", F/B), so a move also merges with a matching entry hidden behind
+other moves of its axis, which cancels patterns like ``r l r'``.
+"""
+
+# Every move as (key, clockwise quarter turns). Rotations are keyed by the
+# clockwise rotation about their axis.
+_TURNS = {"rl": ("rl", 1), "rr": ("rl", 3), "ru": ("ru", 1), "rd": ("ru", 3)}
+for _face in "urfdlb":
+    _TURNS[_face] = (_face, 1)
+    _TURNS[f"{_face}2"] = (_face, 2)
+    _TURNS[f"{_face}'"] = (_face, 3)
+
+_AXES = {"u": 0, "d": 0, "rl": 0, "r": 1, "l": 1, "ru": 1, "f": 2, "b": 2}
+
+# How each (key, quarter turns) entry is written in quarter-turn notation.
+_NOTATION = {"rl": ("rl", "rr"), "ru": ("ru", "rd")}
+for _face in "urfdlb":
+    _NOTATION[_face] = (_face, f"{_face}'")
+
+
+def optimize_sequence(moves):
+    """
+    Cancel and merge redundant moves in linear time.
+
+    Args:
+        moves (list): Moves such as ["r", "l", "r'", "u", "u", "u'"].
+
+    Returns:
+        list: An equivalent, never longer sequence in quarter turns, e.g. ["l", "u"].
+
+    Raises:
+        ValueError: If the sequence contains an unknown move.
+    """
+    stack = []
+    for move in moves:
+        turn = _TURNS.get(move)
+        if turn is None:
+            raise ValueError(f"Invalid move: {move}")
+        key, turns = turn
+        axis = _AXES[key]
+
+        # Look for the same key among the trailing entries on this axis;
+        # there are at most three of them (two faces and a rotation).
+        position = len(stack) - 1
+        while position >= 0 and _AXES[stack[position][0]] == axis:
+            if stack[position][0] == key:
+                break
+            position -= 1
+        else:
+            stack.append([key, turns])
+            continue
+
+        entry = stack[position]
+        entry[1] = (entry[1] + turns) % 4
+        if not entry[1]:
+            del stack[position]
+
+    sequence = []
+    for key, turns in stack:
+        clockwise, counterclockwise = _NOTATION[key]
+        if turns == 1:
+            sequence.append(clockwise)
+        elif turns == 2:
+            sequence.extend((clockwise, clockwise))
+        else:
+            sequence.append(counterclockwise)
+    return sequence
@@ -0,0 +1,85 @@
+"""
+Whole-cube orientations ("frames") of the compact cube states.
+
+A whole-cube rotation moves no piece relative to the others, so instead of
+permuting all 54 stickers a state only records which of the 24 orientations
+it is looked at from. Frame ``f`` maps view facelets to stored facelets,
+``view[i] = stored[FRAMES[f][i]]``, and a face turn of the view is a face
+turn of the stored cube, relabeled by ``FRAME_MOVES[f]``.
+"""
+
+from solver.api.v1.cube_solver.facelets import (
+    FACELET_INDEX,
+    FACELETS,
+    IDENTITY,
+    MOVE_PERMUTATIONS,
+    compose,
+    invert,
+)
+
+ROTATIONS = ("rl", "rr", "ru", "rd")
+
+FACE_MOVES = tuple(move for move in MOVE_PERMUTATIONS if move not in ROTATIONS)
+
+
+def _generate_frames():
+    # Breadth-first search over the rotations, starting from the identity;
+    # "rl" and "ru" alone already reach all 24 orientations.
+    frames = [IDENTITY]
+    index = {IDENTITY: 0}
+    for frame in frames:
+        for rotation in ROTATIONS:
+            rotated = compose(frame, MOVE_PERMUTATIONS[rotation])
+            if rotated not in index:
+                index[rotated] = len(frames)
+                frames.append(rotated)
+    return tuple(frames), index
+
+
+FRAMES, _FRAME_INDEX = _generate_frames()
+
+# The frame reached by applying each rotation in each frame.
+ROTATION_FRAMES = tuple(
+    {
+        rotation: _FRAME_INDEX[compose(frame, MOVE_PERMUTATIONS[rotation])]
+        for rotation in ROTATIONS
+    }
+    for frame in FRAMES
+)
+
+_MOVE_BY_PERMUTATION = {MOVE_PERMUTATIONS[move]: move for move in FACE_MOVES}
+
+
+def _stored_move(frame, move):
+    # Turning the view with `move` turns the stored cube with the move
+    # conjugated by the frame: stored[j] <- stored[frame[move[frame^-1[j]]]].
+    inverse = invert(frame)
+    permutation = MOVE_PERMUTATIONS[move]
+    conjugated = tuple(frame[permutation[inverse[index]]] for index in IDENTITY)
+    return _MOVE_BY_PERMUTATION[conjugated]
+
+
+# The stored-cube face move equivalent to each face move of the view.
+FRAME_MOVES = tuple(
+    {move: _stored_move(frame, move) for move in FACE_MOVES} for frame in FRAMES
+)
+
+# The stored index of every named view facelet.
+FRAME_FACELET_INDEX = tuple(
+    {name: frame[FACELET_INDEX[name]] for name in FACELETS} for frame in FRAMES
+)
+
+
+def _frame_rotations():
+    # FRAMES is in breadth-first order, so the first path found to every
+    # frame is a shortest one.
+    rotations = {0: ()}
+    for frame in range(len(FRAMES)):
+        for rotation, rotated in ROTATION_FRAMES[frame].items():
+            if rotated not in rotations:
+                rotations[rotated] = rotations[frame] + (rotation,)
+    return tuple(rotations[frame] for frame in range(len(FRAMES)))
+
+
+# The shortest whole-cube rotation sequence turning the identity into each frame.
+FRAME_ROTATIONS = _frame_rotations()
@@ -0,0 +1,81 @@
+"""
+Piece-location index of the compact cube states.
+
+Every edge and corner sticker is identified by its piece, known by its
+colors, and its own color; the 12 edges and 8 corners keep their color sets
+whatever the orientation, so there are 48 such stickers. The index holds
+the stored facelet each sticker is on, as bytes, which makes finding a piece
+a lookup instead of a scan over all pieces. A move carries the index along
+with one ``bytes.translate`` through a table of where every facelet goes.
+"""
+
+from itertools import permutations
+from operator import itemgetter
+
+from solver.api.v1.cube_solver.facelets import (
+    CORNER_FACELETS,
+    EDGE_FACELETS,
+    FACELET_INDEX,
+    FACES,
+)
+
+_PIECES = EDGE_FACELETS + CORNER_FACELETS
+
+# Sticker numbers of every piece, by its colors in any order; colors are face
+# indices, as in the stored facelets of a CubeState. Sticker ``2 * edge + k``
+# or ``24 + 3 * corner + k`` is the one of the k-th color of the piece.
+STICKERS = {}
+for _number, _piece in enumerate(_PIECES):
+    _base = 2 * _number if _number < 12 else 24 + 3 * (_number - 12)
+    _colors = tuple(FACES.index(name[0]) for name in _piece)
+    for _order in permutations(_colors):
+        STICKERS[_order] = tuple(_base + _colors.index(color) for color in _order)
+
+N_STICKERS = 2 * len(EDGE_FACELETS) + 3 * len(CORNER_FACELETS)
+
+_SLOTS = tuple(
+    (itemgetter(*indices), indices)
+    for indices in (tuple(FACELET_INDEX[name] for name in piece) for piece in _PIECES)
+)
+
+# Facelets past the 54 of a cube are left alone by the translation tables.
+_TABLE_TAIL = bytes(range(54, 256))
+
+
+def build_index(facelets):
+    """
+    Build the piece-location index of 54 stored facelets.
+
+    Args:
+        facelets (bytes or bytearray): Color index of every stored facelet.
+
+    Returns:
+        bytes: The stored facelet of every sticker, by sticker number.
+
+    Raises:
+        ValueError: If a piece shows colors no edge or corner has.
+    """
+    index = bytearray(N_STICKERS)
+    for colors, indices in _SLOTS:
+        stickers = STICKERS.get(colors(facelets))
+        if stickers is None:
+            raise ValueError("A piece has colors no edge or corner has.")
+        for sticker, facelet in zip(stickers, indices):
+            index[sticker] = facelet
+    return bytes(index)
+
+
+def destination_table(permutation):
+    """
+    Translation table moving an index through a facelet permutation.
+
+    Args:
+        permutation (tuple): A gather permutation, ``new[i] = old[permutation[i]]``.
+
+    Returns:
+        bytes: A ``bytes.translate`` table mapping every facelet to where its
+        sticker goes.
+    """
+    # The inverse permutation: every facelet ordered by the one it takes from.
+    inverse = sorted(range(len(permutation)), key=permutation.__getitem__)
+    return bytes(inverse) + _TABLE_TAIL
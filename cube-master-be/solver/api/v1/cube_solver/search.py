@@ -0,0 +1,175 @@
+"""
+Best-of search over whole-cube orientations.
+
+The layer solvers always build on the D face as given, and how long the
+solution gets depends a lot on how the cube is held. The search solves the
+cube in each of the 24 orientations, and optionally solves the inverse state
+and reverses the result, in a process pool. It keeps the shortest verified
+solution found within a wall-clock budget.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from rest_framework import serializers
+
+from solver.api.v1.cube_solver.cubie import CubieCube
+from solver.api.v1.cube_solver.notation import (
+    HALF_TURN_METRIC,
+    QUARTER_TURN_METRIC,
+    invert_sequence,
+    to_half_turns,
+)
+from solver.api.v1.cube_solver.optimizer import optimize_sequence
+from solver.api.v1.cube_solver.orientation import FRAME_ROTATIONS, ROTATIONS
+from solver.api.v1.cube_solver.sequence import apply_sequence, remove_rotations
+from solver.api.v1.cube_solver.solver import CFOP_METHOD, RubiksCubeSolver
+from solver.api.v1.cube_solver.state import CubeState
+from solver.api.v1.workers import get_pool, reset_pool
+
+DEFAULT_TIME_BUDGET = 1.0  # seconds
+
+
+def _inverse_state(state):
+    # The state reached by undoing the scramble: a sequence solving it,
+    # reversed, solves the original state.
+    return CubieCube.from_state(state).inverse().to_state(state.palette)
+
+
+def _solve_candidate(state, rotations, inverse, method, rotation_free):
+    """
+    Solve one candidate of the search, in a pool worker.
+
+    Args:
+        state (CubeState): The cube as given.
+        rotations (tuple): Rotations turning the cube into the orientation to solve in.
+        inverse (bool): Solve the inverse state and reverse the solution.
+        method (str): The solving method, see RubiksCubeSolver.
+        rotation_free (bool): Rewrite the solution without rotations.
+
+    Returns:
+        list: The solution of the cube as given, or None if the solver failed.
+    """
+    if inverse:
+        state = _inverse_state(state)
+    for rotation in rotations:
+        state = state.move(rotation)
+
+    try:
+        sequence, _ = RubiksCubeSolver(state, method=method).solve()
+    except (ValueError, serializers.ValidationError):
+        return None
+
+    sequence = list(rotations) + sequence
+    if inverse:
+        # Only face turns can be reversed move by move.
+        sequence = invert_sequence(remove_rotations(sequence))
+    elif rotation_free:
+        sequence = remove_rotations(sequence)
+    return optimize_sequence(sequence)
+
+
+def _length(sequence, metric):
+    face_moves = [move for move in sequence if move not in ROTATIONS]
+    if metric == HALF_TURN_METRIC:
+        face_moves = to_half_turns(face_moves)
+    return len(face_moves), len(sequence)
+
+
+def solve_best_orientation(
+    rubiks_cube,
+    method=CFOP_METHOD,
+    rotation_free=False,
+    orientations=True,
+    inverse=False,
+    metric=QUARTER_TURN_METRIC,
+    time_budget=DEFAULT_TIME_BUDGET,
+):
+    """
+    Solve the cube in several orientations and keep the shortest solution.
+
+    The cube as given is solved first, in process, so there is always a
+    result. The other candidates run in the process pool until the budget
+    is used up; those still queued then are dropped, so under load the
+    search degrades to fewer orientations.
+
+    Args:
+        rubiks_cube (dict or CubeState): Mapping of facelets 'U1'...'B9' to color labels.
+        method (str): The solving method, see RubiksCubeSolver.
+        rotation_free (bool): Return only face turns.
+        orientations (bool): Search all 24 whole-cube orientations.
+        inverse (bool): Also solve the inverse state and reverse the solution.
+        metric (str): "qtm" or "htm", the metric the length is counted in.
+        time_budget (float): Wall-clock budget of the search, in seconds.
+
+    Returns:
+        tuple: (list of moves, dict describing the winning candidate with
+        "rotations", "inverse", "searched" and "candidates")
+
+    Raises:
+        serializers.ValidationError: If the cube as given cannot be solved.
+    """
+    deadline = time.monotonic() + time_budget
+    state = rubiks_cube
+    if isinstance(state, dict):
+        state = CubeState.from_dict(state)
+
+    sequence, _ = RubiksCubeSolver(
+        state, rotation_free=rotation_free, method=method
+    ).solve()
+    best = (_length(sequence, metric), sequence, (), False)
+
+    frames = FRAME_ROTATIONS if orientations else FRAME_ROTATIONS[:1]
+    candidates = [(rotations, False) for rotations in frames[1:]]
+    if inverse:
+        candidates += [(rotations, True) for rotations in frames]
+
+    searched = 1
+    if candidates:
+        pool = get_pool()
+        futures = {
+            pool.submit(
+                _solve_candidate,
+                state,
+                rotations,
+                is_inverse,
+                method,
+                rotation_free,
+            ): (rotations, is_inverse)
+            for rotations, is_inverse in candidates
+        }
+        pending = set(futures)
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(
+                    pending, timeout=remaining, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    searched += 1
+                    candidate = future.result()
+                    # Only solutions replayed on the cube as given count.
+                    if candidate is None or not (
+                        apply_sequence(state, candidate).is_solved()
+                    ):
+                        continue
+                    length = _length(candidate, metric)
+                    if length < best[0]:
+                        best = (length, candidate) + futures[future]
+        except BrokenProcessPool:
+            # A worker died; start a new pool on the next search and keep
+            # the best solution found so far.
+            reset_pool(pool)
+        for future in pending:
+            future.cancel()
+
+    _, sequence, rotations, is_inverse = best
+    return sequence, {
+        "rotations": list(rotations),
+        "inverse": is_inverse,
+        "searched": searched,
+        "candidates": len(candidates) + 1,
+    }
@@ -0,0 +1,112 @@
+from functools import lru_cache
+from operator import itemgetter
+
+from solver.api.v1.cube_solver.facelets import IDENTITY
+from solver.api.v1.cube_solver.orientation import FRAME_MOVES, ROTATION_FRAMES
+from solver.api.v1.cube_solver.state import MOVE_GATHERS, CubeState
+
+# Sequences up to this length are folded move by move; longer ones are split
+# in halves so that repeated sub-sequences are served from the cache.
+_FOLD_LENGTH = 16
+
+
+@lru_cache(maxsize=4096)
+def _compile(moves):
+    if len(moves) <= _FOLD_LENGTH:
+        permutation = IDENTITY
+        for move in moves:
+            gather = MOVE_GATHERS.get(move)
+            if gather is None:
+                raise ValueError(f"Invalid move: {move}")
+            # Gathering a permutation with a move composes the two.
+            permutation = gather(permutation)
+        return permutation
+
+    middle = len(moves) // 2
+    first = _compile(moves[:middle])
+    second = _compile(moves[middle:])
+    return itemgetter(*second)(first)
+
+
+def compile_sequence(moves):
+    """
+    Compile a list of moves into one composed facelet permutation.
+
+    Args:
+        moves (list): Moves such as ["r", "u", "r'", "rl"].
+
+    Returns:
+        tuple: A 54-entry permutation equivalent to applying the moves in order.
+
+    Raises:
+        ValueError: If the sequence contains an unknown move.
+    """
+    return _compile(tuple(moves))
+
+
+def apply_sequence(rubiks_cube, moves):
+    """
+    Apply a whole move sequence to a cube with a single gather.
+
+    Args:
+        rubiks_cube (dict or CubeState): The cube to turn.
+        moves (list): The moves to apply.
+
+    Returns:
+        dict or CubeState: The turned cube, in the same representation as the input.
+    """
+    permutation = compile_sequence(moves)
+    if isinstance(rubiks_cube, dict):
+        return CubeState.from_dict(rubiks_cube).permute(permutation).to_dict()
+    return rubiks_cube.permute(permutation)
+
+
+def remove_rotations(moves):
+    """
+    Rewrite a move sequence without whole-cube rotations.
+
+    Every rotation is pushed to the end of the sequence by relabeling the
+    face moves that follow it, and then dropped. The result turns the pieces
+    exactly like the original sequence, but in the cube's starting orientation.
+
+    Args:
+        moves (list): Moves such as ["r", "rl", "u", "r'"].
+
+    Returns:
+        list: The equivalent face moves, e.g. ["r", "u", "b'"].
+
+    Raises:
+        ValueError: If the sequence contains an unknown move.
+    """
+    face_moves, _ = split_rotations(moves)
+    return face_moves
+
+
+def split_rotations(moves, frame=0):
+    """
+    Rewrite a part of a move sequence without whole-cube rotations.
+
+    Like remove_rotations, for sequences rewritten piece by piece: the
+    rotations met so far are passed on as the frame.
+
+    Args:
+        moves (list): Moves such as ["r", "rl", "u", "r'"].
+        frame (int): The frame the earlier parts ended in, 0 for the start.
+
+    Returns:
+        tuple: (equivalent face moves, frame at the end of the moves)
+
+    Raises:
+        ValueError: If the sequence contains an unknown move.
+    """
+    face_moves = []
+    for move in moves:
+        rotated = ROTATION_FRAMES[frame].get(move)
+        if rotated is not None:
+            frame = rotated
+            continue
+        face_move = FRAME_MOVES[frame].get(move)
+        if face_move is None:
+            raise ValueError(f"Invalid move: {move}")
+        face_moves.append(face_move)
+    return face_moves, frame
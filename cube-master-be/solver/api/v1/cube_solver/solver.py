@@ -1,33 +1,125 @@
 from rest_framework import serializers
 
-from solver.api.v1.cube_solver.layers import moves
 from solver.api.v1.cube_solver.layers.bottom import BottomLayerSolver
+from solver.api.v1.cube_solver.layers.cross import CrossSolver
+from solver.api.v1.cube_solver.layers.f2l import F2LSolver
+from solver.api.v1.cube_solver.layers.last_layer import LastLayerSolver
 from solver.api.v1.cube_solver.layers.second import SecondLayerSolver
 from solver.api.v1.cube_solver.layers.top import TopLayerSolver
+from solver.api.v1.cube_solver.optimizer import optimize_sequence
+from solver.api.v1.cube_solver.sequence import (
+    apply_sequence,
+    remove_rotations,
+    split_rotations,
+)
+from solver.api.v1.cube_solver.state import CubeState
+
+BEGINNER_METHOD = "beginner"
+CFOP_METHOD = "cfop"
+METHODS = (CFOP_METHOD, BEGINNER_METHOD)
+
+CROSS_STAGE = "cross"
+F2L_STAGE = "f2l"
+LAST_LAYER_STAGE = "last_layer"
+BOTTOM_LAYER_STAGE = "bottom_layer"
+SECOND_LAYER_STAGE = "second_layer"
+TOP_LAYER_STAGE = "top_layer"
 
 
 class RubiksCubeSolver:
-    def __init__(self, rubiks_cube):
+    def __init__(self, rubiks_cube, rotation_free=False, method=CFOP_METHOD):
+        # The layer solvers work on the compact state, where whole-cube
+        # rotations only change the viewing frame.
+        if isinstance(rubiks_cube, dict):
+            rubiks_cube = CubeState.from_dict(rubiks_cube)
         self.rubiks_cube = rubiks_cube
         self.sequence_cube = rubiks_cube
         self.sequence = []
+        self.rotation_free = rotation_free
+        self.method = method
 
     def solve(self):
-        self._solve_bottom_layer()
-        self._solve_second_layer()
-        self._solve_top_layer()
+        for _, solve_stage in self._stages():
+            solve_stage()
 
         self.sequence = self._optimize(self.sequence)
 
-        for seq in self.sequence:
-            self.sequence_cube = moves.execute_move(self.sequence_cube, seq)
+        if self.rotation_free:
+            # Relabeling can put inverse moves next to each other, so the
+            # result goes through the optimizer once more.
+            self.sequence = self._optimize(remove_rotations(self.sequence))
 
-        if self.sequence_cube != self.rubiks_cube:
+        # Replay the whole solution as one compiled permutation.
+        self.sequence_cube = apply_sequence(self.sequence_cube, self.sequence)
+
+        # Without rotations the cube ends in its starting orientation instead
+        # of the solver's, so there it is only checked for being solved.
+        if self.rotation_free:
+            failed = not self.sequence_cube.is_solved()
+        else:
+            failed = self.sequence_cube != self.rubiks_cube
+
+        if failed:
             raise serializers.ValidationError(
                 "The cube state does not match the expected solved state. Sequence Error!"
             )
 
-        return self.sequence, self.sequence_cube
+        return self.sequence, self.sequence_cube.to_dict()
+
+    def solve_stages(self):
+        """
+        Solve the cube stage by stage, handing out every stage's moves as
+        soon as the stage is done.
+
+        Each stage is optimized on its own, so moves never cancel across
+        stages and the whole solution can be a few moves longer than the
+        one of solve().
+
+        Yields:
+            tuple: (stage name, list of moves), e.g. ("cross", ["f", "r'"]).
+
+        Raises:
+            serializers.ValidationError: After the last stage, if the moves
+                handed out do not solve the cube.
+        """
+        frame = 0
+        sequence = []
+        for name, solve_stage in self._stages():
+            start = len(self.sequence)
+            solve_stage()
+            moves = self.sequence[start:]
+            if self.rotation_free:
+                # Rotations of earlier stages carry over as the frame.
+                moves, frame = split_rotations(moves, frame)
+            moves = self._optimize(moves)
+            sequence.extend(moves)
+            yield name, moves
+
+        self.sequence = sequence
+        self.sequence_cube = apply_sequence(self.sequence_cube, self.sequence)
+        if not self.sequence_cube.is_solved():
+            raise serializers.ValidationError(
+                "The cube state does not match the expected solved state. Sequence Error!"
+            )
+
+    def _stages(self):
+        if self.method == BEGINNER_METHOD:
+            return (
+                (BOTTOM_LAYER_STAGE, self._solve_bottom_layer),
+                (SECOND_LAYER_STAGE, self._solve_second_layer),
+                (TOP_LAYER_STAGE, self._solve_top_layer),
+            )
+        return (
+            (CROSS_STAGE, self._solve_cross),
+            (F2L_STAGE, self._solve_first_two_layers),
+            (LAST_LAYER_STAGE, self._solve_last_layer),
+        )
+
+    def _solve_cross(self):
+        cross_solver = CrossSolver(self.rubiks_cube)
+        moves, updated_cube = cross_solver.solve()
+        self.sequence.extend(moves)
+        self.rubiks_cube = updated_cube
 
     def _solve_bottom_layer(self):
         bottom_solver = BottomLayerSolver(self.rubiks_cube)
@@ -47,66 +139,17 @@ class RubiksCubeSolver:
         self.sequence.extend(moves)
         self.rubiks_cube = updated_cube
 
+    def _solve_first_two_layers(self):
+        f2l_solver = F2LSolver(self.rubiks_cube)
+        moves, updated_cube = f2l_solver.solve()
+        self.sequence.extend(moves)
+        self.rubiks_cube = updated_cube
+
+    def _solve_last_layer(self):
+        last_layer_solver = LastLayerSolver(self.rubiks_cube)
+        moves, updated_cube = last_layer_solver.solve()
+        self.sequence.extend(moves)
+        self.rubiks_cube = updated_cube
+
     def _optimize(self, sequence):
-        x = 0
-        while x in range(len(sequence)):
-            first = sequence[x]
-            if x + 1 < len(sequence):
-                second = sequence[x + 1]
-            else:
-                second = None
-            if x + 2 < len(sequence):
-                third = sequence[x + 2]
-            else:
-                third = None
-            if x + 3 < len(sequence):
-                fourth = sequence[x + 3]
-            else:
-                fourth = None
-
-            e4 = False
-            if fourth:
-                if first == second == third == fourth:
-                    # print(f"remove 4 repeat at index {x}")
-                    # print(first, second, third, fourth)
-                    # print(sequence)
-                    del sequence[x : x + 4]
-                    # print(sequence)
-                    x -= 1
-                    e4 = True
-
-            e3 = False
-            if not e4 and third:
-                if first == second == third:
-                    # print(f"remove 3 repeat at index {x}")
-                    # print(first, second, third)
-                    # print(sequence)
-                    if first.endswith("'"):
-                        sequence[x : x + 3] = first[:-1]
-                    else:
-                        if first == "rl":
-                            sequence[x : x + 3] = ["rr"]
-                        elif first == "rr":
-                            sequence[x : x + 3] = ["rl"]
-                        else:
-                            sequence[x : x + 3] = [first + "'"]
-                    # print(sequence)
-                    e3 = True
-                    x -= 1
-
-            if not e3 and not e4 and second:
-                if (
-                    first + "'" == second
-                    or first == second + "'"
-                    or (first == "rl" and second == "rr")
-                    or (first == "rr" and second == "rl")
-                ):
-                    # print(f"remove two opossite at index {x}")
-                    # print(first, second)
-                    # print(sequence)
-                    del sequence[x : x + 2]
-                    # print(sequence)
-                    x -= 1
-
-            x += 1
-        return sequence
+        return optimize_sequence(sequence)
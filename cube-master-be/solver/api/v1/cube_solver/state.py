@@ -0,0 +1,362 @@
+from functools import lru_cache
+from operator import itemgetter
+
+from solver.api.v1.cube_solver.facelets import (
+    CENTER_INDICES,
+    FACELET_INDEX,
+    FACELETS,
+    FACES,
+    MOVE_PERMUTATIONS,
+)
+from solver.api.v1.cube_solver.orientation import (
+    FRAME_FACELET_INDEX,
+    FRAME_MOVES,
+    FRAMES,
+    ROTATION_FRAMES,
+)
+from solver.api.v1.cube_solver.pieces import (
+    STICKERS,
+    build_index,
+    destination_table,
+)
+
+# One C-level gather per move: ``MOVE_GATHERS[move](facelets)`` returns the
+# 54 color indices of the turned cube.
+MOVE_GATHERS = {
+    move: itemgetter(*permutation) for move, permutation in MOVE_PERMUTATIONS.items()
+}
+
+# Where every move takes each stored facelet's sticker, as bytes.translate
+# tables of the piece-location index (see cube_solver.pieces).
+_MOVE_DESTINATIONS = {
+    move: destination_table(permutation)
+    for move, permutation in MOVE_PERMUTATIONS.items()
+}
+
+# What every move does in every frame, as (gather of the stored facelets,
+# index translation table, frame afterwards). Rotations have neither, they
+# only change the frame.
+_TRANSITIONS = tuple(
+    {
+        **{
+            move: (
+                MOVE_GATHERS[stored_move],
+                _MOVE_DESTINATIONS[stored_move],
+                frame,
+            )
+            for move, stored_move in FRAME_MOVES[frame].items()
+        },
+        **{
+            rotation: (None, None, rotated)
+            for rotation, rotated in ROTATION_FRAMES[frame].items()
+        },
+    }
+    for frame in range(len(FRAMES))
+)
+_VIEW_GATHERS = tuple(itemgetter(*frame) for frame in FRAMES)
+
+# The view name of every stored facelet, per frame.
+_FRAME_FACELET_NAMES = tuple(
+    tuple(sorted(FACELETS, key=FRAME_FACELET_INDEX[frame].__getitem__))
+    for frame in range(len(FRAMES))
+)
+
+
+@lru_cache(maxsize=4096)
+def _permute_destinations(frame, permutation):
+    # A permutation of the view moves the stored facelets by the permutation
+    # composed with the frame.
+    if frame:
+        permutation = itemgetter(*permutation)(FRAMES[frame])
+    return destination_table(permutation)
+
+
+@lru_cache(maxsize=256)
+def _color_table(palette):
+    # Translation of the labels of a palette to the characters of their
+    # color indices; clients usually send the same few palettes.
+    return str.maketrans(dict(zip(palette, map(chr, range(len(palette))))))
+
+
+_new_object = object.__new__
+
+
+class BaseCubeState:
+    """
+    Compact cube state holding one small integer per facelet.
+
+    Color ``k`` is the color of the center of face ``FACES[k]``, so the state
+    is stored independently of the labels ('W', 'R', ...) the client used.
+    The original labels are kept in the palette, which lets the state be read
+    like the facelet dictionary (``state["F5"]``) and converted back to it.
+
+    Whole-cube rotations ("rl", "rr", "ru", "rd") only change the frame the
+    stored facelets are viewed in (see cube_solver.orientation), so they cost
+    no sticker copy. Everything public reads the rotated view.
+    """
+
+    __slots__ = ("_facelets", "_palette", "_frame", "_pieces")
+
+    @classmethod
+    def from_dict(cls, rubiks_cube):
+        """
+        Build a state from the facelet dictionary used by the API.
+
+        Args:
+            rubiks_cube (dict): Mapping of facelets 'U1'...'B9' to color labels.
+
+        Returns:
+            BaseCubeState: The equivalent state.
+
+        Raises:
+            ValueError: If a facelet is missing or a color is not a center color.
+        """
+        try:
+            palette = tuple(rubiks_cube[f"{face}5"] for face in FACES)
+            color_index = {color: index for index, color in enumerate(palette)}
+            if len(color_index) != 6:
+                raise ValueError("There must be 6 distinct center colors.")
+            facelets = bytes(color_index[rubiks_cube[name]] for name in FACELETS)
+        except KeyError as e:
+            raise ValueError(f"Missing facelet or unknown color: {str(e)}")
+        return cls._from_parts(facelets, palette)
+
+    @classmethod
+    def from_string(cls, facelets):
+        """
+        Build a state from the compact 54-character form of the API.
+
+        The string holds one color label per facelet, nine per face in the
+        face order U, R, F, D, L, B and each face in the order 1-9 of the
+        facelet names (U1, U2, ..., U9, R1, ..., B9). Any six distinct
+        characters can be used as labels, e.g. the face letters of the
+        Kociemba notation or the colors "WYRGOB".
+
+        Args:
+            facelets (str): The 54 color labels.
+
+        Returns:
+            BaseCubeState: The equivalent state.
+
+        Raises:
+            ValueError: If the string is not 54 characters long, the centers
+                are not 6 distinct colors or a color is not a center color.
+        """
+        if len(facelets) != len(FACELETS):
+            raise ValueError(f"Expected {len(FACELETS)} facelets, got {len(facelets)}.")
+        palette = tuple(facelets[index] for index in CENTER_INDICES)
+        if len(set(palette)) != 6:
+            raise ValueError("There must be 6 distinct center colors.")
+
+        # Checked on the labels themselves: a control character such as
+        # "\x00" would pass for a color index once translated.
+        if not frozenset(palette).issuperset(facelets):
+            index = next(
+                index for index, color in enumerate(facelets) if color not in palette
+            )
+            raise ValueError(
+                f"Unknown color {facelets[index]!r} at {FACELETS[index]}; "
+                "colors must be center colors."
+            )
+        # One C-level pass maps the labels to color indices.
+        encoded = facelets.translate(_color_table(palette))
+        return cls._from_parts(encoded.encode(), palette)
+
+    @classmethod
+    def _from_parts(cls, facelets, palette, frame=0, pieces=None):
+        state = _new_object(cls)
+        state._facelets = facelets
+        state._palette = palette
+        state._frame = frame
+        state._pieces = pieces
+        return state
+
+    def _view(self):
+        if self._frame:
+            return _VIEW_GATHERS[self._frame](self._facelets)
+        return self._facelets
+
+    @property
+    def facelets(self):
+        """
+        The 54 color indices in facelet order, as bytes.
+
+        After a whole-cube rotation the centers no longer show colors
+        0..5 in order; ``palette[color]`` is still the label of each color.
+        """
+        return bytes(self._view())
+
+    @property
+    def palette(self):
+        """
+        The color labels of the U, R, F, D, L and B centers.
+        """
+        return self._palette
+
+    def __getitem__(self, facelet):
+        return self._palette[self._facelets[FRAME_FACELET_INDEX[self._frame][facelet]]]
+
+    def __contains__(self, facelet):
+        return facelet in FACELET_INDEX
+
+    def __len__(self):
+        return len(FACELETS)
+
+    def locate(self, *colors):
+        """
+        Find where the stickers of one edge or corner are.
+
+        The piece-location index is built on the first call and then carried
+        along by every move, so this is a lookup rather than a scan.
+
+        Args:
+            *colors: The color labels of the piece, e.g. state["D5"], state["F5"].
+
+        Returns:
+            tuple: The facelet showing each color, in the same order, e.g. ("D2", "F8").
+
+        Raises:
+            ValueError: If no edge or corner has these colors.
+        """
+        pieces = self._pieces
+        if pieces is None:
+            pieces = self._pieces = build_index(self._facelets)
+
+        try:
+            stickers = STICKERS[tuple(map(self._palette.index, colors))]
+        except (ValueError, KeyError):
+            raise ValueError(f"No piece has the colors {colors}.")
+        facelets = itemgetter(*stickers)(pieces)
+        return itemgetter(*facelets)(_FRAME_FACELET_NAMES[self._frame])
+
+    def to_dict(self):
+        """
+        Convert the state back to the facelet dictionary used by the API.
+        """
+        palette = self._palette
+        return {name: palette[color] for name, color in zip(FACELETS, self._view())}
+
+    def is_solved(self):
+        """
+        Check whether every face shows the color of its center.
+        """
+        # Being solved does not depend on the frame.
+        facelets = self._facelets
+        return all(
+            facelets[index] == facelets[center]
+            for center in CENTER_INDICES
+            for index in range(center - 4, center + 5)
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, BaseCubeState):
+            return NotImplemented
+        return self.facelets == other.facelets and self._palette == other._palette
+
+    def __repr__(self):
+        colors = "".join(self._palette[color] for color in self._view())
+        return f"{type(self).__name__}({colors!r})"
+
+
+class CubeState(BaseCubeState):
+    """
+    Immutable cube state. Every move returns a new state.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, facelets, palette):
+        self._facelets = bytes(facelets)
+        self._palette = tuple(palette)
+        self._frame = 0
+        self._pieces = None
+
+    def move(self, move):
+        """
+        Apply a move (e.g. "f", "u'", "rl") and return the resulting state.
+        """
+        transition = _TRANSITIONS[self._frame].get(move)
+        if transition is None:
+            raise ValueError(f"Invalid move: {move}")
+        gather, destinations, frame = transition
+        state = _new_object(CubeState)
+        pieces = self._pieces
+        if gather:
+            state._facelets = bytes(gather(self._facelets))
+            if pieces is not None:
+                pieces = pieces.translate(destinations)
+        else:
+            state._facelets = self._facelets
+        state._palette = self._palette
+        state._frame = frame
+        state._pieces = pieces
+        return state
+
+    def permute(self, permutation):
+        """
+        Apply a facelet permutation, e.g. a compiled move sequence, in one gather.
+        """
+        state = _new_object(CubeState)
+        state._facelets = bytes(itemgetter(*permutation)(self._view()))
+        state._palette = self._palette
+        state._frame = 0
+        pieces = self._pieces
+        if pieces is not None:
+            pieces = pieces.translate(_permute_destinations(self._frame, permutation))
+        state._pieces = pieces
+        return state
+
+    def copy(self):
+        # Immutable, so sharing the instance is safe.
+        return self
+
+    def thaw(self):
+        """
+        Return a mutable copy of this state for in-place search loops.
+        """
+        return MutableCubeState._from_parts(
+            bytearray(self._facelets), self._palette, self._frame, self._pieces
+        )
+
+    def __hash__(self):
+        return hash(self.facelets)
+
+
+class MutableCubeState(BaseCubeState):
+    """
+    Mutable cube state backed by a bytearray. Moves are applied in place.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, facelets, palette):
+        self._facelets = bytearray(facelets)
+        self._palette = tuple(palette)
+        self._frame = 0
+        self._pieces = None
+
+    def apply(self, move):
+        """
+        Apply a move to this state in place.
+        """
+        transition = _TRANSITIONS[self._frame].get(move)
+        if transition is None:
+            raise ValueError(f"Invalid move: {move}")
+        gather, destinations, self._frame = transition
+        if gather:
+            self._facelets[:] = gather(self._facelets)
+            if self._pieces is not None:
+                self._pieces = self._pieces.translate(destinations)
+
+    def copy(self):
+        return MutableCubeState._from_parts(
+            bytearray(self._facelets), self._palette, self._frame, self._pieces
+        )
+
+    def freeze(self):
+        """
+        Return an immutable snapshot of this state.
+        """
+        return CubeState._from_parts(
+            bytes(self._facelets), self._palette, self._frame, self._pieces
+        )
@@ -0,0 +1,156 @@
+"""
+The 48 symmetries of the cube and canonical state keys.
+
+A symmetry is one of the 24 whole-cube rotations, optionally followed by the
+mirror through the plane between the L and R faces. Combined with relabeling
+the colors relative to the centers, states that only differ by a symmetry
+share one canonical representative: the smallest of their 48 transformed
+facelet strings. A solution of one of them becomes a solution of another by
+translating every move through the symmetry, so caches and tables keyed by
+the canonical state need up to 48 times fewer entries.
+
+A symmetry ``s`` is applied as a gather, ``transformed[i] = facelets[SYMMETRIES[s][i]]``,
+with the colors then renumbered so that the center of face k shows color k.
+"""
+
+from operator import itemgetter
+
+from solver.api.v1.cube_solver.facelets import (
+    CENTER_INDICES,
+    FACELET_INDEX,
+    FACELETS,
+    FACES,
+    IDENTITY,
+    MOVE_PERMUTATIONS,
+    compose,
+    invert,
+)
+from solver.api.v1.cube_solver.orientation import (
+    FACE_MOVES,
+    FRAME_ROTATIONS,
+    FRAMES,
+    ROTATIONS,
+)
+from solver.api.v1.cube_solver.state import BaseCubeState, CubeState
+
+_CENTER_COLORS = bytes(range(6))
+_FACE_LETTERS = FACES.encode()
+
+# The mirror through the plane between L and R: every face keeps its rows and
+# has its columns reversed, and the L and R faces swap.
+_MIRRORED_FACES = {"U": "U", "R": "L", "F": "F", "D": "D", "L": "R", "B": "B"}
+
+
+def _mirrored(name):
+    row, column = divmod(int(name[1]) - 1, 3)
+    return f"{_MIRRORED_FACES[name[0]]}{3 * row + 3 - column}"
+
+
+MIRROR = tuple(FACELET_INDEX[_mirrored(name)] for name in FACELETS)
+
+# Rotations first, then the same rotations mirrored.
+SYMMETRIES = FRAMES + tuple(compose(MIRROR, frame) for frame in FRAMES)
+
+N_SYMMETRIES = len(SYMMETRIES)
+
+_GATHERS = tuple(itemgetter(*symmetry) for symmetry in SYMMETRIES)
+_CENTERS = itemgetter(*CENTER_INDICES)
+
+_SYMMETRY_INDEX = {symmetry: index for index, symmetry in enumerate(SYMMETRIES)}
+
+# The symmetry undoing each symmetry.
+INVERSE_SYMMETRIES = tuple(_SYMMETRY_INDEX[invert(symmetry)] for symmetry in SYMMETRIES)
+
+_FACE_MOVE_BY_PERMUTATION = {MOVE_PERMUTATIONS[move]: move for move in FACE_MOVES}
+_FRAME_INDEX = {frame: index for index, frame in enumerate(FRAMES)}
+
+
+def _translate_move(symmetry, move):
+    # A move of the cube is the move conjugated by the symmetry on the
+    # transformed cube. Conjugated rotations may turn around the F-B axis,
+    # which is written with the rotations there are.
+    inverse = invert(symmetry)
+    permutation = MOVE_PERMUTATIONS[move]
+    conjugated = tuple(inverse[permutation[symmetry[index]]] for index in IDENTITY)
+    if move in ROTATIONS:
+        return FRAME_ROTATIONS[_FRAME_INDEX[conjugated]]
+    return (_FACE_MOVE_BY_PERMUTATION[conjugated],)
+
+
+# The moves of the transformed cube equivalent to every move, per symmetry.
+MOVE_TRANSLATIONS = tuple(
+    {move: _translate_move(symmetry, move) for move in MOVE_PERMUTATIONS}
+    for symmetry in SYMMETRIES
+)
+
+
+def transform(rubiks_cube, symmetry):
+    """
+    Apply a symmetry to a cube.
+
+    Args:
+        rubiks_cube (dict or CubeState): The cube.
+        symmetry (int): Index into SYMMETRIES.
+
+    Returns:
+        bytes: The 54 color indices of the transformed cube, the center of
+        face k showing color k.
+    """
+    if not isinstance(rubiks_cube, BaseCubeState):
+        rubiks_cube = CubeState.from_dict(rubiks_cube)
+    transformed = bytes(_GATHERS[symmetry](rubiks_cube.facelets))
+    centers = bytes(_CENTERS(transformed))
+    return transformed.translate(bytes.maketrans(centers, _CENTER_COLORS))
+
+
+def canonicalize(rubiks_cube):
+    """
+    Find the canonical representative of a cube under the 48 symmetries.
+
+    Args:
+        rubiks_cube (dict or CubeState): The cube.
+
+    Returns:
+        tuple: (canonical state as a 54-character string of face letters,
+        index of the symmetry turning the cube into it). Solutions of the
+        cube become solutions of the canonical state with
+        translate_sequence(moves, symmetry), and back with
+        translate_sequence(moves, INVERSE_SYMMETRIES[symmetry]).
+
+    Raises:
+        ValueError: If a facelet is missing or a color is not a center color.
+    """
+    if not isinstance(rubiks_cube, BaseCubeState):
+        rubiks_cube = CubeState.from_dict(rubiks_cube)
+    canonical, symmetry = min(
+        (transform(rubiks_cube, symmetry), symmetry) for symmetry in range(N_SYMMETRIES)
+    )
+    return (
+        canonical.translate(bytes.maketrans(_CENTER_COLORS, _FACE_LETTERS)).decode(),
+        symmetry,
+    )
+
+
+def translate_sequence(moves, symmetry):
+    """
+    Translate the moves of a cube into the moves of the transformed cube.
+
+    Args:
+        moves (list): Moves such as ["r", "u", "rl"].
+        symmetry (int): Index into SYMMETRIES.
+
+    Returns:
+        list: The equivalent moves. Face turns stay face turns, mirrored ones
+        turning the other way; a rotation may become up to three rotations.
+
+    Raises:
+        ValueError: If the sequence contains an unknown move.
+    """
+    translations = MOVE_TRANSLATIONS[symmetry]
+    translated = []
+    for move in moves:
+        translation = translations.get(move)
+        if translation is None:
+            raise ValueError(f"Invalid move: {move}")
+        translated.extend(translation)
+    return translated
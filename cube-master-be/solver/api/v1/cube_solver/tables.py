@@ -0,0 +1,92 @@
+"""
+Registry of precomputed lookup tables stored as .npy files.
+
+Modules register a builder with ``@register_table(name)``; ``load_table(name)``
+then loads the table on first use, building and saving it if the file does
+not exist yet. Tables are memory-mapped read-only so that worker processes
+share the same pages.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+TABLES_DIR = Path(__file__).resolve().parent / "data"
+
+_BUILDERS = {}
+_LOADED = {}
+
+
+def register_table(name):
+    """
+    Register the decorated function as the builder of the table `name`.
+    """
+
+    def decorator(builder):
+        _BUILDERS[name] = builder
+        return builder
+
+    return decorator
+
+
+def table_path(name):
+    return TABLES_DIR / f"{name}.npy"
+
+
+def build_table(name):
+    """
+    Build the table `name`, save it and return the path it was saved to.
+    """
+    table = np.ascontiguousarray(_BUILDERS[name]())
+    TABLES_DIR.mkdir(parents=True, exist_ok=True)
+    path = table_path(name)
+    # Every writer saves to its own temporary file and renames it over the
+    # table, so that concurrent builders never write to the same file and
+    # readers only ever see a complete table.
+    descriptor, temporary_name = tempfile.mkstemp(
+        dir=TABLES_DIR, prefix=f"{name}.", suffix=".tmp.npy"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            np.save(file, table)
+        os.replace(temporary_name, path)
+    except BaseException:
+        os.unlink(temporary_name)
+        raise
+    _LOADED.pop(name, None)
+    return path
+
+
+def load_table(name):
+    """
+    Return the table `name`, loading or building it on first use.
+
+    Raises:
+        KeyError: If no builder is registered under `name`.
+    """
+    table = _LOADED.get(name)
+    if table is not None:
+        return table
+
+    if name not in _BUILDERS:
+        raise KeyError(f"Unknown table: {name}")
+
+    path = table_path(name)
+    if not path.exists():
+        try:
+            build_table(name)
+        except OSError:
+            # Read-only deployments still work, just without the file cache.
+            table = _BUILDERS[name]()
+            _LOADED[name] = table
+            return table
+
+    table = np.load(path, mmap_mode="r")
+    _LOADED[name] = table
+    return table
+
+
+def registered_tables():
+    return sorted(_BUILDERS)
@@ -0,0 +1,179 @@
+"""
+The solving engines behind one interface, for work that runs outside a view.
+
+The batch endpoint parses, validates and solves every cube separately, so
+that a bad cube only fails its own item. The functions here are module level so
+that they can be sent to worker processes. Kociemba's cubes are the
+exception: they go to the Kociemba worker pool, which has a deadline.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from rest_framework import serializers
+
+from solver.api.v1.cube_solver.solver import CFOP_METHOD, RubiksCubeSolver
+from solver.api.v1.cube_solver.state import BaseCubeState
+from solver.api.v1.cube_solver.validator import CubeStateValidator
+from solver.api.v1.fields import RubiksCubeField
+from solver.api.v1.kociemba_solver.pool import KOCIEMBA_POOL, KociembaUnavailable
+from solver.api.v1.kociemba_solver.solver import KociembaSolver
+from solver.api.v1.workers import get_pool, reset_pool
+
+LAYER_ENGINE = "layer"
+KOCIEMBA_ENGINE = "kociemba"
+ENGINES = (LAYER_ENGINE, KOCIEMBA_ENGINE)
+
+# Cubes sent to a worker at a time; a layer solve takes well under a
+# millisecond, so single cubes would mostly pay for the round trip.
+CHUNK_SIZE = 8
+
+
+def solve_cube(
+    engine, rubiks_cube, method=CFOP_METHOD, rotation_free=False, kociemba_pool=None
+):
+    """
+    Parse, validate and solve one cube.
+
+    Args:
+        engine (str): "layer" or "kociemba".
+        rubiks_cube (dict, str or CubeState): Mapping of facelets 'U1'...'B9'
+            to color labels, or the 54 colors as one string (see RubiksCubeField).
+        method (str): The layer solver's method, see RubiksCubeSolver.
+        rotation_free (bool): Layer solver only, return only face turns.
+        kociemba_pool (KociembaPool): Kociemba only, solve in the pool's
+            worker processes instead of in this process.
+
+    Returns:
+        list: The moves solving the cube.
+
+    Raises:
+        serializers.ValidationError: If the cube is invalid or cannot be solved.
+        KociembaUnavailable: If the Kociemba pool did not answer in time.
+    """
+    if not isinstance(rubiks_cube, BaseCubeState):
+        rubiks_cube = RubiksCubeField().run_validation(rubiks_cube)
+    CubeStateValidator(rubiks_cube).validate()
+
+    if engine == KOCIEMBA_ENGINE:
+        sequence, is_solved, error = KociembaSolver(
+            rubiks_cube, pool=kociemba_pool
+        ).solve()
+        if not is_solved:
+            raise serializers.ValidationError(error)
+        return sequence
+
+    solver = RubiksCubeSolver(rubiks_cube, rotation_free=rotation_free, method=method)
+    sequence, _ = solver.solve()
+    return sequence
+
+
+def error_message(error):
+    """
+    The message of a solve error, as reported for a batch item.
+
+    Args:
+        error (Exception): A ValidationError or ValueError.
+
+    Returns:
+        str: The first error message.
+    """
+    if isinstance(error, serializers.ValidationError):
+        detail = error.detail
+        if isinstance(detail, dict):
+            # A field of the cube, e.g. {"U1": ["Not a valid string."]}.
+            name, messages = next(iter(detail.items()))
+            return f"{name}: {messages[0]}"
+        if isinstance(detail, list):
+            return str(detail[0])
+    return str(error)
+
+
+def solve_chunk(engine, items, options):
+    """
+    Solve a chunk of a batch, in a pool worker.
+
+    Args:
+        engine (str): "layer" or "kociemba".
+        items (list): (index, rubiks_cube) pairs.
+        options (dict): Keyword arguments of solve_cube.
+
+    Returns:
+        list: (index, moves, None) for every solved cube and
+        (index, None, error message) for every failed one.
+    """
+    results = []
+    for index, rubiks_cube in items:
+        try:
+            results.append((index, solve_cube(engine, rubiks_cube, **options), None))
+        except (serializers.ValidationError, ValueError) as e:
+            results.append((index, None, error_message(e)))
+    return results
+
+
+def _solve_kociemba_item(index, rubiks_cube):
+    # One batch item in the Kociemba worker pool, from a thread of this process.
+    try:
+        sequence = solve_cube(KOCIEMBA_ENGINE, rubiks_cube, kociemba_pool=KOCIEMBA_POOL)
+    except (serializers.ValidationError, ValueError, KociembaUnavailable) as e:
+        return index, None, error_message(e)
+    return index, sequence, None
+
+
+def solve_batch(engine, cubes, options):
+    """
+    Solve many cubes across the process pool.
+
+    Kociemba's solver cannot be interrupted, so its cubes go to the Kociemba
+    worker pool instead, from as many threads as it has workers; every cube
+    gets the pool's deadline.
+
+    Args:
+        engine (str): "layer" or "kociemba".
+        cubes (list): The cubes, as facelet dictionaries or 54-character
+            strings, not validated yet.
+        options (dict): Keyword arguments of solve_cube.
+
+    Yields:
+        tuple: (index, moves, None) or (index, None, error message) for
+        every cube, as the chunks complete rather than in order.
+    """
+    if engine == KOCIEMBA_ENGINE:
+        executor = ThreadPoolExecutor(
+            max_workers=KOCIEMBA_POOL.size, thread_name_prefix="kociemba-batch"
+        )
+        try:
+            futures = [
+                executor.submit(_solve_kociemba_item, index, rubiks_cube)
+                for index, rubiks_cube in enumerate(cubes)
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # A client that stops reading a stream cancels the cubes not
+            # started yet.
+            executor.shutdown(wait=False, cancel_futures=True)
+        return
+
+    items = list(enumerate(cubes))
+    pool = get_pool()
+    futures = {
+        pool.submit(solve_chunk, engine, chunk, options): chunk
+        for chunk in (
+            items[start : start + CHUNK_SIZE]
+            for start in range(0, len(items), CHUNK_SIZE)
+        )
+    }
+    for future in as_completed(futures):
+        try:
+            results = future.result()
+        except Exception as e:
+            # A worker crashed or the chunk failed unexpectedly; only the
+            # cubes of this chunk fail.
+            if isinstance(e, BrokenProcessPool):
+                reset_pool(pool)
+            results = [
+                (index, None, f"The solver failed: {e!r}")
+                for index, _ in futures[future]
+            ]
+        yield from results
@@ -0,0 +1,14 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class SolverUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The solver is unavailable, try again later."
+    default_code = "solver_unavailable"
+
+
+class SolverTimeout(APIException):
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    default_detail = "The solver did not finish within the time limit."
+    default_code = "solver_timeout"
@@ -0,0 +1,50 @@
+"""
+Serializer fields shared by the request serializers and the solving engines.
+"""
+
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+from solver.api.v1.cube_solver.state import BaseCubeState, CubeState
+
+
+@extend_schema_field(
+    {
+        "oneOf": [
+            {"type": "object", "additionalProperties": {"type": "string"}},
+            {"type": "string", "minLength": 54, "maxLength": 54},
+        ]
+    }
+)
+class RubiksCubeField(serializers.Field):
+    """
+    A cube as the facelet dictionary or as the compact 54-character string.
+
+    The dictionary maps the facelets 'U1'...'B9' to color labels and is
+    passed on as is. The string holds the labels in the face order U, R, F,
+    D, L, B, nine per face in the order of the facelet names, and is parsed
+    straight into a CubeState (see CubeState.from_string).
+    """
+
+    default_error_messages = {
+        "invalid": 'Expected a dictionary of facelets or a string of 54 colors but got type "{input_type}".'
+    }
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.facelet_dict = serializers.DictField(child=serializers.CharField())
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            try:
+                return CubeState.from_string(data)
+            except ValueError as e:
+                raise serializers.ValidationError(str(e))
+        if isinstance(data, dict):
+            return self.facelet_dict.to_internal_value(data)
+        self.fail("invalid", input_type=type(data).__name__)
+
+    def to_representation(self, value):
+        if isinstance(value, BaseCubeState):
+            return value.to_dict()
+        return value
@@ -0,0 +1,250 @@
+"""
+Asynchronous solve jobs, kept in process.
+
+A job is queued on a small thread pool whose threads hand the solving to the
+worker processes (see solver.api.v1.workers), so a slow solve does not hold
+a request. Clients poll the job or follow its server-sent events. Finished
+jobs are kept for the retention time of the SOLVER_JOBS setting and then
+dropped; new jobs are refused while its MAX_PENDING jobs are queued or
+running.
+
+Jobs live in the memory of the process that accepted them. Under a server
+running several worker processes, a poll that reaches another process gets a
+404 for a job that exists; run the job endpoints in one process (with
+threads) or route a client's requests to the same process.
+"""
+
+import copy
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+from solver.api.v1.cube_solver.search import solve_best_orientation
+from solver.api.v1.engines import (
+    KOCIEMBA_ENGINE,
+    LAYER_ENGINE,
+    error_message,
+    solve_cube,
+)
+from solver.api.v1.kociemba_solver.pool import KOCIEMBA_POOL, KociembaUnavailable
+from solver.api.v1.workers import get_pool, reset_pool
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+DEFAULT_WORKERS = 2
+DEFAULT_RETENTION = 3600  # seconds
+DEFAULT_MAX_PENDING = 100
+
+
+class JobQueueFull(Exception):
+    """
+    Too many jobs are queued or running to accept another one.
+    """
+
+
+class Job:
+    """
+    One solve job: the validated request, its status and its result.
+
+    ``version`` grows with every change, for waiting on the next one.
+    """
+
+    def __init__(self, data):
+        self.id = uuid.uuid4().hex
+        self.data = data
+        self.status = QUEUED
+        self.created = timezone.now()
+        self.finished = None
+        self.sequence = None
+        self.orientation = None
+        self.error = None
+        self.version = 0
+        self._finished_at = None
+
+
+def run_job(data):
+    """
+    Solve the request of a job.
+
+    Args:
+        data (dict): Validated RubiksCubeJobSerializer data.
+
+    Returns:
+        tuple: (list of moves, dict describing the winning orientation or None)
+
+    Raises:
+        serializers.ValidationError: If the cube cannot be solved.
+        KociembaUnavailable: If the Kociemba pool did not answer in time.
+    """
+    if data["engine"] == KOCIEMBA_ENGINE:
+        # Kociemba has its own worker pool, with a deadline.
+        sequence = solve_cube(
+            KOCIEMBA_ENGINE, data["rubiks_cube"], kociemba_pool=KOCIEMBA_POOL
+        )
+        return sequence, None
+
+    if data["engine"] == LAYER_ENGINE and (
+        data["search_orientations"] or data["search_inverse"]
+    ):
+        return solve_best_orientation(
+            data["rubiks_cube"],
+            method=data["method"],
+            rotation_free=data["rotation_free"],
+            orientations=data["search_orientations"],
+            inverse=data["search_inverse"],
+            metric=data["metric"],
+            time_budget=data["time_budget"],
+        )
+
+    pool = get_pool()
+    future = pool.submit(
+        solve_cube,
+        data["engine"],
+        data["rubiks_cube"],
+        method=data["method"],
+        rotation_free=data["rotation_free"],
+    )
+    try:
+        return future.result(), None
+    except BrokenProcessPool:
+        reset_pool(pool)
+        raise
+
+
+class JobStore:
+    """
+    In-process job queue and result store. Safe to share between request
+    threads.
+    """
+
+    def __init__(
+        self,
+        workers=DEFAULT_WORKERS,
+        retention=DEFAULT_RETENTION,
+        max_pending=DEFAULT_MAX_PENDING,
+        clock=time.monotonic,
+    ):
+        self.retention = retention
+        self.max_pending = max_pending
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="solve-job"
+        )
+        self._jobs = {}
+        self._changed = threading.Condition()
+
+    def submit(self, data):
+        """
+        Queue a job.
+
+        Args:
+            data (dict): Validated RubiksCubeJobSerializer data.
+
+        Returns:
+            Job: The queued job.
+
+        Raises:
+            JobQueueFull: If max_pending jobs are already queued or running.
+        """
+        job = Job(data)
+        with self._changed:
+            self._purge()
+            pending = sum(
+                1
+                for other in self._jobs.values()
+                if other.status not in FINISHED_STATUSES
+            )
+            if pending >= self.max_pending:
+                raise JobQueueFull(
+                    f"{pending} solve jobs are already queued or running; try again later."
+                )
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        """
+        Look up a job.
+
+        Returns:
+            Job: The job, or None if it is unknown or was dropped.
+        """
+        with self._changed:
+            self._purge()
+            return self._jobs.get(job_id)
+
+    def snapshot(self, job):
+        """
+        A consistent copy of a job, not changed by the worker threads.
+        """
+        with self._changed:
+            return copy.copy(job)
+
+    def wait(self, job, version, timeout):
+        """
+        Wait until a job changes past a version.
+
+        Args:
+            job (Job): The job.
+            version (int): The version last seen.
+            timeout (float): Seconds to wait at most.
+
+        Returns:
+            bool: Whether the job changed.
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: job.version > version, timeout)
+
+    def _run(self, job):
+        self._update(job, status=RUNNING)
+        try:
+            sequence, orientation = run_job(job.data)
+        except (serializers.ValidationError, ValueError, KociembaUnavailable) as e:
+            self._finish(job, status=FAILED, error=error_message(e))
+        except Exception as e:
+            self._finish(job, status=FAILED, error=f"The solver failed: {e!r}")
+        else:
+            self._finish(
+                job, status=SUCCEEDED, sequence=sequence, orientation=orientation
+            )
+
+    def _finish(self, job, **changes):
+        self._update(
+            job, finished=timezone.now(), _finished_at=self._clock(), **changes
+        )
+
+    def _update(self, job, **changes):
+        with self._changed:
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.version += 1
+            self._changed.notify_all()
+
+    def _purge(self):
+        # Drop finished jobs past the retention time.
+        expired = self._clock() - self.retention
+        for job_id in [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job._finished_at is not None and job._finished_at < expired
+        ]:
+            del self._jobs[job_id]
+
+
+_config = getattr(settings, "SOLVER_JOBS", {})
+
+JOB_STORE = JobStore(
+    workers=_config.get("WORKERS", DEFAULT_WORKERS),
+    retention=_config.get("RETENTION", DEFAULT_RETENTION),
+    max_pending=_config.get("MAX_PENDING", DEFAULT_MAX_PENDING),
+)
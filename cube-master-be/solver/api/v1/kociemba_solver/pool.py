@@ -0,0 +1,223 @@
+"""
+Worker processes running Kociemba's solver, isolated from the web process.
+
+``kociemba.solve`` is a C call that cannot be interrupted, so the solve
+endpoint hands every cube to one of a few long-lived worker processes and
+waits for the answer with a deadline. A worker that misses its deadline is
+killed and replaced on a later request, so a pathological cube costs one
+worker for a bounded time instead of a web process for good.
+
+Workers are started on first use, from the process that serves the
+request. They are forked, whatever the platform's default start method, so
+that when started after the warm-up (see solver.api.v1.warmup) they inherit
+Kociemba's loaded tables; spawned workers would load the tables again on
+their first solve. Only platforms without fork (Windows) spawn them. The
+pool is sized and timed by the SOLVER_KOCIEMBA setting.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+
+import kociemba
+from django.conf import settings
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 10.0  # seconds
+
+_CONTEXT = multiprocessing.get_context(
+    "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+class KociembaUnavailable(Exception):
+    """
+    The pool could not solve a cube: a worker died or the deadline passed.
+    """
+
+
+class KociembaTimeout(KociembaUnavailable):
+    """
+    No answer within the deadline, waiting for a worker included.
+    """
+
+
+def _serve(connection, solve):
+    # Worker loop: solve the cube strings sent until the pool closes the pipe.
+    while True:
+        try:
+            cube_string = connection.recv()
+        except EOFError:
+            return
+        try:
+            result = (True, solve(cube_string))
+        except Exception as e:
+            result = (False, str(e))
+        connection.send(result)
+
+
+class _Worker:
+    __slots__ = ("process", "connection")
+
+    def __init__(self, solve):
+        self.connection, child = _CONTEXT.Pipe()
+        self.process = _CONTEXT.Process(
+            target=_serve, args=(child, solve), name="kociemba-worker", daemon=True
+        )
+        self.process.start()
+        child.close()
+
+    def stop(self):
+        self.process.kill()
+        self.process.join(timeout=1)
+        self.connection.close()
+
+
+class KociembaPool:
+    """
+    A bounded pool of Kociemba worker processes. Safe to share between
+    request threads.
+    """
+
+    def __init__(self, size=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT, solve=None):
+        """
+        Args:
+            size (int): The most worker processes running at once.
+            timeout (float): Default deadline of a solve, in seconds.
+            solve (callable): The module-level function the workers solve
+                cube strings with; kociemba.solve by default.
+        """
+        self.size = size
+        self.timeout = timeout
+        self._solve = solve or kociemba.solve
+        self._changed = threading.Condition()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = []
+        self._workers = 0
+        self._waiting = 0
+        self._solved = 0
+        self._unsolvable = 0
+        self._timeouts = 0
+        self._replaced = 0
+
+    def solve(self, cube_string, timeout=None):
+        """
+        Solve a cube in a worker process.
+
+        Args:
+            cube_string (str): The cube in Kociemba's facelet notation.
+            timeout (float): Seconds to wait at most, for a free worker and
+                the solve together. Defaults to the pool's timeout.
+
+        Returns:
+            str: The solution in Kociemba's notation, e.g. "R U2 F'".
+
+        Raises:
+            ValueError: If Kociemba's solver rejects the cube.
+            KociembaTimeout: If there is no answer within the timeout; the
+                worker solving the cube is killed.
+            KociembaUnavailable: If the worker died.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        worker = self._acquire(deadline)
+        try:
+            worker.connection.send(cube_string)
+            if not worker.connection.poll(max(deadline - time.monotonic(), 0)):
+                self._discard(worker, timed_out=True)
+                raise KociembaTimeout(
+                    "Kociemba's solver did not finish within the time limit."
+                )
+            is_solved, result = worker.connection.recv()
+        except (EOFError, OSError) as e:
+            self._discard(worker)
+            raise KociembaUnavailable("The Kociemba worker stopped.") from e
+
+        with self._changed:
+            self._idle.append(worker)
+            if is_solved:
+                self._solved += 1
+            else:
+                self._unsolvable += 1
+            self._changed.notify()
+        if not is_solved:
+            raise ValueError(result)
+        return result
+
+    def stats(self):
+        """
+        Counters for monitoring.
+
+        Returns:
+            dict: The pool size and timeout, the started, busy and idle
+            workers, the requests waiting for a worker and the solved,
+            unsolvable and timed out requests and the workers replaced after
+            a timeout or a crash so far.
+        """
+        with self._changed:
+            self._check_process()
+            return {
+                "size": self.size,
+                "timeout": self.timeout,
+                "workers": self._workers,
+                "busy": self._workers - len(self._idle),
+                "idle": len(self._idle),
+                "queue_depth": self._waiting,
+                "solved": self._solved,
+                "unsolvable": self._unsolvable,
+                "timeouts": self._timeouts,
+                "replaced": self._replaced,
+            }
+
+    def _check_process(self):
+        # A forked process inherits the pool but not its workers.
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def _acquire(self, deadline):
+        with self._changed:
+            self._check_process()
+            self._waiting += 1
+            try:
+                available = self._changed.wait_for(
+                    lambda: self._idle or self._workers < self.size,
+                    timeout=max(deadline - time.monotonic(), 0),
+                )
+            finally:
+                self._waiting -= 1
+            if not available:
+                self._timeouts += 1
+                raise KociembaTimeout(
+                    "No Kociemba worker became free within the time limit."
+                )
+            if self._idle:
+                return self._idle.pop()
+            self._workers += 1
+
+        try:
+            return _Worker(self._solve)
+        except Exception:
+            with self._changed:
+                self._workers -= 1
+                self._changed.notify()
+            raise
+
+    def _discard(self, worker, timed_out=False):
+        worker.stop()
+        with self._changed:
+            self._workers -= 1
+            self._replaced += 1
+            if timed_out:
+                self._timeouts += 1
+            self._changed.notify()
+
+
+_config = getattr(settings, "SOLVER_KOCIEMBA", {})
+
+KOCIEMBA_POOL = KociembaPool(
+    size=_config.get("WORKERS", DEFAULT_WORKERS),
+    timeout=_config.get("TIMEOUT", DEFAULT_TIMEOUT),
+)
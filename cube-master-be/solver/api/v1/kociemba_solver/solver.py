@@ -1,12 +1,30 @@
 import kociemba
 
+from solver.api.v1.kociemba_solver.pool import KociembaUnavailable
+
 
 class KociembaSolver:
-    def __init__(self, rubiks_cube):
+    def __init__(self, rubiks_cube, pool=None):
+        """
+        Args:
+            rubiks_cube (dict or CubeState): Mapping of facelets 'U1'...'B9' to color labels.
+            pool (KociembaPool): Solve in the pool's worker processes, with
+                its deadline, instead of in this process.
+        """
         self.rubiks_cube = rubiks_cube
+        self.pool = pool
         self.sequence = []
 
     def solve(self):
+        """
+        Returns:
+            tuple: (list of moves, True, "") when solved, or
+            ([], False, error message) when the cube cannot be solved.
+
+        Raises:
+            KociembaUnavailable: If the pool did not answer in time or its
+                worker died; the cube may still be solvable.
+        """
         # Map cube colors to Kociemba notation
         color_to_notation = {
             self.rubiks_cube["B5"]: "B",
@@ -27,10 +45,15 @@ class KociembaSolver:
                 kociemba_string += color_to_notation[color]
 
         try:
-            solution = kociemba.solve(kociemba_string)
+            if self.pool is not None:
+                solution = self.pool.solve(kociemba_string)
+            else:
+                solution = kociemba.solve(kociemba_string)
             sequence_kociemba_format = solution.split(" ")
             self.sequence = self._transform_format(sequence_kociemba_format)
             return self.sequence, True, ""
+        except KociembaUnavailable:
+            raise
         except Exception as e:
             return [], False, "The cube is impossible to solve."
 
@@ -1,15 +1,115 @@
 from rest_framework import serializers
 
+from solver.api.v1.cube_solver.notation import (
+    LIST_FORMAT,
+    METRICS,
+    QUARTER_TURN_METRIC,
+    SEQUENCE_FORMATS,
+)
+from solver.api.v1.cube_solver.search import DEFAULT_TIME_BUDGET
+from solver.api.v1.cube_solver.solver import CFOP_METHOD, METHODS
 from solver.api.v1.cube_solver.validator import CubeStateValidator
+from solver.api.v1.engines import ENGINES, LAYER_ENGINE
+from solver.api.v1.fields import RubiksCubeField
 
+MAX_BATCH_SIZE = 1000
 
-class RubiksCubeSerializer(serializers.Serializer):
-    rubiks_cube = serializers.DictField(
-        child=serializers.CharField(),
-        help_text="A dictionary mapping facelets like 'F1', 'R2', etc. to their colors (e.g., 'W', 'R').",
+NDJSON_FORMAT = "ndjson"
+SSE_FORMAT = "sse"
+STREAM_FORMATS = (NDJSON_FORMAT, SSE_FORMAT)
+
+
+class SequenceFormatSerializer(serializers.Serializer):
+    metric = serializers.ChoiceField(
+        choices=METRICS,
+        default=QUARTER_TURN_METRIC,
+        help_text="'qtm' writes a half turn as two quarter turns ('u', 'u'), 'htm' as one move ('u2').",
+    )
+    sequence_format = serializers.ChoiceField(
+        choices=SEQUENCE_FORMATS,
+        default=LIST_FORMAT,
+        help_text="'list' returns the sequence as an array of moves, 'string' as one string such as \"R U R' U2\", with the rotations rl, rr, ru and rd written y, y', x and x'.",
+    )
+
+
+class RubiksCubeSerializer(SequenceFormatSerializer):
+    rubiks_cube = RubiksCubeField(
+        help_text="A dictionary mapping facelets like 'F1', 'R2', etc. to their colors (e.g., 'W', 'R'), or the 54 colors as one string in the facelet order U1-U9, R1-R9, F1-F9, D1-D9, L1-L9, B1-B9.",
     )
 
     def validate(self, data):
         validator = CubeStateValidator(data["rubiks_cube"])
         validator.validate()
         return data
+
+
+class RubiksCubeLayerSerializer(RubiksCubeSerializer):
+    method = serializers.ChoiceField(
+        choices=METHODS,
+        default=CFOP_METHOD,
+        help_text="'cfop' solves the cross, the first two layers and the last layer (OLL/PLL) with lookup tables, 'beginner' layer by layer with the beginner method.",
+    )
+    rotation_free = serializers.BooleanField(
+        default=False,
+        help_text="Return only face turns in the cube's starting orientation, without whole-cube rotations (rl, rr, ru, rd).",
+    )
+
+
+class RubiksCubeSolveSerializer(RubiksCubeLayerSerializer):
+    search_orientations = serializers.BooleanField(
+        default=False,
+        help_text="Solve the cube in all 24 whole-cube orientations and return the shortest solution.",
+    )
+    search_inverse = serializers.BooleanField(
+        default=False,
+        help_text="Also solve the inverse of the cube state and return the reversed solution if it is shorter.",
+    )
+    time_budget = serializers.FloatField(
+        default=DEFAULT_TIME_BUDGET,
+        min_value=0,
+        max_value=10,
+        help_text="Wall-clock budget of the orientation search in seconds; candidates not solved in time are skipped, and a search cut short is not cached.",
+    )
+
+
+class RubiksCubeStreamSerializer(RubiksCubeLayerSerializer):
+    stream_format = serializers.ChoiceField(
+        choices=STREAM_FORMATS,
+        default=NDJSON_FORMAT,
+        help_text="'ndjson' sends one JSON line per stage, 'sse' one server-sent 'stage' event per stage.",
+    )
+
+
+class RubiksCubeJobSerializer(RubiksCubeSolveSerializer):
+    engine = serializers.ChoiceField(
+        choices=ENGINES,
+        default=LAYER_ENGINE,
+        help_text="'layer' solves with the layer solver, 'kociemba' with Kociemba's algorithm. The search options only apply to the layer solver.",
+    )
+
+
+class RubiksCubeBatchSerializer(SequenceFormatSerializer):
+    cubes = serializers.ListField(
+        child=serializers.JSONField(allow_null=True),
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        help_text="The cubes to solve, each a dictionary mapping facelets like 'F1' to colors or a string of 54 colors. Each cube is validated on its own, so a bad cube only fails its own result.",
+    )
+    engine = serializers.ChoiceField(
+        choices=ENGINES,
+        default=LAYER_ENGINE,
+        help_text="'layer' solves with the layer solver, 'kociemba' with Kociemba's algorithm.",
+    )
+    method = serializers.ChoiceField(
+        choices=METHODS,
+        default=CFOP_METHOD,
+        help_text="Method of the layer solver, 'cfop' or 'beginner'.",
+    )
+    rotation_free = serializers.BooleanField(
+        default=False,
+        help_text="Layer solver only: return only face turns, without whole-cube rotations.",
+    )
+    stream = serializers.BooleanField(
+        default=False,
+        help_text="Stream the results as NDJSON, one line per cube as soon as it is solved, instead of one JSON response in order.",
+    )
@@ -1,8 +1,31 @@
 from django.urls import path
 
-from solver.api.v1.views import CubeSolverAPIView, KociembaCubeSolverAPIView
+from solver.api.v1.views import (
+    CubeBatchSolverAPIView,
+    CubeSolverAPIView,
+    CubeStreamSolverAPIView,
+    KociembaCubeSolverAPIView,
+    KociembaPoolStatsAPIView,
+    SolveJobAPIView,
+    SolveJobDetailAPIView,
+    SolveJobEventsAPIView,
+    SolveCacheStatsAPIView,
+    SolverReadinessAPIView,
+)
 
 urlpatterns = [
     path("solve/", CubeSolverAPIView.as_view(), name="solve-cube"),
     path("solve-kociemba/", KociembaCubeSolverAPIView.as_view(), name="solve-kociemba"),
+    path("solve-stream/", CubeStreamSolverAPIView.as_view(), name="solve-stream"),
+    path("solve-batch/", CubeBatchSolverAPIView.as_view(), name="solve-batch"),
+    path("jobs/", SolveJobAPIView.as_view(), name="solve-jobs"),
+    path("jobs/<str:job_id>/", SolveJobDetailAPIView.as_view(), name="solve-job"),
+    path(
+        "jobs/<str:job_id>/events/",
+        SolveJobEventsAPIView.as_view(),
+        name="solve-job-events",
+    ),
+    path("cache-stats/", SolveCacheStatsAPIView.as_view(), name="solve-cache-stats"),
+    path("kociemba-stats/", KociembaPoolStatsAPIView.as_view(), name="kociemba-pool-stats"),
+    path("ready/", SolverReadinessAPIView.as_view(), name="solver-ready"),
 ]
\ No newline at end of file
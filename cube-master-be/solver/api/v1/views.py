@@ -1,18 +1,47 @@
+import json
+
+from django.http import StreamingHttpResponse
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiTypes
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
 
+from solver.api.v1.cache import SOLVE_CACHE
+from solver.api.v1.engines import error_message, solve_batch
+from solver.api.v1.exceptions import SolverTimeout, SolverUnavailable
+from solver.api.v1.jobs import FINISHED_STATUSES, JOB_STORE, JobQueueFull
+from solver.api.v1.kociemba_solver.pool import (
+    KOCIEMBA_POOL,
+    KociembaTimeout,
+    KociembaUnavailable,
+)
 from solver.api.v1.kociemba_solver.solver import KociembaSolver
-from solver.api.v1.serializers import RubiksCubeSerializer
+from solver.api.v1.serializers import (
+    RubiksCubeBatchSerializer,
+    RubiksCubeJobSerializer,
+    RubiksCubeSerializer,
+    RubiksCubeSolveSerializer,
+    RubiksCubeStreamSerializer,
+    SSE_FORMAT,
+)
+from solver.api.v1.cube_solver.notation import format_sequence
+from solver.api.v1.cube_solver.search import solve_best_orientation
 from solver.api.v1.cube_solver.solver import RubiksCubeSolver
+from solver.api.v1.warmup import READY, SKIPPED, readiness
+
+
+def _is_complete_search(result):
+    # A search that ran out of time may have missed shorter solutions.
+    _, orientation = result
+    return orientation["searched"] == orientation["candidates"]
 
 
 class CubeSolverAPIView(APIView):
-    serializer_class = RubiksCubeSerializer
+    serializer_class = RubiksCubeSolveSerializer
 
     @extend_schema(
-        request=RubiksCubeSerializer,
+        request=RubiksCubeSolveSerializer,
         responses={200: OpenApiTypes.OBJECT},
         examples=[
             OpenApiExample(
@@ -77,9 +106,17 @@ class CubeSolverAPIView(APIView):
                 },
                 request_only=True,
                 description="A complete scrambled cube using facelet notation and color codes (W, Y, R, O, B, G).",
-            )
+            ),
+            OpenApiExample(
+                name="Rubik's Cube Compact State Example",
+                value={
+                    "rubiks_cube": "GGOYYYROGWBBYBRRBGBYRWOROWBBBWGWOOWYOGYGGRYWWYRWBROROG"
+                },
+                request_only=True,
+                description="The same cube as one string of 54 colors in the facelet order U1-U9, R1-R9, F1-F9, D1-D9, L1-L9, B1-B9.",
+            ),
         ],
-        description="Submit a full Rubik's Cube state. Input should include all 54 facelets labeled as 'F1'–'D9' with color codes.",
+        description="Submit a full Rubik's Cube state. Input should include all 54 facelets labeled as 'F1'–'D9' with color codes, or the 54 color codes as one string in the order U, R, F, D, L, B.",
         operation_id="submit_rubiks_cube_state",
         tags=["Rubik's Cube"],
     )
@@ -87,19 +124,128 @@ class CubeSolverAPIView(APIView):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        rubiks_cube = serializer.validated_data["rubiks_cube"]
+        data = serializer.validated_data
 
+        search = data["search_orientations"] or data["search_inverse"]
+        options = (data["method"], data["rotation_free"])
+        if search:
+            # Only complete searches are cached, and they find the same
+            # solution whatever their budget.
+            options += (
+                data["search_orientations"],
+                data["search_inverse"],
+                data["metric"],
+            )
+
+        if search:
+            sequence, orientation = SOLVE_CACHE.get_or_solve(
+                "layer",
+                data["rubiks_cube"],
+                options,
+                lambda: self._search(data),
+                cacheable=_is_complete_search,
+            )
+        else:
+            orientation = None
+            sequence = SOLVE_CACHE.get_or_solve(
+                "layer",
+                data["rubiks_cube"],
+                options,
+                lambda: self._solve(data),
+                symmetric=True,
+            )
+
+        response = {
+            "message": "Solved Rubik's Cube successfully.",
+            "sequence": format_sequence(
+                sequence, data["metric"], data["sequence_format"]
+            ),
+        }
+        if orientation is not None:
+            response["orientation"] = orientation
+
+        return Response(response, status=status.HTTP_200_OK)
+
+    def _solve(self, data):
         # Solve the rubik's cube
-        solver = RubiksCubeSolver(rubiks_cube)
+        solver = RubiksCubeSolver(
+            data["rubiks_cube"],
+            rotation_free=data["rotation_free"],
+            method=data["method"],
+        )
         sequence, sequence_cube = solver.solve()
+        return tuple(sequence)
 
-        return Response(
-            {
-                "message": "Solved Rubik's Cube successfully.",
-                "sequence": sequence,
-            },
-            status=status.HTTP_200_OK,
+    def _search(self, data):
+        # Solve the rubik's cube in several orientations, keep the shortest
+        sequence, orientation = solve_best_orientation(
+            data["rubiks_cube"],
+            method=data["method"],
+            rotation_free=data["rotation_free"],
+            orientations=data["search_orientations"],
+            inverse=data["search_inverse"],
+            metric=data["metric"],
+            time_budget=data["time_budget"],
+        )
+        return tuple(sequence), orientation
+
+
+class CubeStreamSolverAPIView(APIView):
+    serializer_class = RubiksCubeStreamSerializer
+
+    @extend_schema(
+        request=RubiksCubeStreamSerializer,
+        responses={
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+            (200, "text/event-stream"): OpenApiTypes.STR,
+        },
+        description="Solve with the layer solver and stream the moves of every stage (cross, f2l, last_layer; or bottom_layer, second_layer, top_layer) as soon as the stage is done, so they can be executed while the rest is solved. A 'done' message follows the last stage, or an 'error' message if the solve failed.",
+        operation_id="stream_rubiks_cube_solution",
+        tags=["Rubik's Cube"],
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data
+        solver = RubiksCubeSolver(
+            data["rubiks_cube"],
+            rotation_free=data["rotation_free"],
+            method=data["method"],
+        )
+
+        sse = data["stream_format"] == SSE_FORMAT
+        response = StreamingHttpResponse(
+            self._stream(solver, data, sse),
+            content_type="text/event-stream" if sse else "application/x-ndjson",
         )
+        response["Cache-Control"] = "no-cache"
+        return response
+
+    def _stream(self, solver, data, sse):
+        try:
+            for stage, moves in solver.solve_stages():
+                yield self._message(
+                    "stage",
+                    {
+                        "stage": stage,
+                        "sequence": format_sequence(
+                            moves, data["metric"], data["sequence_format"]
+                        ),
+                    },
+                    sse,
+                )
+        except (ValidationError, ValueError) as e:
+            yield self._message("error", {"error": error_message(e)}, sse)
+        else:
+            yield self._message(
+                "done", {"message": "Solved Rubik's Cube successfully."}, sse
+            )
+
+    def _message(self, event, payload, sse):
+        if sse:
+            return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps({"event": event, **payload}) + "\n"
 
 
 class KociembaCubeSolverAPIView(APIView):
@@ -107,7 +253,12 @@ class KociembaCubeSolverAPIView(APIView):
 
     @extend_schema(
         request=RubiksCubeSerializer,
-        responses={200: OpenApiTypes.OBJECT},
+        responses={
+            200: OpenApiTypes.OBJECT,
+            400: OpenApiTypes.OBJECT,
+            503: OpenApiTypes.OBJECT,
+            504: OpenApiTypes.OBJECT,
+        },
         examples=[
             OpenApiExample(
                 name="Rubik's Cube Full State Example",
@@ -171,9 +322,17 @@ class KociembaCubeSolverAPIView(APIView):
                 },
                 request_only=True,
                 description="A complete scrambled cube using facelet notation and color codes (W, Y, R, O, B, G).",
-            )
+            ),
+            OpenApiExample(
+                name="Rubik's Cube Compact State Example",
+                value={
+                    "rubiks_cube": "GGOYYYROGWBBYBRRBGBYRWOROWBBBWGWOOWYOGYGGRYWWYRWBROROG"
+                },
+                request_only=True,
+                description="The same cube as one string of 54 colors in the facelet order U1-U9, R1-R9, F1-F9, D1-D9, L1-L9, B1-B9.",
+            ),
         ],
-        description="Submit a full Rubik's Cube state. Input should include all 54 facelets labeled as 'F1'–'D9' with color codes.",
+        description="Submit a full Rubik's Cube state. Input should include all 54 facelets labeled as 'F1'–'D9' with color codes, or the 54 color codes as one string in the order U, R, F, D, L, B. Answers 400 if the cube cannot be solved, 504 if the solver does not finish within its time limit and 503 if its worker failed.",
         operation_id="submit_rubiks_cube_state_kociemba",
         tags=["Rubik's Cube"],
     )
@@ -183,14 +342,216 @@ class KociembaCubeSolverAPIView(APIView):
 
         rubiks_cube = serializer.validated_data["rubiks_cube"]
 
-        # Solve the rubik's cube using Kociemba's algorithm
-        solver = KociembaSolver(rubiks_cube)
-        sequence, is_solved, error = solver.solve()
+        # Solve the rubik's cube using Kociemba's algorithm, in the
+        # Kociemba worker pool
+        try:
+            sequence = SOLVE_CACHE.get_or_solve(
+                "kociemba",
+                rubiks_cube,
+                (),
+                lambda: self._solve(rubiks_cube),
+                symmetric=True,
+            )
+        except KociembaTimeout as e:
+            raise SolverTimeout(str(e))
+        except KociembaUnavailable as e:
+            raise SolverUnavailable(str(e))
 
         return Response(
             {
                 "message": "Solved Rubik's Cube successfully using Kociemba's algorithm.",
-                "sequence": sequence,
+                "sequence": format_sequence(
+                    sequence,
+                    serializer.validated_data["metric"],
+                    serializer.validated_data["sequence_format"],
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def _solve(self, rubiks_cube):
+        solver = KociembaSolver(rubiks_cube, pool=KOCIEMBA_POOL)
+        sequence, is_solved, error = solver.solve()
+        if not is_solved:
+            raise ValidationError(error)
+        return tuple(sequence)
+
+
+class CubeBatchSolverAPIView(APIView):
+    serializer_class = RubiksCubeBatchSerializer
+
+    @extend_schema(
+        request=RubiksCubeBatchSerializer,
+        responses={200: OpenApiTypes.OBJECT},
+        description="Solve up to 1000 cubes in one request, across a pool of worker processes. Every cube is validated and solved on its own: the results, in the order of the cubes, hold either a 'sequence' or an 'error'. With 'stream' the results are sent as NDJSON lines as soon as they are solved, each with the 'index' of its cube.",
+        operation_id="submit_rubiks_cube_batch",
+        tags=["Rubik's Cube"],
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data
+        results = solve_batch(
+            data["engine"],
+            data["cubes"],
+            {"method": data["method"], "rotation_free": data["rotation_free"]},
+        )
+
+        if data["stream"]:
+            return StreamingHttpResponse(
+                (json.dumps(self._result(data, *result)) + "\n" for result in results),
+                content_type="application/x-ndjson",
+            )
+
+        return Response(
+            {
+                "message": "Solved the batch of Rubik's Cubes.",
+                "results": [self._result(data, *result) for result in sorted(results)],
             },
             status=status.HTTP_200_OK,
         )
+
+    def _result(self, data, index, sequence, error):
+        if error is not None:
+            return {"index": index, "error": error}
+        return {
+            "index": index,
+            "sequence": format_sequence(
+                sequence, data["metric"], data["sequence_format"]
+            ),
+        }
+
+
+def _job_response(job):
+    response = {
+        "id": job.id,
+        "status": job.status,
+        "created": job.created.isoformat(),
+        "finished": job.finished.isoformat() if job.finished else None,
+    }
+    if job.sequence is not None:
+        response["sequence"] = format_sequence(
+            job.sequence, job.data["metric"], job.data["sequence_format"]
+        )
+    if job.orientation is not None:
+        response["orientation"] = job.orientation
+    if job.error is not None:
+        response["error"] = job.error
+    return response
+
+
+class SolveJobAPIView(APIView):
+    serializer_class = RubiksCubeJobSerializer
+
+    @extend_schema(
+        request=RubiksCubeJobSerializer,
+        responses={202: OpenApiTypes.OBJECT, 503: OpenApiTypes.OBJECT},
+        description="Queue a solve and return its job id at once. Poll the job at jobs/<id>/ or follow its server-sent events at jobs/<id>/events/. Answers 503 when too many jobs are already queued or running. Jobs are kept in the memory of the server process that accepted them, so with several server processes the polls must reach the same process, or they answer 404.",
+        operation_id="submit_rubiks_cube_job",
+        tags=["Jobs"],
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            job = JOB_STORE.submit(serializer.validated_data)
+        except JobQueueFull as e:
+            raise SolverUnavailable(str(e))
+
+        return Response(
+            _job_response(JOB_STORE.snapshot(job)), status=status.HTTP_202_ACCEPTED
+        )
+
+
+class SolveJobDetailAPIView(APIView):
+    @extend_schema(
+        responses={200: OpenApiTypes.OBJECT, 404: OpenApiTypes.OBJECT},
+        description="Status of a solve job, with its sequence once it succeeded or its error once it failed. Answers 404 for unknown or expired jobs, and for jobs accepted by another server process.",
+        operation_id="get_rubiks_cube_job",
+        tags=["Jobs"],
+    )
+    def get(self, request, job_id, *args, **kwargs):
+        job = JOB_STORE.get(job_id)
+        if job is None:
+            raise NotFound("Unknown or expired job.")
+
+        return Response(
+            _job_response(JOB_STORE.snapshot(job)), status=status.HTTP_200_OK
+        )
+
+
+class SolveJobEventsAPIView(APIView):
+    # Seconds between keep-alive comments while a job is waiting.
+    keep_alive = 15
+
+    @extend_schema(
+        responses={(200, "text/event-stream"): OpenApiTypes.STR},
+        description="Server-sent events of a solve job: a 'job' event with the job as JSON whenever its status changes, the last one when it finished.",
+        operation_id="follow_rubiks_cube_job",
+        tags=["Jobs"],
+    )
+    def get(self, request, job_id, *args, **kwargs):
+        job = JOB_STORE.get(job_id)
+        if job is None:
+            raise NotFound("Unknown or expired job.")
+
+        response = StreamingHttpResponse(
+            self._events(job), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        return response
+
+    def _events(self, job):
+        version = -1
+        while True:
+            snapshot = JOB_STORE.snapshot(job)
+            if snapshot.version > version:
+                version = snapshot.version
+                yield f"event: job\ndata: {json.dumps(_job_response(snapshot))}\n\n"
+                if snapshot.status in FINISHED_STATUSES:
+                    return
+            elif not JOB_STORE.wait(job, version, self.keep_alive):
+                yield ": keep-alive\n\n"
+
+
+class SolveCacheStatsAPIView(APIView):
+    @extend_schema(
+        responses={200: OpenApiTypes.OBJECT},
+        description="Size, hits, misses and evictions of the in-process solve cache, for monitoring.",
+        operation_id="solve_cache_stats",
+        tags=["Monitoring"],
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(SOLVE_CACHE.stats(), status=status.HTTP_200_OK)
+
+
+class SolverReadinessAPIView(APIView):
+    @extend_schema(
+        responses={200: OpenApiTypes.OBJECT, 503: OpenApiTypes.OBJECT},
+        description="Whether the solving engines are warmed up. Answers 503 until the warm-up has finished, or when it failed, with the time every warm-up step took. A process that skips the warm-up (SOLVER_WARMUP off) reports 'skipped' and answers 200; its engines load on first use.",
+        operation_id="solver_readiness",
+        tags=["Monitoring"],
+    )
+    def get(self, request, *args, **kwargs):
+        report = readiness()
+        return Response(
+            report,
+            status=(
+                status.HTTP_200_OK
+                if report["status"] in (READY, SKIPPED)
+                else status.HTTP_503_SERVICE_UNAVAILABLE
+            ),
+        )
+
+
+class KociembaPoolStatsAPIView(APIView):
+    @extend_schema(
+        responses={200: OpenApiTypes.OBJECT},
+        description="Workers, queue depth, timeouts and replaced workers of the Kociemba worker pool of this process, for monitoring.",
+        operation_id="kociemba_pool_stats",
+        tags=["Monitoring"],
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(KOCIEMBA_POOL.stats(), status=status.HTTP_200_OK)
@@ -0,0 +1,121 @@
+"""
+Warm-up of the solving engines before the first request.
+
+Kociemba's solver loads its pruning and move tables on its first solve
+(building them first if they are not cached on disk yet), the project's
+lookup tables are memory-mapped on first use and the layer solvers fill
+their caches on their first solves. Warming up does all of it once, so that
+the first request after a deploy or a worker restart does not pay for it.
+
+The solver app warms up in AppConfig.ready unless the SOLVER_WARMUP setting
+is off, the process runs a management command other than runserver (the
+warm_up command warms up on its own) or it is the runserver autoreloader's
+parent process, which serves no requests. Run in the process that forks the web workers (gunicorn --preload)
+and the solve pool, the loaded tables are shared with the forked processes.
+"""
+
+import threading
+import time
+
+from solver.api.v1.cube_solver import cubie  # noqa: F401 (registers tables)
+from solver.api.v1.cube_solver import tables
+from solver.api.v1.cube_solver.layers.bottom_cases import (  # noqa: F401 (registers tables)
+    cross_table,
+)
+from solver.api.v1.cube_solver.solver import METHODS, RubiksCubeSolver
+from solver.api.v1.cube_solver.state import CubeState
+from solver.api.v1.cube_solver.validator import CubeStateValidator
+from solver.api.v1.kociemba_solver.solver import KociembaSolver
+
+PENDING = "pending"
+WARMING_UP = "warming_up"
+READY = "ready"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# A scrambled cube solved by every engine during the warm-up.
+WARM_UP_CUBE = "GGOYYYROGWBBYBRRBGBYRWOROWBBBWGWOOWYOGYGGRYWWYRWBROROG"
+
+_warm_up_lock = threading.Lock()
+_lock = threading.Lock()
+_status = {"status": PENDING}
+
+
+def _load_tables():
+    for name in tables.registered_tables():
+        # Reading the whole table pulls the memory-mapped pages in.
+        tables.load_table(name).max()
+
+
+def _solve_kociemba(state):
+    _, is_solved, error = KociembaSolver(state).solve()
+    if not is_solved:
+        raise RuntimeError(f"Kociemba's solver failed: {error}")
+
+
+def _solve_layers(state):
+    for method in METHODS:
+        for rotation_free in (False, True):
+            RubiksCubeSolver(state, rotation_free=rotation_free, method=method).solve()
+
+
+def warm_up():
+    """
+    Warm up every engine, once per process.
+
+    Returns:
+        dict: The readiness, see readiness().
+
+    Raises:
+        Exception: Whatever a failing step raised; the readiness then
+            reports the warm-up as failed.
+    """
+    with _warm_up_lock:
+        with _lock:
+            if _status.get("warmed_up"):
+                return dict(_status)
+            _status.clear()
+            _status["status"] = WARMING_UP
+
+        state = CubeState.from_string(WARM_UP_CUBE)
+        steps = {}
+        try:
+            for name, step in (
+                ("tables", _load_tables),
+                ("validator", lambda: CubeStateValidator(state).validate()),
+                ("kociemba", lambda: _solve_kociemba(state)),
+                ("layer", lambda: _solve_layers(state)),
+            ):
+                start = time.perf_counter()
+                step()
+                steps[name] = round(time.perf_counter() - start, 4)
+        except Exception as e:
+            with _lock:
+                _status.update(status=FAILED, steps=steps, error=repr(e))
+            raise
+
+        with _lock:
+            _status.update(status=READY, warmed_up=True, steps=steps)
+            return dict(_status)
+
+
+def skip_warm_up():
+    """
+    Report the warm-up as skipped; the engines load on first use.
+    """
+    with _lock:
+        if _status["status"] == PENDING:
+            _status.update(status=SKIPPED, warmed_up=False)
+
+
+def readiness():
+    """
+    The warm-up state of this process.
+
+    Returns:
+        dict: "status" ("pending", "warming_up", "ready", "failed" or
+        "skipped"), the seconds every warm-up step took as "steps", and
+        "error" on failure.
+    """
+    with _lock:
+        return dict(_status)
@@ -0,0 +1,47 @@
+"""
+Process pool shared by the solve endpoints.
+
+Solving is pure Python and CPU bound, so work that can run in parallel (the
+orientation search, batches) goes to worker processes. The pool is started
+on first use and sized by the SOLVER_POOL_SIZE setting.
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+_pool = None
+_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Return the shared process pool, starting it on first use.
+
+    Returns:
+        ProcessPoolExecutor: The pool.
+    """
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, "SOLVER_POOL_SIZE", None)
+            )
+        return _pool
+
+
+def reset_pool(pool):
+    """
+    Drop the shared pool after one of its workers died; the next get_pool()
+    starts a new one.
+
+    Args:
+        pool (ProcessPoolExecutor): The broken pool. Nothing happens if it
+            was already replaced.
+    """
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
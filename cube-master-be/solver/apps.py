@@ -1,6 +1,40 @@
+import logging
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.management import get_commands
+
+logger = logging.getLogger(__name__)
+
+
+def _serves_requests():
+    # False for manage.py commands other than runserver, such as migrate,
+    # shell or test, and for the runserver autoreloader's parent process,
+    # which only restarts the serving child. WSGI servers pass no command.
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == 'runserver':
+        return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
+    return command not in get_commands()
 
 
 class SolverConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'solver'
+
+    def ready(self):
+        # Warm the engines up before the first request, and before the web
+        # workers and the solve pool fork, so that they share the tables.
+        from solver.api.v1.warmup import skip_warm_up, warm_up
+
+        # The warm_up command still warms up when asked to.
+        if not _serves_requests() or not getattr(settings, 'SOLVER_WARMUP', True):
+            skip_warm_up()
+            return
+        try:
+            warm_up()
+        except Exception:
+            # The readiness endpoint reports the failure; requests still
+            # load the engines on first use.
+            logger.exception('Warming up the solver failed.')
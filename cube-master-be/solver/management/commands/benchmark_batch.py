@@ -0,0 +1,63 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from solver.api.v1.cube_solver.batch import CubeBatch
+from solver.api.v1.cube_solver.facelets import FACELETS
+from solver.api.v1.cube_solver.layers import moves
+
+
+class Command(BaseCommand):
+    help = "Compare per-cube move throughput of CubeBatch and the dictionary moves."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cubes", type=int, default=10_000)
+        parser.add_argument("--moves", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        sequence = rng.choices(list(moves.MOVE_FUNCTIONS), k=options["moves"])
+        solved_cube = {name: name[0] for name in FACELETS}
+
+        # The dictionary engine is timed on a sample, it is far too slow for
+        # the whole batch.
+        sample = min(options["cubes"], 200)
+        start = time.perf_counter()
+        for _ in range(sample):
+            cube = solved_cube
+            for move in sequence:
+                cube = moves.execute_move(cube, move)
+        dict_rate = sample * len(sequence) / (time.perf_counter() - start)
+
+        batch = CubeBatch.solved(options["cubes"])
+        start = time.perf_counter()
+        for move in sequence:
+            batch.apply(move)
+        batch_rate = len(batch) * len(sequence) / (time.perf_counter() - start)
+
+        batch = CubeBatch.solved(options["cubes"])
+        start = time.perf_counter()
+        batch.apply_sequence(sequence)
+        sequence_rate = len(batch) * len(sequence) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batch.is_valid()
+        batch.is_solved()
+        predicate_time = time.perf_counter() - start
+
+        self.stdout.write(
+            f"dict (execute_move)        {dict_rate:>16,.0f} cube-moves/s"
+        )
+        self.stdout.write(
+            f"CubeBatch.apply            {batch_rate:>16,.0f} cube-moves/s"
+            f"  ({batch_rate / dict_rate:,.0f}x)"
+        )
+        self.stdout.write(
+            f"CubeBatch.apply_sequence   {sequence_rate:>16,.0f} cube-moves/s"
+            f"  ({sequence_rate / dict_rate:,.0f}x)"
+        )
+        self.stdout.write(
+            f"is_valid + is_solved       {predicate_time * 1e6 / len(batch):>16.2f} us/cube"
+        )
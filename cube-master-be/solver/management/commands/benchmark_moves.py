@@ -0,0 +1,54 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from solver.api.v1.cube_solver.facelets import FACELETS
+from solver.api.v1.cube_solver.layers import moves
+from solver.api.v1.cube_solver.state import CubeState
+
+
+class Command(BaseCommand):
+    help = "Compare moves per second of the dictionary moves and CubeState."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--moves", type=int, default=200_000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        sequence = rng.choices(list(moves.MOVE_FUNCTIONS), k=options["moves"])
+        solved_cube = {name: name[0] for name in FACELETS}
+
+        def run_dict():
+            cube = solved_cube
+            for move in sequence:
+                cube = moves.execute_move(cube, move)
+            return cube
+
+        def run_immutable():
+            state = CubeState.from_dict(solved_cube)
+            for move in sequence:
+                state = state.move(move)
+            return state.to_dict()
+
+        def run_in_place():
+            state = CubeState.from_dict(solved_cube).thaw()
+            for move in sequence:
+                state.apply(move)
+            return state.to_dict()
+
+        results = []
+        for name, runner in (
+            ("dict (execute_move)", run_dict),
+            ("CubeState.move", run_immutable),
+            ("MutableCubeState.apply", run_in_place),
+        ):
+            start = time.perf_counter()
+            final_cube = runner()
+            elapsed = time.perf_counter() - start
+            results.append(final_cube)
+            self.stdout.write(f"{name:<24} {len(sequence) / elapsed:>12,.0f} moves/s")
+
+        if any(result != results[0] for result in results):
+            self.stderr.write("Engines disagree on the final cube state!")
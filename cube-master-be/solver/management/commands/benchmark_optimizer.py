@@ -0,0 +1,70 @@
+import contextlib
+import io
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from solver.api.v1.cube_solver.facelets import FACES
+from solver.api.v1.cube_solver.layers.bottom import BottomLayerSolver
+from solver.api.v1.cube_solver.layers.second import SecondLayerSolver
+from solver.api.v1.cube_solver.layers.top import TopLayerSolver
+from solver.api.v1.cube_solver.optimizer import optimize_sequence
+from solver.api.v1.cube_solver.sequence import compile_sequence
+from solver.api.v1.cube_solver.state import CubeState
+
+FACE_MOVES = [f"{face.lower()}{suffix}" for face in FACES for suffix in ("", "'")]
+
+
+class Command(BaseCommand):
+    help = "Measure the move reduction and run time of the sequence optimizer on random solves."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--solves", type=int, default=500)
+        parser.add_argument("--scramble-length", type=int, default=30)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        solved = CubeState(bytes(index // 9 for index in range(54)), FACES)
+
+        # Unoptimized layer-by-layer solutions of random scrambles. The layer
+        # solvers print debug output, which is not part of the report.
+        corpus = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(options["solves"]):
+                cube = solved
+                for move in rng.choices(FACE_MOVES, k=options["scramble_length"]):
+                    cube = cube.move(move)
+                sequence = []
+                for solver_class in (
+                    BottomLayerSolver,
+                    SecondLayerSolver,
+                    TopLayerSolver,
+                ):
+                    layer_moves, cube = solver_class(cube).solve()
+                    sequence.extend(layer_moves)
+                corpus.append(sequence)
+
+        start = time.perf_counter()
+        optimized = [optimize_sequence(sequence) for sequence in corpus]
+        elapsed = time.perf_counter() - start
+
+        for sequence, result in zip(corpus, optimized):
+            if compile_sequence(sequence) != compile_sequence(result):
+                self.stderr.write(f"Optimized sequence differs: {sequence}")
+                return
+
+        raw_moves = sum(map(len, corpus))
+        optimized_moves = sum(map(len, optimized))
+        solves = len(corpus)
+        self.stdout.write(f"solves                  {solves:>10}")
+        self.stdout.write(f"moves per solve (raw)   {raw_moves / solves:>10.1f}")
+        self.stdout.write(f"moves per solve (opt)   {optimized_moves / solves:>10.1f}")
+        self.stdout.write(
+            f"average reduction       {(raw_moves - optimized_moves) / solves:>10.1f} moves"
+            f"  ({100 * (raw_moves - optimized_moves) / raw_moves:.1f}%)"
+        )
+        self.stdout.write(
+            f"optimizer time          {elapsed * 1e6 / solves:>10.1f} us/solve"
+        )
@@ -0,0 +1,66 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from solver.api.v1.cube_solver.facelets import FACELETS, FACES
+from solver.api.v1.cube_solver.state import CubeState
+from solver.api.v1.serializers import RubiksCubeSerializer
+
+FACE_MOVES = [f"{face.lower()}{suffix}" for face in FACES for suffix in ("", "'")]
+COLORS = "YBRWGO"
+
+
+class Command(BaseCommand):
+    help = "Compare request parsing and validation of the facelet dictionary and the 54-character string."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cubes", type=int, default=2000)
+        parser.add_argument("--scramble-length", type=int, default=30)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        solved = CubeState(bytes(index // 9 for index in range(54)), COLORS)
+
+        dicts = []
+        strings = []
+        for _ in range(options["cubes"]):
+            cube = solved
+            for move in rng.choices(FACE_MOVES, k=options["scramble_length"]):
+                cube = cube.move(move)
+            rubiks_cube = cube.to_dict()
+            dicts.append(rubiks_cube)
+            strings.append("".join(rubiks_cube[name] for name in FACELETS))
+
+        # Parsing alone, into the state the solvers work on.
+        dict_parse = self._time(CubeState.from_dict, dicts)
+        string_parse = self._time(CubeState.from_string, strings)
+
+        # The request data through the serializer, validation included.
+        def validate(rubiks_cube):
+            serializer = RubiksCubeSerializer(data={"rubiks_cube": rubiks_cube})
+            if not serializer.is_valid():
+                raise ValueError(serializer.errors)
+
+        dict_request = self._time(validate, dicts)
+        string_request = self._time(validate, strings)
+
+        self.stdout.write(f"cubes                        {len(dicts):>10}")
+        self.stdout.write(f"parse (dict)                 {dict_parse:>10.1f} us/cube")
+        self.stdout.write(
+            f"parse (string)               {string_parse:>10.1f} us/cube"
+            f"  ({dict_parse / string_parse:.1f}x)"
+        )
+        self.stdout.write(f"serializer (dict)            {dict_request:>10.1f} us/cube")
+        self.stdout.write(
+            f"serializer (string)          {string_request:>10.1f} us/cube"
+            f"  ({dict_request / string_request:.1f}x)"
+        )
+
+    @staticmethod
+    def _time(function, cubes):
+        start = time.perf_counter()
+        for cube in cubes:
+            function(cube)
+        return (time.perf_counter() - start) * 1e6 / len(cubes)
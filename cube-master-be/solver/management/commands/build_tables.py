@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from solver.api.v1.cube_solver import cubie  # noqa: F401 (registers tables)
+from solver.api.v1.cube_solver import tables
+from solver.api.v1.cube_solver.layers.bottom_cases import (  # noqa: F401 (registers tables)
+    cross_table,
+)
+
+
+class Command(BaseCommand):
+    help = "Build the solver lookup tables and save them as .npy files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "names",
+            nargs="*",
+            help="Tables to build (default: all registered tables).",
+        )
+
+    def handle(self, *args, **options):
+        for name in options["names"] or tables.registered_tables():
+            start = time.perf_counter()
+            path = tables.build_table(name)
+            self.stdout.write(f"{name:<28} {time.perf_counter() - start:6.2f}s  {path}")
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from solver.api.v1.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = "Warm up the solving engines: build and load the lookup tables and solve once with every engine."
+
+    def handle(self, *args, **options):
+        try:
+            report = warm_up()
+        except Exception as e:
+            raise CommandError(f"Warming up the solver failed: {e!r}")
+
+        for name, seconds in report["steps"].items():
+            self.stdout.write(f"{name:<12} {seconds:8.3f}s")
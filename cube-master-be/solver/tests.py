@@ -1,3 +1,974 @@
-from django.test import TestCase
+import os
+import json
+import random
+import threading
+import time
+from itertools import permutations, product
+from operator import itemgetter
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import serializers, status
+from rest_framework.test import APIClient
+
+from solver import apps
+
+from solver.api.v1.cache import SOLVE_CACHE, SolveCache
+from solver.api.v1.cube_solver.batch import CubeBatch
+from solver.api.v1.cube_solver.cubie import (
+    COORDINATE_TABLES,
+    MOVES,
+    CubieCube,
+    coordinate_move,
+    permutation_parity,
+    rank_permutation,
+    unrank_permutation,
+)
+from solver.api.v1.cube_solver.facelets import (
+    CORNER_FACELETS,
+    EDGE_FACELETS,
+)
+from solver.api.v1.cube_solver.layers.bottom_cases import cross_table
+from solver.api.v1.cube_solver.layers.second_cases import f2l_table
+from solver.api.v1.cube_solver.layers.top_cases import last_layer_table
+from solver.api.v1.cube_solver.notation import (
+    HALF_TURN_METRIC,
+    QUARTER_TURN_METRIC,
+    STRING_FORMAT,
+    format_sequence,
+    invert_sequence,
+    parse_algorithm,
+)
+from solver.api.v1.cube_solver.optimizer import optimize_sequence
+from solver.api.v1.cube_solver.orientation import ROTATIONS
+from solver.api.v1.cube_solver.search import solve_best_orientation
+from solver.api.v1.cube_solver.sequence import (
+    apply_sequence,
+    compile_sequence,
+    remove_rotations,
+)
+from solver.api.v1.cube_solver.solver import RubiksCubeSolver
+from solver.api.v1.cube_solver.state import CubeState
+from solver.api.v1.cube_solver.symmetry import SYMMETRIES, transform
+from solver.api.v1.cube_solver.tables import load_table
+from solver.api.v1.cube_solver.validator import CubeStateValidator
+from solver.api.v1.jobs import (
+    FAILED,
+    FINISHED_STATUSES,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    JobQueueFull,
+    JobStore,
+)
+from solver.api.v1 import warmup
+from solver.api.v1.kociemba_solver.pool import (
+    KociembaPool,
+    KociembaTimeout,
+    KociembaUnavailable,
+)
+
+SOLVED = CubeState.from_string("YYYYYYYYYBBBBBBBBBRRRRRRRRRWWWWWWWWWGGGGGGGGGOOOOOOOOO")
+SCRAMBLE = "R U2 F' L D B2 R' U F2 D' L2 B U' R2 F D2 L' B' U R"
+QUARTER_TURNS = [f"{face}{suffix}" for face in "urfdlb" for suffix in ("", "'")]
+
+
+def scrambled(algorithm=SCRAMBLE):
+    return apply_sequence(SOLVED, parse_algorithm(algorithm))
+
+
+def with_colors(rubiks_cube, colors):
+    # A copy of the cube in dictionary form with some facelets recolored.
+    rubiks_cube = rubiks_cube.to_dict()
+    rubiks_cube.update(colors)
+    return rubiks_cube
+
+
+def random_moves(rng, length, moves):
+    return [rng.choice(moves) for _ in range(length)]
+
+
+class RotationRemovalTests(SimpleTestCase):
+    def test_rewrites_moves_after_a_rotation(self):
+        self.assertEqual(remove_rotations(["r", "rl", "u", "r'"]), ["r", "u", "b'"])
+
+    def test_rotation_free_sequences_turn_the_same_pieces(self):
+        rng = random.Random(11)
+        moves = QUARTER_TURNS + list(ROTATIONS)
+        cube = scrambled()
+        for _ in range(100):
+            sequence = random_moves(rng, 30, moves)
+            face_moves = remove_rotations(sequence)
+            self.assertFalse(set(face_moves) & set(ROTATIONS))
+            # The cubes only differ by a whole-cube rotation.
+            rotated = apply_sequence(cube, sequence)
+            unrotated = transform(apply_sequence(cube, face_moves), 0)
+            self.assertIn(unrotated, [transform(rotated, frame) for frame in range(24)])
+
+    def test_rotation_free_solutions_solve_the_cube(self):
+        cube = scrambled()
+        sequence, _ = RubiksCubeSolver(cube, rotation_free=True).solve()
+        self.assertFalse(set(sequence) & set(ROTATIONS))
+        self.assertTrue(apply_sequence(cube, sequence).is_solved())
+
+
+class OptimizerTests(SimpleTestCase):
+    def test_cancels_moves_on_the_same_axis(self):
+        self.assertEqual(
+            optimize_sequence(["r", "l", "r'", "u", "u", "u'"]), ["l", "u"]
+        )
+        self.assertEqual(optimize_sequence(["rl", "u", "d", "rr", "u'", "d'"]), [])
+
+    def test_optimized_sequences_are_equivalent(self):
+        rng = random.Random(7)
+        moves = QUARTER_TURNS + list(ROTATIONS)
+        for _ in range(300):
+            sequence = random_moves(rng, rng.randrange(40), moves)
+            optimized = optimize_sequence(sequence)
+            self.assertLessEqual(len(optimized), len(sequence))
+            self.assertEqual(compile_sequence(optimized), compile_sequence(sequence))
+
+    def test_rejects_unknown_moves(self):
+        with self.assertRaises(ValueError):
+            optimize_sequence(["r", "x"])
+
+
+class SymmetricCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = SolveCache()
+        self.cube = scrambled()
+        self.sequence = self.cache.get_or_solve(
+            "layer", self.cube, (), self._solve, symmetric=True
+        )
+
+    def _solve(self):
+        sequence, _ = RubiksCubeSolver(self.cube).solve()
+        return tuple(sequence)
+
+    def _fail(self):
+        self.fail("A symmetric copy of a cached cube was solved again.")
+
+    def assertSolvesCopy(self, copy):
+        sequence = self.cache.get_or_solve(
+            "layer", copy, (), self._fail, symmetric=True
+        )
+        self.assertTrue(CubeState.from_dict(apply_sequence(copy, sequence)).is_solved())
+        self.assertEqual(
+            len(remove_rotations(sequence)), len(remove_rotations(self.sequence))
+        )
+
+    def test_solution_solves_the_cube(self):
+        self.assertTrue(apply_sequence(self.cube, self.sequence).is_solved())
+
+    def test_rotated_copy_hits_the_cache(self):
+        for rotations in (["rl"], ["ru"], ["rd", "rr"], ["ru", "ru", "rl"]):
+            with self.subTest(rotations=rotations):
+                self.assertSolvesCopy(apply_sequence(self.cube, rotations))
+
+    def test_mirrored_copy_hits_the_cache(self):
+        for symmetry in (24, 30, 47):
+            with self.subTest(symmetry=symmetry):
+                gather = itemgetter(*SYMMETRIES[symmetry])
+                self.assertSolvesCopy(
+                    CubeState(bytes(gather(self.cube.facelets)), SOLVED.palette)
+                )
+
+    def test_dictionary_copy_hits_the_cache(self):
+        self.assertSolvesCopy(apply_sequence(self.cube.to_dict(), ["rl"]))
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+
+class CubeStateValidatorTests(SimpleTestCase):
+    def assertRejected(self, rubiks_cube, message):
+        with self.assertRaisesRegex(serializers.ValidationError, message):
+            CubeStateValidator(rubiks_cube).validate()
+
+    def test_accepts_reachable_cubes(self):
+        CubeStateValidator(SOLVED).validate()
+        CubeStateValidator(scrambled()).validate()
+        CubeStateValidator(scrambled().to_dict()).validate()
+
+    def test_rejects_twisted_corner(self):
+        cube = scrambled()
+        first, second, third = CORNER_FACELETS[0]
+        twisted = with_colors(
+            cube, {first: cube[second], second: cube[third], third: cube[first]}
+        )
+        self.assertRejected(twisted, "corner is twisted")
+
+    def test_rejects_flipped_edge(self):
+        cube = scrambled()
+        first, second = EDGE_FACELETS[5]
+        flipped = with_colors(cube, {first: cube[second], second: cube[first]})
+        self.assertRejected(flipped, "edge is flipped")
+
+    def test_rejects_swapped_pieces(self):
+        cube = scrambled()
+        (first, second), (third, fourth) = EDGE_FACELETS[0], EDGE_FACELETS[7]
+        swapped = with_colors(
+            cube,
+            {
+                first: cube[third],
+                second: cube[fourth],
+                third: cube[first],
+                fourth: cube[second],
+            },
+        )
+        self.assertRejected(swapped, "Two pieces are swapped")
+
+    def test_rejects_wrong_color_counts(self):
+        self.assertRejected(with_colors(SOLVED, {"U1": "B"}), "exactly 9 times")
+
+
+class CubeStateHashTests(SimpleTestCase):
+    def test_equal_views_hash_equally_across_frames(self):
+        rng = random.Random(3)
+        moves = QUARTER_TURNS + list(ROTATIONS)
+        for _ in range(50):
+            state = apply_sequence(SOLVED, [])
+            for move in random_moves(rng, 20, moves):
+                state = state.move(move)
+            unrotated = CubeState(state.facelets, state.palette)
+            self.assertEqual(state, unrotated)
+            self.assertEqual(hash(state), hash(unrotated))
+            self.assertEqual(hash(state.thaw().freeze()), hash(state))
+
+
+class BatchSolveTests(SimpleTestCase):
+    def test_bad_items_fail_on_their_own(self):
+        cube = scrambled()
+        missing_facelet = cube.to_dict()
+        del missing_facelet["U1"]
+        response = APIClient().post(
+            reverse("solve-batch"),
+            {
+                "cubes": [
+                    cube.to_dict(),
+                    missing_facelet,
+                    "notadict",
+                    42,
+                    None,
+                    "".join(cube.palette[color] for color in cube.facelets),
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual([result["index"] for result in results], [0, 1, 2, 3, 4, 5])
+
+        expected, _ = RubiksCubeSolver(cube).solve()
+        self.assertEqual(results[0]["sequence"], expected)
+        self.assertIn("U1", results[1]["error"])
+        self.assertIn("Expected 54 facelets", results[2]["error"])
+        self.assertIn('got type "int"', results[3]["error"])
+        self.assertIn("may not be null", results[4]["error"])
+        self.assertEqual(results[5]["sequence"], expected)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SolveCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = SolveCache(max_size=2, ttl=10, clock=self.clock)
+
+    def test_entries_expire_after_the_ttl(self):
+        self.cache.set("a", 1)
+        self.clock.now = 9.9
+        self.assertEqual(self.cache.get("a"), 1)
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get("c"), 3)
+
+    def test_counters(self):
+        self.cache.set("a", 1)
+        self.cache.get("a")
+        self.cache.get("b")
+        self.cache.set("b", 2)
+        self.cache.set("c", 3)
+        self.clock.now = 20
+        self.cache.get("c")
+        stats = self.cache.stats()
+        self.assertEqual(
+            (stats["hits"], stats["misses"], stats["evictions"], stats["size"]),
+            (1, 2, 1, 1),
+        )
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3)
+
+    def test_uncacheable_values_are_solved_again(self):
+        cube = scrambled()
+        for _ in range(2):
+            value = self.cache.get_or_solve(
+                "layer", cube, (), lambda: ("r",), cacheable=lambda value: False
+            )
+            self.assertEqual(value, ("r",))
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_searches_cut_short_are_not_cached(self):
+        SOLVE_CACHE.clear()
+        data = {
+            "rubiks_cube": scrambled().to_dict(),
+            "search_orientations": True,
+            "time_budget": 0,
+        }
+        response = APIClient().post(reverse("solve-cube"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLess(
+            response.json()["orientation"]["searched"],
+            response.json()["orientation"]["candidates"],
+        )
+        self.assertEqual(SOLVE_CACHE.stats()["size"], 0)
+
+    def test_complete_searches_are_shared_across_budgets(self):
+        SOLVE_CACHE.clear()
+        data = {
+            "rubiks_cube": scrambled().to_dict(),
+            "search_orientations": True,
+            "time_budget": 10,
+        }
+        first = APIClient().post(reverse("solve-cube"), data, format="json").json()
+        self.assertEqual(
+            first["orientation"]["searched"], first["orientation"]["candidates"]
+        )
+        hits = SOLVE_CACHE.stats()["hits"]
+        data["time_budget"] = 5
+        second = APIClient().post(reverse("solve-cube"), data, format="json").json()
+        self.assertEqual(second["sequence"], first["sequence"])
+        self.assertEqual(SOLVE_CACHE.stats()["hits"], hits + 1)
+
+
+def stub_kociemba_solve(cube_string):
+    # Stands in for kociemba.solve in the pool's workers.
+    if cube_string == "slow":
+        time.sleep(30)
+    elif cube_string == "crash":
+        os._exit(1)
+    elif cube_string == "unsolvable":
+        raise ValueError("Error. Probably cubestring is invalid")
+    return "R U2 F'"
+
+
+def unsolvable_kociemba_solve(cube_string):
+    raise ValueError("Error. Probably cubestring is invalid")
+
+
+def slow_kociemba_solve(cube_string):
+    time.sleep(30)
+
+
+class KociembaPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = KociembaPool(size=1, timeout=0.5, solve=stub_kociemba_solve)
+
+    def test_worker_missing_the_deadline_is_killed_and_replaced(self):
+        self.assertEqual(self.pool.solve("fast"), "R U2 F'")
+        worker = self.pool._idle[0]
+        with self.assertRaises(KociembaTimeout):
+            self.pool.solve("slow")
+        self.assertFalse(worker.process.is_alive())
+
+        self.assertEqual(self.pool.solve("fast"), "R U2 F'")
+        stats = self.pool.stats()
+        self.assertEqual(
+            (stats["workers"], stats["timeouts"], stats["replaced"], stats["solved"]),
+            (1, 1, 1, 2),
+        )
+
+    def test_dead_worker_is_replaced(self):
+        with self.assertRaises(KociembaUnavailable):
+            self.pool.solve("crash")
+        self.assertEqual(self.pool.solve("fast"), "R U2 F'")
+        self.assertEqual(self.pool.stats()["replaced"], 1)
+
+    def test_unsolvable_cube_keeps_the_worker(self):
+        with self.assertRaises(ValueError):
+            self.pool.solve("unsolvable")
+        stats = self.pool.stats()
+        self.assertEqual(
+            (stats["workers"], stats["idle"], stats["unsolvable"]), (1, 1, 1)
+        )
+
+    def test_endpoint_maps_pool_errors_to_status_codes(self):
+        cube = "".join(SOLVED.palette[color] for color in scrambled().facelets)
+        for pool, expected in (
+            (
+                KociembaPool(size=1, solve=unsolvable_kociemba_solve),
+                status.HTTP_400_BAD_REQUEST,
+            ),
+            (
+                KociembaPool(size=1, timeout=0.2, solve=slow_kociemba_solve),
+                status.HTTP_504_GATEWAY_TIMEOUT,
+            ),
+        ):
+            SOLVE_CACHE.clear()
+            with self.subTest(expected=expected), mock.patch(
+                "solver.api.v1.views.KOCIEMBA_POOL", pool
+            ):
+                response = APIClient().post(
+                    reverse("solve-kociemba"), {"rubiks_cube": cube}, format="json"
+                )
+                self.assertEqual(response.status_code, expected)
+
+
+class JobStoreTests(SimpleTestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.clock = FakeClock()
+        self.store = JobStore(workers=1, max_pending=2, clock=self.clock)
+        patcher = mock.patch("solver.api.v1.jobs.run_job", self._run_job)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.release.set)
+
+    def _run_job(self, data):
+        # Stands in for the solve until the test releases it.
+        self.release.wait(5)
+        if data.get("fail"):
+            raise serializers.ValidationError("The cube is impossible to solve.")
+        return ["r", "u"], None
+
+    def wait_for(self, job, statuses):
+        while True:
+            snapshot = self.store.snapshot(job)
+            if snapshot.status in statuses:
+                return snapshot
+            self.assertTrue(self.store.wait(job, snapshot.version, 5))
+
+    def test_job_runs_and_succeeds(self):
+        job = self.store.submit({})
+        self.assertIn(self.store.snapshot(job).status, (QUEUED, RUNNING))
+        self.assertEqual(self.wait_for(job, (RUNNING,)).version, 1)
+
+        self.release.set()
+        finished = self.wait_for(job, FINISHED_STATUSES)
+        self.assertEqual(
+            (finished.status, finished.sequence, finished.version),
+            (SUCCEEDED, ["r", "u"], 2),
+        )
+        self.assertIsNotNone(finished.finished)
+
+    def test_job_fails_with_the_solver_error(self):
+        self.release.set()
+        finished = self.wait_for(self.store.submit({"fail": True}), FINISHED_STATUSES)
+        self.assertEqual(
+            (finished.status, finished.error),
+            (FAILED, "The cube is impossible to solve."),
+        )
+
+    def test_full_queue_refuses_jobs_until_one_finishes(self):
+        first = self.store.submit({})
+        self.store.submit({})
+        with self.assertRaises(JobQueueFull):
+            self.store.submit({})
+
+        self.release.set()
+        self.wait_for(first, FINISHED_STATUSES)
+        self.store.submit({})
+
+    def test_finished_jobs_are_dropped_after_the_retention(self):
+        self.release.set()
+        job = self.store.submit({})
+        self.wait_for(job, FINISHED_STATUSES)
+        self.clock.now = self.store.retention
+        self.assertIs(self.store.get(job.id), job)
+        self.clock.now = self.store.retention + 1
+        self.assertIsNone(self.store.get(job.id))
+
+    def test_events_follow_the_status_changes(self):
+        job = self.store.submit({"metric": "qtm", "sequence_format": "list"})
+        self.wait_for(job, (RUNNING,))
+        with mock.patch("solver.api.v1.views.JOB_STORE", self.store):
+            response = APIClient().get(reverse("solve-job-events", args=[job.id]))
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            events = iter(response.streaming_content)
+            first = next(events).decode()
+            self.release.set()
+            rest = [event.decode() for event in events]
+
+        statuses = []
+        for event in [first] + rest:
+            name, data = event.removesuffix("\n\n").split("\n")
+            self.assertEqual(name, "event: job")
+            statuses.append(json.loads(data.removeprefix("data: "))["status"])
+        self.assertEqual(statuses, [RUNNING, SUCCEEDED])
+
+
+class WarmUpTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(
+            warmup._status, {"status": warmup.PENDING}, clear=True
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for step in ("_solve_kociemba", "_solve_layers"):
+            patcher = mock.patch.object(warmup, step, lambda state: None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get_readiness(self):
+        response = APIClient().get(reverse("solver-ready"))
+        return response.status_code, response.json()["status"]
+
+    def test_readiness_follows_the_warm_up(self):
+        self.assertEqual(
+            self.get_readiness(), (status.HTTP_503_SERVICE_UNAVAILABLE, "pending")
+        )
+
+        loading = threading.Event()
+        release = threading.Event()
+
+        def load_tables():
+            loading.set()
+            release.wait(5)
+
+        with mock.patch.object(warmup, "_load_tables", load_tables):
+            thread = threading.Thread(target=warmup.warm_up)
+            thread.start()
+            loading.wait(5)
+            self.assertEqual(
+                self.get_readiness(),
+                (status.HTTP_503_SERVICE_UNAVAILABLE, warmup.WARMING_UP),
+            )
+            release.set()
+            thread.join(5)
+        self.assertEqual(self.get_readiness(), (status.HTTP_200_OK, warmup.READY))
+
+    def test_failed_warm_up_is_reported(self):
+        def load_tables():
+            raise OSError("No space left on device")
+
+        with mock.patch.object(warmup, "_load_tables", load_tables):
+            with self.assertRaises(OSError):
+                warmup.warm_up()
+        self.assertEqual(
+            self.get_readiness(), (status.HTTP_503_SERVICE_UNAVAILABLE, warmup.FAILED)
+        )
+        self.assertIn("No space left", warmup.readiness()["error"])
+
+    def test_skipped_warm_up_is_ready(self):
+        warmup.skip_warm_up()
+        self.assertEqual(self.get_readiness(), (status.HTTP_200_OK, warmup.SKIPPED))
+
+    def test_only_serving_processes_warm_up(self):
+        for argv, run_main, serves in (
+            (["gunicorn", "cube_master.wsgi"], None, True),
+            (["manage.py", "runserver"], "true", True),
+            (["manage.py", "runserver"], None, False),
+            (["manage.py", "runserver", "--noreload"], None, True),
+            (["manage.py", "migrate"], None, False),
+            (["manage.py", "build_tables"], None, False),
+        ):
+            environ = {} if run_main is None else {"RUN_MAIN": run_main}
+            with self.subTest(argv=argv, run_main=run_main), mock.patch.object(
+                apps.sys, "argv", argv
+            ), mock.patch.dict(apps.os.environ, environ):
+                if run_main is None:
+                    apps.os.environ.pop("RUN_MAIN", None)
+                self.assertIs(apps._serves_requests(), serves)
+
+
+class StreamSolveTests(SimpleTestCase):
+    def stream(self, stream_format, method="cfop"):
+        response = APIClient().post(
+            reverse("solve-stream"),
+            {
+                "rubiks_cube": scrambled().to_dict(),
+                "stream_format": stream_format,
+                "method": method,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b"".join(response.streaming_content).decode()
+
+    def solve(self, method="cfop"):
+        response = APIClient().post(
+            reverse("solve-cube"),
+            {"rubiks_cube": scrambled().to_dict(), "method": method},
+            format="json",
+        )
+        return response.json()["sequence"]
+
+    def assertStagesMatchSolve(self, messages, stages, method):
+        self.assertEqual(
+            [message.get("stage", message["event"]) for message in messages],
+            stages + ["done"],
+        )
+        self.assertTrue(all(m["event"] == "stage" for m in messages[:-1]))
+        # Stages are optimized one by one, so moves that cancel across two
+        # stages are only merged by /solve/.
+        moves = [move for message in messages[:-1] for move in message["sequence"]]
+        sequence = self.solve(method)
+        self.assertEqual(compile_sequence(moves), compile_sequence(sequence))
+        self.assertEqual(len(optimize_sequence(moves)), len(sequence))
+
+    def test_ndjson_stream(self):
+        response, body = self.stream("ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertTrue(body.endswith("\n"))
+        messages = [json.loads(line) for line in body.splitlines()]
+        self.assertStagesMatchSolve(messages, ["cross", "f2l", "last_layer"], "cfop")
+
+    def test_sse_stream(self):
+        response, body = self.stream("sse", method="beginner")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(body.endswith("\n\n"))
+        messages = []
+        for event in body.removesuffix("\n\n").split("\n\n"):
+            name, data = event.split("\n")
+            self.assertTrue(name.startswith("event: ") and data.startswith("data: "))
+            messages.append(
+                {"event": name.removeprefix("event: "), **json.loads(data[6:])}
+            )
+        self.assertStagesMatchSolve(
+            messages, ["bottom_layer", "second_layer", "top_layer"], "beginner"
+        )
+
+
+class CubeStringTests(SimpleTestCase):
+    def setUp(self):
+        self.cube = scrambled()
+        self.string = "".join(self.cube.palette[color] for color in self.cube.facelets)
+
+    def post(self, rubiks_cube, view="solve-cube"):
+        return APIClient().post(
+            reverse(view), {"rubiks_cube": rubiks_cube}, format="json"
+        )
+
+    def test_string_parses_like_the_dictionary(self):
+        self.assertEqual(CubeState.from_string(self.string), self.cube)
+        self.assertEqual(
+            CubeState.from_string(self.string), CubeState.from_dict(self.cube.to_dict())
+        )
+
+    def test_rejects_malformed_strings(self):
+        control = self.string[:7] + chr(0) + self.string[8:]
+        seventh_color = self.string[:7] + "X" + self.string[8:]
+        for string, message in (
+            (self.string[:-1], "Expected 54 facelets, got 53."),
+            (self.string + "Y", "Expected 54 facelets, got 55."),
+            (control, "Unknown color '\\x00' at U8"),
+            (seventh_color, "Unknown color 'X' at U8"),
+        ):
+            with self.subTest(message=message):
+                with self.assertRaisesMessage(ValueError, message):
+                    CubeState.from_string(string)
+                response = self.post(string)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(message, response.json()["rubiks_cube"][0])
+
+    def test_string_and_dictionary_get_the_same_solution(self):
+        for view in ("solve-cube", "solve-kociemba"):
+            with self.subTest(view=view):
+                SOLVE_CACHE.clear()
+                from_string = self.post(self.string, view).json()["sequence"]
+                SOLVE_CACHE.clear()
+                from_dict = self.post(self.cube.to_dict(), view).json()["sequence"]
+                self.assertEqual(from_string, from_dict)
+
+
+class CubeBatchTests(SimpleTestCase):
+    def test_batch_moves_match_cube_states(self):
+        rng = random.Random(5)
+        moves = QUARTER_TURNS + list(ROTATIONS)
+        states = [
+            apply_sequence(SOLVED, random_moves(rng, 20, QUARTER_TURNS))
+            for _ in range(20)
+        ]
+        batch = CubeBatch.from_states(states)
+        sequence = random_moves(rng, 40, moves)
+        for move in sequence:
+            batch.apply(move)
+            states = [state.move(move) for state in states]
+            self.assertEqual(
+                [row.tobytes() for row in batch.states],
+                [state.facelets for state in states],
+            )
+
+        compiled = CubeBatch.from_states(states).apply_sequence(sequence)
+        self.assertEqual(
+            [row.tobytes() for row in compiled.states],
+            [apply_sequence(state, sequence).facelets for state in states],
+        )
+        undone = CubeBatch.from_states([scrambled()] * 3).apply_sequence(
+            invert_sequence(parse_algorithm(SCRAMBLE))
+        )
+        self.assertTrue(undone.is_solved().all())
+        self.assertTrue(CubeBatch.solved(3).is_valid().all())
+        self.assertTrue(batch.is_valid().all())
+
+
+class CubieCubeTests(SimpleTestCase):
+    def test_permutation_ranks_round_trip(self):
+        ranks = [rank_permutation(list(p)) for p in permutations(range(5))]
+        self.assertEqual(ranks, list(range(120)))
+        for rank in (0, 1, 5039, 40319):
+            self.assertEqual(rank_permutation(unrank_permutation(rank, 8)), rank)
+
+    def test_state_round_trip(self):
+        cube = CubieCube.from_state(scrambled())
+        self.assertEqual(cube.to_state(SOLVED.palette), scrambled())
+
+    def test_coordinate_tables_match_cubie_moves(self):
+        rng = random.Random(9)
+        for _ in range(5):
+            state = apply_sequence(SOLVED, random_moves(rng, 25, QUARTER_TURNS))
+            cube = CubieCube.from_state(state)
+            for coordinate in COORDINATE_TABLES:
+                value = getattr(cube, coordinate)
+                for move in MOVES:
+                    with self.subTest(coordinate=coordinate, move=move):
+                        self.assertEqual(
+                            coordinate_move(coordinate, value, move),
+                            getattr(cube.copy().move(move), coordinate),
+                        )
+
+
+class NotationTests(SimpleTestCase):
+    def test_string_format_writes_standard_rotations(self):
+        moves = ["rl", "u", "u", "r'", "rd", "rr", "ru"]
+        self.assertEqual(
+            format_sequence(moves, HALF_TURN_METRIC, STRING_FORMAT),
+            "y U2 R' x' y' x",
+        )
+        self.assertEqual(
+            format_sequence(moves, sequence_format=STRING_FORMAT),
+            "y U U R' x' y' x",
+        )
+        self.assertEqual(format_sequence(moves), moves)
+
+    def test_rotations_turn_like_y_and_x(self):
+        # After y the front shows the old right face, after x the old down face.
+        cube = scrambled()
+        self.assertEqual(
+            apply_sequence(cube, ["rl", "f"]), apply_sequence(cube, ["r", "rl"])
+        )
+        self.assertEqual(
+            apply_sequence(cube, ["ru", "f"]), apply_sequence(cube, ["d", "ru"])
+        )
+
+
+def last_layer_cube(cp=range(4), co=(0,) * 4, ep=range(4), eo=(0,) * 4):
+    # A cube with the first two layers solved and the given U-layer cubies.
+    cube = CubieCube()
+    cube.cp[:4], cube.co[:4], cube.ep[:4], cube.eo[:4] = cp, co, ep, eo
+    cube.verify()
+    return cube.to_state(SOLVED.palette)
+
+
+class LastLayerTableTests(SimpleTestCase):
+    def assertFirstTwoLayersSolved(self, cube):
+        for name in last_layer_table.FIRST_TWO_LAYERS_FACELETS:
+            self.assertEqual(cube[name], cube[f"{name[0]}5"], name)
+
+    def test_every_orientation_case_is_oriented(self):
+        keys = set()
+        for twists, flips in product(
+            product(range(3), repeat=3), product(range(2), repeat=3)
+        ):
+            co = twists + (-sum(twists) % 3,)
+            eo = flips + (sum(flips) % 2,)
+            cube = last_layer_cube(co=co, eo=eo)
+            key = last_layer_table.oll_key(cube)
+            keys.add(key)
+            cube = apply_sequence(cube, last_layer_table.OLL_TABLE[key])
+            self.assertFirstTwoLayersSolved(cube)
+            self.assertEqual({cube[f"U{x}"] for x in range(1, 10)}, {cube["U5"]})
+        self.assertEqual(keys, set(last_layer_table.OLL_TABLE))
+
+    def test_every_permutation_case_is_solved(self):
+        keys = set()
+        for cp, ep in product(permutations(range(4)), repeat=2):
+            if permutation_parity(cp) != permutation_parity(ep):
+                continue
+            cube = last_layer_cube(cp=cp, ep=ep)
+            key = last_layer_table.pll_key(cube)
+            keys.add(key)
+            cube = apply_sequence(cube, last_layer_table.PLL_TABLE[key])
+            self.assertTrue(cube.is_solved(), (cp, ep))
+        self.assertEqual(keys, set(last_layer_table.PLL_TABLE))
+
+
+class CrossTableTests(SimpleTestCase):
+    def test_move_transitions_match_cubie_moves(self):
+        rng = random.Random(10)
+        transitions = [cross_table._move_transitions(move) for move in MOVES]
+        for _ in range(20):
+            state = apply_sequence(SOLVED, random_moves(rng, 25, QUARTER_TURNS))
+            cube = CubieCube.from_state(state)
+            rank, flips = divmod(cross_table.cross_coordinate(cube), 16)
+            for move, (turned_rank, flip_mask) in zip(MOVES, transitions):
+                self.assertEqual(
+                    turned_rank[rank] * 16 + (flips ^ flip_mask[rank]),
+                    cross_table.cross_coordinate(cube.copy().move(move)),
+                )
+
+    def test_every_cross_state_is_solved(self):
+        # Every stored solution, applied to its own state, within 8 moves.
+        transitions = [cross_table._move_transitions(move) for move in MOVES]
+        coordinates = np.arange(cross_table.N_CROSS)
+        codes = load_table("cross_solutions").astype(np.int64)
+        lengths = np.zeros(cross_table.N_CROSS, dtype=np.int64)
+        while codes.any():
+            move_indices = (codes & cross_table._MOVE_MASK) - 1
+            for move_index, (turned_rank, flip_mask) in enumerate(transitions):
+                chosen = move_indices == move_index
+                rank, flips = np.divmod(coordinates[chosen], 16)
+                coordinates[chosen] = turned_rank[rank] * 16 + (flips ^ flip_mask[rank])
+            lengths += codes > 0
+            codes >>= cross_table._MOVE_BITS
+        self.assertTrue((coordinates == cross_table.SOLVED_CROSS).all())
+        self.assertLessEqual(lengths.max(), 8)
+
+    def test_cross_solution_solves_the_cross(self):
+        rng = random.Random(11)
+        for _ in range(50):
+            cube = apply_sequence(SOLVED, random_moves(rng, 25, QUARTER_TURNS))
+            cube = apply_sequence(cube, cross_table.cross_solution(cube))
+            for name in ("D2", "D4", "D6", "D8", "F8", "R8", "B8", "L8"):
+                self.assertEqual(cube[name], cube[f"{name[0]}5"], name)
+
+
+# The F2L slots as (corner, edge) positions: FR, FL, BL and BR.
+F2L_SLOTS = ((4, 8), (5, 9), (6, 10), (7, 11))
+
+
+def pair_cube(corner, twist, edge, flip):
+    # A cube with the cross and the other slots solved, except for the
+    # pieces the DFR corner and the FR edge are swapped with.
+    cube = CubieCube()
+    cube.cp[4], cube.cp[corner] = cube.cp[corner], cube.cp[4]
+    cube.ep[8], cube.ep[edge] = cube.ep[edge], cube.ep[8]
+    # The U layer absorbs the twist, the flip and the parity.
+    cube.co[corner] = twist
+    cube.co[next(i for i in range(4) if i != corner)] -= twist
+    cube.co = [co % 3 for co in cube.co]
+    first, second = [i for i in range(4) if i != edge][:2]
+    cube.eo[edge] = flip
+    cube.eo[first] ^= flip
+    if (corner != 4) != (edge != 8):
+        cube.ep[first], cube.ep[second] = cube.ep[second], cube.ep[first]
+    cube.verify()
+    return cube
+
+
+class F2LTableTests(SimpleTestCase):
+    def test_every_pair_state_is_solved(self):
+        self.assertEqual(len(f2l_table.PAIR_TABLE), f2l_table.N_PAIR_CASES)
+        for pair in f2l_table.PAIR_TABLE:
+            with self.subTest(pair=pair):
+                cube = pair_cube(*pair)
+                state = cube.to_state(SOLVED.palette)
+                self.assertEqual(f2l_table.pair_state(state), pair)
+
+                state = apply_sequence(state, f2l_table.pair_solution(pair))
+                solved = CubieCube.from_state(state)
+                for edge in (4, 5, 6, 7):
+                    self.assertEqual((solved.ep[edge], solved.eo[edge]), (edge, 0))
+                for corner, edge in F2L_SLOTS:
+                    if corner == 4 or (
+                        cube.cp[corner] == corner and cube.ep[edge] == edge
+                    ):
+                        # The pair is solved and no solved slot is broken.
+                        self.assertEqual(
+                            (solved.cp[corner], solved.co[corner]), (corner, 0)
+                        )
+                        self.assertEqual((solved.ep[edge], solved.eo[edge]), (edge, 0))
+
+
+def scan_piece(cube, colors):
+    # Where the stickers of a piece are, found by reading every facelet.
+    for names in CORNER_FACELETS + EDGE_FACELETS:
+        shown = {cube[name]: name for name in names}
+        if len(names) == len(colors) and set(shown) == set(colors):
+            return tuple(shown[color] for color in colors)
+    return None
+
+
+class PieceLocationTests(SimpleTestCase):
+    def assertLocatesEveryPiece(self, cube):
+        for names in CORNER_FACELETS + EDGE_FACELETS:
+            colors = tuple(SOLVED[name] for name in names)
+            self.assertEqual(cube.locate(*colors), scan_piece(cube, colors))
+            # The same piece named from another sticker.
+            colors = colors[1:] + colors[:1]
+            self.assertEqual(cube.locate(*colors), scan_piece(cube, colors))
+
+    def test_locate_matches_a_facelet_scan(self):
+        rng = random.Random(13)
+        moves = QUARTER_TURNS + list(ROTATIONS)
+        for _ in range(20):
+            sequence = random_moves(rng, 30, moves)
+            cube = scrambled()
+            cube.locate(SOLVED["U5"], SOLVED["R5"])  # builds the index
+            self.assertLocatesEveryPiece(apply_sequence(cube, sequence))
+            self.assertLocatesEveryPiece(cube.permute(compile_sequence(sequence)))
+
+            mutable = cube.thaw()
+            for move in sequence:
+                mutable.apply(move)
+            self.assertLocatesEveryPiece(mutable)
+            # Without an index carried along, it is built from the stickers.
+            self.assertLocatesEveryPiece(CubeState.from_dict(mutable.to_dict()))
+
+    def test_locate_rejects_unknown_pieces(self):
+        with self.assertRaises(ValueError):
+            SOLVED.locate(SOLVED["U5"], SOLVED["D5"])
+
+
+def face_turn_count(sequence, metric):
+    return len(
+        format_sequence([move for move in sequence if move not in ROTATIONS], metric)
+    )
+
+
+class BestOrientationTests(SimpleTestCase):
+    def test_never_longer_than_the_default_answer(self):
+        rng = random.Random(15)
+        for _ in range(3):
+            cube = apply_sequence(SOLVED, random_moves(rng, 25, QUARTER_TURNS))
+            for metric, rotation_free in product(
+                (QUARTER_TURN_METRIC, HALF_TURN_METRIC), (False, True)
+            ):
+                default, _ = RubiksCubeSolver(cube, rotation_free=rotation_free).solve()
+                sequence, orientation = solve_best_orientation(
+                    cube,
+                    rotation_free=rotation_free,
+                    inverse=True,
+                    metric=metric,
+                    time_budget=30,
+                )
+                self.assertTrue(apply_sequence(cube, sequence).is_solved())
+                self.assertLessEqual(
+                    face_turn_count(sequence, metric),
+                    face_turn_count(default, metric),
+                )
+                self.assertEqual(orientation["searched"], orientation["candidates"])
+                if rotation_free:
+                    self.assertFalse(set(sequence) & set(ROTATIONS))
+
+    def test_no_budget_returns_the_default_answer(self):
+        default, _ = RubiksCubeSolver(scrambled()).solve()
+        sequence, orientation = solve_best_orientation(scrambled(), time_budget=0)
+        self.assertEqual(sequence, default)
+        self.assertEqual(orientation["rotations"], [])
+        self.assertFalse(orientation["inverse"])